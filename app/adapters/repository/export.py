@@ -1,19 +1,56 @@
+import json
 import os
 import pathlib
+import shutil
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
 
 import pandas as pd  # type: ignore
 import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
 import pyarrow.parquet as pq  # type: ignore
 
+from app.internal.constants import (
+    DATASET_COMMON_METADATA_FILE,
+    DATASET_METADATA_FILE,
+    EXPORT_FRAGMENTS_INDEX,
+    EXPORT_FRAGMENTS_SUBDIR,
+    OPERATION_SYNTHESIS_DATASET,
+    RESOLUTION_PARTITION_COL,
+    SCENARIO_COL,
+    SCENARIO_SYNTHESIS_DATASET,
+    STAGE_BLOCK_PARTITION_COL,
+    STAGE_COL,
+    STEP_PARTITION_COL,
+    VARIABLE_COL,
+)
+from app.model.operation.spatialresolution import (
+    SpatialResolution as OperationSpatialResolution,
+)
+from app.model.operation.variable import Variable as OperationVariable
+from app.model.scenario.spatialresolution import (
+    SpatialResolution as ScenarioSpatialResolution,
+)
+from app.model.scenario.step import Step
+from app.model.scenario.variable import Variable as ScenarioVariable
+from app.model.settings import Settings
 from app.utils.tz import enforce_utc
 
+# Escritas e consolidações dos fragmentos são realizadas por
+# diferentes threads durante a síntese
+FRAGMENTS_LOCK = Lock()
+
 
 class AbstractExportRepository(ABC):
     def __init__(self) -> None:
         super().__init__()
 
+    @property
+    @abstractmethod
+    def path(self) -> pathlib.Path:
+        pass
+
     @abstractmethod
     def read_df(self, filename: str) -> pd.DataFrame | None:
         pass
@@ -22,15 +59,229 @@ class AbstractExportRepository(ABC):
     def synthetize_df(self, df: pd.DataFrame, filename: str) -> bool:
         pass
 
+    @abstractmethod
+    def synthetize_dfs(
+        self, dfs: Iterable[pd.DataFrame], filename: str
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    def upsert_df(self, df: pd.DataFrame, filename: str, key_col: str) -> bool:
+        pass
+
+    @abstractmethod
+    def read_keys(self, filename: str, key_col: str) -> List[str]:
+        pass
+
+    @abstractmethod
+    def compact(
+        self, filename: str, sort_columns: Optional[List[str]] = None
+    ) -> bool:
+        pass
+
+    def read_json(self, filename: str) -> dict | None:
+        arq = self.path.joinpath(filename + ".json")
+        if os.path.isfile(arq):
+            with open(arq, "r", encoding="utf-8") as f:
+                return json.load(f)
+        else:
+            return None
+
+    def write_json(self, data: dict, filename: str) -> bool:
+        arq = self.path.joinpath(filename + ".json")
+        tmp = self.path.joinpath(filename + ".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, arq)
+        return True
+
+
+class FragmentedExportRepository(AbstractExportRepository):
+    """
+    Repositório que escreve os arquivos atualizados por chave, como
+    os de estatísticas e de metadados, como um fragmento por chave,
+    consolidados em um único arquivo ao final da síntese. Os formatos
+    de arquivo fornecem somente a leitura e a escrita de um fragmento.
+
+    Os fragmentos são mantidos após a consolidação, de modo que uma
+    nova síntese substitua somente os fragmentos das chaves refeitas.
+    Caso o diretório de fragmentos seja removido, o arquivo consolidado
+    é fragmentado novamente na próxima escrita.
+    """
+
+    EXTENSION = ""
+
+    @abstractmethod
+    def _read_fragment(self, arq: pathlib.Path) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def _write_fragment(self, df: pd.DataFrame, arq: pathlib.Path):
+        pass
+
+    def __fragments_dir(self, filename: str) -> pathlib.Path:
+        return self.path.joinpath(EXPORT_FRAGMENTS_SUBDIR, filename)
+
+    def __read_index(self, directory: pathlib.Path) -> List[str]:
+        arq = directory.joinpath(EXPORT_FRAGMENTS_INDEX)
+        if not arq.is_file():
+            return []
+        with open(arq, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def __write_fragments(
+        self, df: pd.DataFrame, directory: pathlib.Path, key_col: str
+    ):
+        """
+        Escreve os fragmentos de cada chave, registrando as novas
+        chaves no índice, que mantém a ordem em que foram escritas.
+        """
+        keys = self.__read_index(directory)
+        for key, key_df in df.groupby(key_col, sort=False):
+            arq = directory.joinpath(f"{key}{self.EXTENSION}")
+            tmp = directory.joinpath(f"{key}{self.EXTENSION}.tmp")
+            self._write_fragment(key_df.reset_index(drop=True), tmp)
+            os.replace(tmp, arq)
+            if str(key) not in keys:
+                keys.append(str(key))
+        arq = directory.joinpath(EXPORT_FRAGMENTS_INDEX)
+        tmp = directory.joinpath(EXPORT_FRAGMENTS_INDEX + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+        os.replace(tmp, arq)
+
+    def upsert_df(self, df: pd.DataFrame, filename: str, key_col: str) -> bool:
+        """
+        Escreve os dados de cada chave como um fragmento do arquivo,
+        substituindo os fragmentos existentes das mesmas chaves. Um
+        arquivo já existente, sem fragmentos, é fragmentado uma única
+        vez antes da primeira escrita.
+        """
+        directory = self.__fragments_dir(filename)
+        with FRAGMENTS_LOCK:
+            if not directory.is_dir():
+                directory.mkdir(parents=True)
+                existing_df = self.read_df(filename)
+                if existing_df is not None and key_col in existing_df:
+                    self.__write_fragments(existing_df, directory, key_col)
+            self.__write_fragments(df, directory, key_col)
+        return True
+
+    def read_keys(self, filename: str, key_col: str) -> List[str]:
+        directory = self.__fragments_dir(filename)
+        if directory.is_dir():
+            return self.__read_index(directory)
+        df = self.read_df(filename)
+        if df is None or key_col not in df:
+            return []
+        return df[key_col].astype(str).unique().tolist()
+
+    def compact(
+        self, filename: str, sort_columns: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Consolida os fragmentos existentes em um único arquivo,
+        na ordem em que as chaves foram escritas pela primeira vez ou,
+        caso fornecidas, ordenando as linhas pelas colunas de ordenação.
+        """
+        directory = self.__fragments_dir(filename)
+        with FRAGMENTS_LOCK:
+            fragments = [
+                directory.joinpath(f"{key}{self.EXTENSION}")
+                for key in self.__read_index(directory)
+            ]
+            fragments = [f for f in fragments if f.is_file()]
+            if len(fragments) == 0:
+                return False
+            df = pd.concat(
+                [self._read_fragment(f) for f in fragments],
+                ignore_index=True,
+            )
+        if sort_columns:
+            df = df.sort_values(sort_columns, kind="stable").reset_index(
+                drop=True
+            )
+        return self.synthetize_df(df, filename)
+
+
+class ParquetExportRepository(FragmentedExportRepository):
+    EXTENSION = ".parquet"
+
+    COMPRESSIONS: Dict[str, str] = {
+        "ZSTD": "zstd",
+        "LZ4": "lz4",
+        "GZIP": "gzip",
+        "BROTLI": "brotli",
+        "SNAPPY": "snappy",
+        "NENHUMA": "none",
+    }
+
+    # Compressões que aceitam a configuração do nível
+    LEVEL_COMPRESSIONS = ["ZSTD", "LZ4", "GZIP", "BROTLI"]
+
+    # Prefixo das colunas de códigos das entidades
+    CODE_COLUMNS_PREFIX = "codigo_"
 
-class ParquetExportRepository(AbstractExportRepository):
     def __init__(self, path: str):
         self.__path = path
+        self._options, self._row_group_size = self._write_options()
 
     @property
     def path(self) -> pathlib.Path:
         return pathlib.Path(self.__path)
 
+    def _write_options(self) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        Obtém as opções de escrita dos arquivos a partir do perfil de
+        exportação configurado para a execução.
+        """
+        settings = Settings()
+        compression = settings.parquet_compression.upper()
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Compressão {compression} não suportada")
+        level = settings.parquet_compression_level
+        row_group_size = settings.parquet_row_group_size
+        options: Dict[str, Any] = {
+            "compression": self.COMPRESSIONS[compression],
+            "write_statistics": settings.parquet_statistics,
+            "write_page_index": settings.parquet_page_index,
+            "flavor": "spark",
+            "coerce_timestamps": "ms",
+            "allow_truncated_timestamps": True,
+        }
+        if level:
+            if compression not in self.LEVEL_COMPRESSIONS:
+                raise ValueError(
+                    f"Compressão {compression} não aceita nível de compressão"
+                )
+            options["compression_level"] = int(level)
+        return options, int(row_group_size) if row_group_size else None
+
+    def _dictionary_columns(self, table: pa.Table) -> bool | list[str]:
+        """
+        Obtém as colunas escritas com codificação por dicionário.
+        """
+        dictionary = Settings().parquet_dictionary.upper()
+        if dictionary == "TODAS":
+            return True
+        elif dictionary == "NENHUMA":
+            return False
+        return [
+            c
+            for c in table.column_names
+            if c.startswith(self.CODE_COLUMNS_PREFIX) or c == SCENARIO_COL
+        ]
+
+    def _read_fragment(self, arq: pathlib.Path) -> pd.DataFrame:
+        return pd.read_parquet(arq)
+
+    def _write_fragment(self, df: pd.DataFrame, arq: pathlib.Path):
+        pq.write_table(
+            pa.Table.from_pandas(enforce_utc(df), preserve_index=False),
+            arq,
+            **self._options,
+        )
+
     def read_df(self, filename: str) -> pd.DataFrame | None:
         arq = self.path.joinpath(filename + ".parquet")
         if os.path.isfile(arq):
@@ -39,18 +290,227 @@ class ParquetExportRepository(AbstractExportRepository):
             return None
 
     def synthetize_df(self, df: pd.DataFrame, filename: str) -> bool:
+        table = pa.Table.from_pandas(enforce_utc(df))
         pq.write_table(
-            pa.Table.from_pandas(enforce_utc(df)),
+            table,
             self.path.joinpath(filename + ".parquet"),
-            write_statistics=False,
-            flavor="spark",
-            coerce_timestamps="ms",
-            allow_truncated_timestamps=True,
+            row_group_size=self._row_group_size,
+            use_dictionary=self._dictionary_columns(table),
+            **self._options,
         )
         return True
 
+    def synthetize_dfs(
+        self, dfs: Iterable[pd.DataFrame], filename: str
+    ) -> bool:
+        """
+        Escreve os DataFrames fornecidos, à medida que são obtidos,
+        como grupos de linhas sucessivos de um único arquivo.
+        """
+        arq = self.path.joinpath(filename + ".parquet")
+        tmp = self.path.joinpath(filename + ".parquet.tmp")
+        writer = None
+        try:
+            for df in dfs:
+                table = pa.Table.from_pandas(
+                    enforce_utc(df),
+                    schema=writer.schema if writer is not None else None,
+                    preserve_index=False,
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        tmp,
+                        table.schema,
+                        use_dictionary=self._dictionary_columns(table),
+                        **self._options,
+                    )
+                writer.write_table(table, row_group_size=self._row_group_size)
+        except Exception:
+            if writer is not None:
+                writer.close()
+                os.remove(tmp)
+            raise
+        if writer is None:
+            return False
+        writer.close()
+        os.replace(tmp, arq)
+        return True
+
+
+class PartitionedParquetExportRepository(ParquetExportRepository):
+    """
+    Exporta as sínteses de operação e de cenários como conjuntos de
+    dados PARQUET particionados no formato hive, por variável, agregação,
+    etapa (para os cenários) e bloco de estágios, acompanhados de um
+    arquivo `_metadata` com os metadados de todas as partes. As demais
+    sínteses, estatísticas e metadados são exportados em arquivos únicos.
+    """
+
+    OPERATION_VARIABLES = {v.value for v in OperationVariable}
+    OPERATION_RESOLUTIONS = {r.value for r in OperationSpatialResolution}
+    SCENARIO_VARIABLES = {v.value for v in ScenarioVariable}
+    SCENARIO_RESOLUTIONS = {r.value for r in ScenarioSpatialResolution}
+    SCENARIO_STEPS = {s.value for s in Step}
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.__stage_block_size = int(Settings().parquet_stage_block)
+
+    def __dataset_path(self, filename: str) -> Optional[pathlib.Path]:
+        """
+        Obtém o diretório do conjunto de dados de uma síntese a partir
+        do nome do arquivo, retornando None para as sínteses que não
+        são particionadas.
+        """
+        parts = filename.split("_")
+        if (
+            len(parts) == 2
+            and parts[0] in self.OPERATION_VARIABLES
+            and parts[1] in self.OPERATION_RESOLUTIONS
+        ):
+            return self.path.joinpath(
+                OPERATION_SYNTHESIS_DATASET,
+                f"{VARIABLE_COL}={parts[0]}",
+                f"{RESOLUTION_PARTITION_COL}={parts[1]}",
+            )
+        elif (
+            len(parts) == 3
+            and parts[0] in self.SCENARIO_VARIABLES
+            and parts[1] in self.SCENARIO_RESOLUTIONS
+            and parts[2] in self.SCENARIO_STEPS
+        ):
+            return self.path.joinpath(
+                SCENARIO_SYNTHESIS_DATASET,
+                f"{VARIABLE_COL}={parts[0]}",
+                f"{RESOLUTION_PARTITION_COL}={parts[1]}",
+                f"{STEP_PARTITION_COL}={parts[2]}",
+            )
+        return None
+
+    @property
+    def __partitioning(self) -> ds.Partitioning:
+        return ds.partitioning(
+            pa.schema([(STAGE_BLOCK_PARTITION_COL, pa.int64())]),
+            flavor="hive",
+        )
+
+    def __write_part(
+        self,
+        df: pd.DataFrame,
+        tmp: pathlib.Path,
+        part: int,
+        files: List[pq.FileMetaData],
+        schema: Optional[pa.Schema] = None,
+    ) -> pa.Schema:
+        """
+        Escreve uma parte da síntese no diretório temporário do
+        conjunto de dados, dividida nos blocos de estágios. Os blocos
+        são escritos em paralelo pela pyarrow.
+        """
+        df = enforce_utc(df)
+        partitioning = None
+        if STAGE_COL in df.columns:
+            df = df.assign(
+                **{
+                    STAGE_BLOCK_PARTITION_COL: (df[STAGE_COL] - 1)
+                    // self.__stage_block_size
+                    + 1
+                }
+            )
+            partitioning = self.__partitioning
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        options = {k: v for k, v in self._options.items() if k != "flavor"}
+
+        def _collect(written_file: ds.WrittenFile):
+            metadata = written_file.metadata
+            metadata.set_file_path(
+                pathlib.Path(written_file.path).relative_to(tmp).as_posix()
+            )
+            files.append(metadata)
+
+        ds.write_dataset(
+            table,
+            str(tmp),
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{part}-{{i}}.parquet",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                use_dictionary=self._dictionary_columns(table), **options
+            ),
+            max_rows_per_group=self._row_group_size or 1024 * 1024,
+            existing_data_behavior="overwrite_or_ignore",
+            preserve_order=True,
+            file_visitor=_collect,
+        )
+        return table.schema
+
+    def __write_dataset(
+        self, dfs: Iterable[pd.DataFrame], root: pathlib.Path
+    ) -> bool:
+        """
+        Escreve as partes de uma síntese em um diretório temporário,
+        que substitui o conjunto de dados existente somente ao final
+        da escrita, junto dos arquivos de metadados.
+        """
+        tmp = root.parent.joinpath(f".{root.name}.tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        files: List[pq.FileMetaData] = []
+        schema: Optional[pa.Schema] = None
+        try:
+            for part, df in enumerate(dfs):
+                schema = self.__write_part(df, tmp, part, files, schema)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        if schema is None:
+            return False
+        if STAGE_BLOCK_PARTITION_COL in schema.names:
+            schema = schema.remove(
+                schema.get_field_index(STAGE_BLOCK_PARTITION_COL)
+            )
+        pq.write_metadata(schema, tmp.joinpath(DATASET_COMMON_METADATA_FILE))
+        pq.write_metadata(
+            schema,
+            tmp.joinpath(DATASET_METADATA_FILE),
+            metadata_collector=files,
+        )
+        if root.exists():
+            shutil.rmtree(root)
+        os.replace(tmp, root)
+        return True
+
+    def read_df(self, filename: str) -> pd.DataFrame | None:
+        root = self.__dataset_path(filename)
+        if root is None:
+            return super().read_df(filename)
+        if not root.joinpath(DATASET_METADATA_FILE).is_file():
+            return None
+        table = ds.dataset(
+            str(root), format="parquet", partitioning=self.__partitioning
+        ).to_table()
+        if STAGE_BLOCK_PARTITION_COL in table.column_names:
+            table = table.drop_columns([STAGE_BLOCK_PARTITION_COL])
+        return table.to_pandas()
+
+    def synthetize_df(self, df: pd.DataFrame, filename: str) -> bool:
+        root = self.__dataset_path(filename)
+        if root is None:
+            return super().synthetize_df(df, filename)
+        return self.__write_dataset([df], root)
+
+    def synthetize_dfs(
+        self, dfs: Iterable[pd.DataFrame], filename: str
+    ) -> bool:
+        root = self.__dataset_path(filename)
+        if root is None:
+            return super().synthetize_dfs(dfs, filename)
+        return self.__write_dataset(dfs, root)
+
+
+class CSVExportRepository(FragmentedExportRepository):
+    EXTENSION = ".csv"
 
-class CSVExportRepository(AbstractExportRepository):
     def __init__(self, path: str):
         self.__path = path
 
@@ -58,6 +518,12 @@ class CSVExportRepository(AbstractExportRepository):
     def path(self) -> pathlib.Path:
         return pathlib.Path(self.__path)
 
+    def _read_fragment(self, arq: pathlib.Path) -> pd.DataFrame:
+        return pd.read_csv(arq)
+
+    def _write_fragment(self, df: pd.DataFrame, arq: pathlib.Path):
+        enforce_utc(df).to_csv(arq, index=False)
+
     def read_df(self, filename: str) -> pd.DataFrame | None:
         arq = self.path.joinpath(filename + ".csv")
         if os.path.isfile(arq):
@@ -71,8 +537,32 @@ class CSVExportRepository(AbstractExportRepository):
         )
         return True
 
+    def synthetize_dfs(
+        self, dfs: Iterable[pd.DataFrame], filename: str
+    ) -> bool:
+        arq = self.path.joinpath(filename + ".csv")
+        tmp = self.path.joinpath(filename + ".csv.tmp")
+        header = True
+        try:
+            for df in dfs:
+                enforce_utc(df).to_csv(
+                    tmp, index=False, header=header, mode="w" if header else "a"
+                )
+                header = False
+        except Exception:
+            if not header:
+                os.remove(tmp)
+            raise
+        if header:
+            return False
+        os.replace(tmp, arq)
+        return True
+
 
 class TestExportRepository(AbstractExportRepository):
+    # Fragmentos mantidos em memória até a consolidação
+    FRAGMENTS: Dict[str, Dict[str, pd.DataFrame]] = {}
+
     def __init__(self, path: str):
         self.__path = path
 
@@ -86,10 +576,49 @@ class TestExportRepository(AbstractExportRepository):
     def synthetize_df(self, df: pd.DataFrame, filename: str) -> bool:
         return df
 
+    def synthetize_dfs(
+        self, dfs: Iterable[pd.DataFrame], filename: str
+    ) -> bool:
+        dfs = list(dfs)
+        if len(dfs) == 0:
+            return False
+        return self.synthetize_df(pd.concat(dfs, ignore_index=True), filename)
+
+    def upsert_df(self, df: pd.DataFrame, filename: str, key_col: str) -> bool:
+        with FRAGMENTS_LOCK:
+            fragments = self.FRAGMENTS.setdefault(filename, {})
+            for key, key_df in df.groupby(key_col, sort=False):
+                fragments[str(key)] = key_df.reset_index(drop=True)
+        return True
+
+    def read_keys(self, filename: str, key_col: str) -> List[str]:
+        return list(self.FRAGMENTS.get(filename, {}).keys())
+
+    def compact(
+        self, filename: str, sort_columns: Optional[List[str]] = None
+    ) -> bool:
+        with FRAGMENTS_LOCK:
+            fragments = self.FRAGMENTS.pop(filename, {})
+        if len(fragments) == 0:
+            return False
+        df = pd.concat(list(fragments.values()), ignore_index=True)
+        if sort_columns:
+            df = df.sort_values(sort_columns, kind="stable").reset_index(
+                drop=True
+            )
+        return self.synthetize_df(df, filename)
+
+    def read_json(self, filename: str) -> dict | None:
+        return None
+
+    def write_json(self, data: dict, filename: str) -> bool:
+        return True
+
 
 def factory(kind: str, *args, **kwargs) -> AbstractExportRepository:
     mapping: Dict[str, Type[AbstractExportRepository]] = {
         "PARQUET": ParquetExportRepository,
+        "PARQUET_PARTICIONADO": PartitionedParquetExportRepository,
         "CSV": CSVExportRepository,
         "TEST": TestExportRepository,
     }
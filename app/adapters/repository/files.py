@@ -1,14 +1,28 @@
-import asyncio
+import os
 import pathlib
 import platform
+import re
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from os.path import join
-from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
+from glob import glob
+from os.path import basename, isfile, join
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from uuid import uuid4
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
 from cfinterface.files.blockfile import BlockFile
+from inewave import __version__ as inewave_version
+from inewave.config import MESES_DF
 from inewave.libs.eolica import Eolica
 from inewave.newave.arquivos import Arquivos
 from inewave.newave.caso import Caso
@@ -18,15 +32,11 @@ from inewave.newave.conft import Conft
 from inewave.newave.curva import Curva
 from inewave.newave.dger import Dger
 from inewave.newave.dsvagua import Dsvagua
-from inewave.newave.enavazb import Enavazb
-from inewave.newave.enavazf import Enavazf
-from inewave.newave.energiab import Energiab
-from inewave.newave.energiaf import Energiaf
-from inewave.newave.energias import Energias
 from inewave.newave.engnat import Engnat
 from inewave.newave.expt import Expt
 from inewave.newave.hidr import Hidr
 from inewave.newave.manutt import Manutt
+from inewave.newave.modelos.energias import SecaoDadosEnergias
 from inewave.newave.modif import Modif
 from inewave.newave.newavetim import Newavetim
 from inewave.newave.patamar import Patamar
@@ -35,9 +45,6 @@ from inewave.newave.ree import Ree
 from inewave.newave.shist import Shist
 from inewave.newave.sistema import Sistema
 from inewave.newave.term import Term
-from inewave.newave.vazaob import Vazaob
-from inewave.newave.vazaof import Vazaof
-from inewave.newave.vazaos import Vazaos
 from inewave.newave.vazoes import Vazoes
 from inewave.nwlistcf import Estados, Nwlistcfrel
 from inewave.nwlistop.cdef import Cdef
@@ -127,10 +134,15 @@ from inewave.nwlistop.vmortm import Vmortm
 from inewave.nwlistop.vmortsin import Vmortsin
 from inewave.nwlistop.vretiradauh import Vretiradauh
 
+from app import __version__
+from app.internal.constants import NWLISTOP_CACHE_SUBDIR
+from app.model.operation.nwlistopfile import NwlistopFile
 from app.model.operation.spatialresolution import SpatialResolution
 from app.model.operation.variable import Variable
+from app.model.scenario.scenariofile import ScenarioFile
 from app.model.settings import Settings
-from app.utils.encoding import converte_codificacao
+from app.utils.encoding import le_conteudo_normalizado
+from app.utils.fingerprint import combine_fingerprints, files_fingerprint
 
 if platform.system() == "Windows":
     Dger.ENCODING = "iso-8859-1"
@@ -237,6 +249,30 @@ class AbstractFilesRepository(ABC):
     ) -> Optional[pd.DataFrame]:
         pass
 
+    @abstractmethod
+    def get_nwlistop_files(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_nwlistop_inventory(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> Optional[Dict[Tuple[int, ...], List[NwlistopFile]]]:
+        pass
+
+    @abstractmethod
+    def get_deck_files(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_case_files(self, filenames: List[str]) -> List[str]:
+        pass
+
     @abstractmethod
     def get_nwlistcf_cortes(self) -> Optional[Nwlistcfrel]:
         raise NotImplementedError
@@ -246,39 +282,39 @@ class AbstractFilesRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_energiaf(self, iteracao: int) -> Optional[Energiaf]:
+    def get_energiaf(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_energiab(self, iteracao: int) -> Optional[Energiab]:
+    def get_energiab(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_vazaof(self, iteracao: int) -> Optional[Vazaof]:
+    def get_vazaof(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_vazaob(self, iteracao: int) -> Optional[Vazaob]:
+    def get_vazaob(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_enavazf(self, iteracao: int) -> Optional[Enavazf]:
+    def get_enavazf(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_enavazb(self, iteracao: int) -> Optional[Enavazb]:
+    def get_enavazb(self, iteracao: int) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_energias(self) -> Optional[Energias]:
+    def get_energias(self) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_enavazs(self) -> Optional[Energias]:
+    def get_enavazs(self) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
-    def get_vazaos(self) -> Optional[Vazaos]:
+    def get_vazaos(self) -> Optional[ScenarioFile]:
         pass
 
     @abstractmethod
@@ -303,6 +339,13 @@ class AbstractFilesRepository(ABC):
 
 
 class RawFilesRepository(AbstractFilesRepository):
+    # Linha de ano e cabeçalho das tabelas do NWLISTOP reconhecidas
+    # pelo leitor vetorizado
+    NWLISTOP_YEAR_LINE = re.compile(rb"\s*ANO:\s*(\d{4})\s*")
+    NWLISTOP_MONTHS_HEADER = [str(m).encode() for m in range(1, 13)] + [
+        b"MEDIA"
+    ]
+
     def __init__(self, tmppath: str, version: str = "latest"):
         self.__tmppath = tmppath
         self.__version = version
@@ -328,363 +371,293 @@ class RawFilesRepository(AbstractFilesRepository):
         self.__eolica: Optional[Eolica] = None
         self.__nwlistcf: Optional[Nwlistcfrel] = None
         self.__estados: Optional[Estados] = None
-        self.__energiaf: Dict[int, Energiaf] = {}
-        self.__energiab: Dict[int, Energiab] = {}
-        self.__vazaof: Dict[int, Vazaof] = {}
-        self.__vazaob: Dict[int, Vazaob] = {}
-        self.__enavazf: Dict[int, Enavazf] = {}
-        self.__enavazb: Dict[int, Enavazb] = {}
-        self.__energias: Optional[Energias] = None
-        self.__enavazs: Optional[Energias] = None
-        self.__vazaos: Optional[Vazaos] = None
+        # Somente os arquivos da última iteração lida são mantidos
+        self.__energiaf: Dict[int, ScenarioFile] = {}
+        self.__energiab: Dict[int, ScenarioFile] = {}
+        self.__vazaof: Dict[int, ScenarioFile] = {}
+        self.__vazaob: Dict[int, ScenarioFile] = {}
+        self.__enavazf: Dict[int, ScenarioFile] = {}
+        self.__enavazb: Dict[int, ScenarioFile] = {}
+        self.__energias: Optional[ScenarioFile] = None
+        self.__enavazs: Optional[ScenarioFile] = None
+        self.__vazaos: Optional[ScenarioFile] = None
         self.__vazoes: Optional[Vazoes] = None
         self.__engnat: Optional[Engnat] = None
         self.__hidr: Optional[Hidr] = None
+        self.__case_files: Optional[Dict[str, NwlistopFile]] = None
+        self.__nwlistop_inventory: Dict[
+            Tuple[Variable, SpatialResolution],
+            Optional[Dict[Tuple[int, ...], List[NwlistopFile]]],
+        ] = {}
         self.__regras: Dict[Tuple[Variable, SpatialResolution], Callable] = {
             (
                 Variable.CUSTO_MARGINAL_OPERACAO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__agg_cmo_dfs(dir, submercado),
+            ): lambda read, dir, submercado=1: self.__agg_cmo_dfs(
+                read, dir, submercado
+            ),
             (
                 Variable.VALOR_AGUA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    ValorAgua, join(dir, f"valor_agua{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(ValorAgua, join(dir, f"valor_agua{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.VALOR_AGUA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Pivarm, join(dir, f"pivarm{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Pivarm, join(dir, f"pivarm{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VALOR_AGUA_INCREMENTAL,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(
                     Pivarmincr, join(dir, f"pivarmincr{str(uhe).zfill(3)}.out")
                 )
             ),
             (
                 Variable.CUSTO_GERACAO_TERMICA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Cterm, join(dir, f"cterm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Cterm, join(dir, f"cterm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.CUSTO_GERACAO_TERMICA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ctermsin, join(dir, "ctermsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Ctermsin, join(dir, "ctermsin.out"))
             ),
             (
                 Variable.CUSTO_OPERACAO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Coper, join(dir, "coper.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Coper, join(dir, "coper.out"))
             ),
             (
                 Variable.CUSTO_FUTURO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    CustoFuturo, join(dir, "custo_futuro.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(CustoFuturo, join(dir, "custo_futuro.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafb, join(dir, f"eafb{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Eafb, join(dir, f"eafb{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafbm, join(dir, f"eafbm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Eafbm, join(dir, f"eafbm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafbsin, join(dir, "eafbsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Eafbsin, join(dir, "eafbsin.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eaf, join(dir, f"eaf{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Eaf, join(dir, f"eaf{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafm, join(dir, f"eafm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Eafm, join(dir, f"eafm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
                 # TODO - substituir quando existir na inewave
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafbsin, join(dir, "eafmsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Eafbsin, join(dir, "eafmsin.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
                 # TODO - substituir quando existir na inewave
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eaf, join(dir, f"efdf{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Eaf, join(dir, f"efdf{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
                 SpatialResolution.SUBMERCADO,
                 # TODO - substituir quando existir na inewave
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafm, join(dir, f"efdfm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Eafm, join(dir, f"efdfm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
                 # TODO - substituir quando existir na inewave
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Eafbsin, join(dir, "efdfsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Eafbsin, join(dir, "efdfsin.out"))
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Earmfp, join(dir, f"earmfp{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Earmfp, join(dir, f"earmfp{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     Earmfpm, join(dir, f"earmfpm{str(submercado).zfill(3)}.out")
                 )
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Earmfpsin, join(dir, "earmfpsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Earmfpsin, join(dir, "earmfpsin.out"))
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Earmf, join(dir, f"earmf{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Earmf, join(dir, f"earmf{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Earmfm, join(dir, f"earmfm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Earmfm, join(dir, f"earmfm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Earmfsin, join(dir, "earmfsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Earmfsin, join(dir, "earmfsin.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA_RESERVATORIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghidr, join(dir, f"ghidr{str(ree).zfill(3)}.out")
-                ),
+            ): lambda read, dir, ree=1: self.__replace_block_column(
+                read(Ghidr, join(dir, f"ghidr{str(ree).zfill(3)}.out")),
             ),
             (
                 Variable.GERACAO_HIDRAULICA_RESERVATORIO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghidrm, join(dir, f"ghidrm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Ghidrm, join(dir, f"ghidrm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA_RESERVATORIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghidrsin, join(dir, "ghidrsin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Ghidrsin, join(dir, "ghidrsin.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA_FIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
                 # TODO - Substituir quando existir na inewave
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evert, join(dir, f"gfiol{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Evert, join(dir, f"gfiol{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA_FIO,
                 SpatialResolution.SUBMERCADO,
                 # TODO - Substituir quando existir na inewave
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evertm, join(dir, f"gfiolm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Evertm, join(dir, f"gfiolm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA_FIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
                 # TODO - Substituir quando existir na inewave
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evertsin, join(dir, "gfiolsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Evertsin, join(dir, "gfiolsin.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghtot, join(dir, f"ghtot{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__replace_block_column(
+                read(Ghtot, join(dir, f"ghtot{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghtotm, join(dir, f"ghtotm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Ghtotm, join(dir, f"ghtotm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Ghtotsin, join(dir, "ghtotsin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Ghtotsin, join(dir, "ghtotsin.out"))
             ),
             (
                 Variable.GERACAO_TERMICA,
                 SpatialResolution.USINA_TERMELETRICA,
-            ): lambda dir, submercado=1: self.__eval_block_0_sum_gter_ute(
-                self.__read_nwlistop_setting_version(
-                    Gtert, join(dir, f"gtert{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__eval_block_0_sum_gter_ute(
+                read(Gtert, join(dir, f"gtert{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_TERMICA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Gttot, join(dir, f"gttot{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Gttot, join(dir, f"gttot{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_TERMICA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Gttotsin, join(dir, "gttotsin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Gttotsin, join(dir, "gttotsin.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_RESERV,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evert, join(dir, f"evert{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Evert, join(dir, f"evert{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_RESERV,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evertm, join(dir, f"evertm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Evertm, join(dir, f"evertm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_RESERV,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evertsin, join(dir, "evertsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Evertsin, join(dir, "evertsin.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_FIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Perdf, join(dir, f"perdf{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Perdf, join(dir, f"perdf{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_FIO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Perdfm, join(dir, f"perdfm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Perdfm, join(dir, f"perdfm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_FIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Perdfsin, join(dir, "perdfsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Perdfsin, join(dir, "perdfsin.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Verturb, join(dir, f"verturb{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Verturb, join(dir, f"verturb{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     Verturbm,
                     join(dir, f"verturbm{str(submercado).zfill(3)}.out"),
                 )
@@ -692,50 +665,42 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Verturbsin, join(dir, "verturbsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Verturbsin, join(dir, "verturbsin.out"))
             ),
             (
                 Variable.ENERGIA_DESVIO_RESERVATORIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Edesvc, join(dir, f"edesvc{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Edesvc, join(dir, f"edesvc{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_DESVIO_RESERVATORIO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     Edesvcm, join(dir, f"edesvcm{str(submercado).zfill(3)}.out")
                 )
             ),
             (
                 Variable.ENERGIA_DESVIO_RESERVATORIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Edesvcsin, join(dir, "edesvcsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Edesvcsin, join(dir, "edesvcsin.out"))
             ),
             (
                 # TODO - substituir quando existir na inewave
                 Variable.ENERGIA_DESVIO_FIO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Edesvc, join(dir, f"edesvf{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Edesvc, join(dir, f"edesvf{str(ree).zfill(3)}.out"))
             ),
             (
                 # TODO - substituir quando existir na inewave
                 Variable.ENERGIA_DESVIO_FIO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     Edesvcm, join(dir, f"edesvfm{str(submercado).zfill(3)}.out")
                 )
             ),
@@ -743,176 +708,136 @@ class RawFilesRepository(AbstractFilesRepository):
                 # TODO - substituir quando existir na inewave
                 Variable.ENERGIA_DESVIO_FIO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Edesvcsin, join(dir, "edesvfsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Edesvcsin, join(dir, "edesvfsin.out"))
             ),
             (
                 Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Mevmin, join(dir, f"mevmin{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Mevmin, join(dir, f"mevmin{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     Mevminm, join(dir, f"mevminm{str(submercado).zfill(3)}.out")
                 )
             ),
             (
                 Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Mevminsin, join(dir, "mevminsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Mevminsin, join(dir, "mevminsin.out"))
             ),
             (
                 Variable.ENERGIA_VOLUME_MORTO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Vmort, join(dir, f"vmort{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Vmort, join(dir, f"vmort{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VOLUME_MORTO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Vmortm, join(dir, f"vmortm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Vmortm, join(dir, f"vmortm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_VOLUME_MORTO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Vmortsin, join(dir, "vmortsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Vmortsin, join(dir, "vmortsin.out"))
             ),
             (
                 Variable.ENERGIA_EVAPORACAO,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evapo, join(dir, f"evapo{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(Evapo, join(dir, f"evapo{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_EVAPORACAO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evapom, join(dir, f"evapom{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Evapom, join(dir, f"evapom{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.ENERGIA_EVAPORACAO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Evaporsin, join(dir, "evaporsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Evaporsin, join(dir, "evaporsin.out"))
             ),
             (
                 Variable.VAZAO_AFLUENTE,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Qafluh, join(dir, f"qafluh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Qafluh, join(dir, f"qafluh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VAZAO_INCREMENTAL,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Qincruh, join(dir, f"qincruh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Qincruh, join(dir, f"qincruh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VAZAO_TURBINADA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Qturuh, join(dir, f"qturuh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__replace_block_column(
+                read(Qturuh, join(dir, f"qturuh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VAZAO_VERTIDA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Qvertuh, join(dir, f"qvertuh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__replace_block_column(
+                read(Qvertuh, join(dir, f"qvertuh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Varmuh, join(dir, f"varmuh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Varmuh, join(dir, f"varmuh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Varmpuh, join(dir, f"varmpuh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Varmpuh, join(dir, f"varmpuh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_HIDRAULICA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__eval_block_0_sum(
-                self.__read_nwlistop_setting_version(
-                    Ghiduh, join(dir, f"ghiduh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__eval_block_0_sum(
+                read(Ghiduh, join(dir, f"ghiduh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VELOCIDADE_VENTO,
                 SpatialResolution.PARQUE_EOLICO_EQUIVALENTE,
-            ): lambda dir, uee=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Vento, join(dir, f"vento{str(uee).zfill(3)}.out")
-                )
+            ): lambda read, dir, uee=1: self.__add_block_column(
+                read(Vento, join(dir, f"vento{str(uee).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_EOLICA,
                 SpatialResolution.PARQUE_EOLICO_EQUIVALENTE,
-            ): lambda dir, uee=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Geol, join(dir, f"geol{str(uee).zfill(3)}.out")
-                )
+            ): lambda read, dir, uee=1: self.__replace_block_column(
+                read(Geol, join(dir, f"geol{str(uee).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_EOLICA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Geolm, join(dir, f"geolm{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Geolm, join(dir, f"geolm{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.GERACAO_EOLICA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Geolsin, join(dir, "geolsin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Geolsin, join(dir, "geolsin.out"))
             ),
             (
                 Variable.CORTE_GERACAO_EOLICA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(
                     Corteolm,
                     join(dir, f"corteolm{str(submercado).zfill(3)}.out"),
                 )
@@ -920,101 +845,83 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.DEFICIT,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Def, join(dir, f"def{str(submercado).zfill(3)}p001.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Def, join(dir, f"def{str(submercado).zfill(3)}p001.out"))
             ),
             (
                 Variable.DEFICIT,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Def, join(dir, "defsinp001.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Def, join(dir, "defsinp001.out"))
             ),
             (
                 Variable.EXCESSO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Exces, join(dir, f"exces{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(Exces, join(dir, f"exces{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.EXCESSO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Excessin, join(dir, "excessin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(Excessin, join(dir, "excessin.out"))
             ),
             (
                 Variable.INTERCAMBIO,
                 SpatialResolution.PAR_SUBMERCADOS,
-            ): lambda dir, submercados=(1, 2): self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Intercambio,
-                    join(
-                        dir,
-                        f"int{str(submercados[0]).zfill(3)}"
-                        + f"{str(submercados[1]).zfill(3)}.out",
-                    ),
+            ): lambda read, dir, submercados=(1, 2): (
+                self.__replace_block_column(
+                    read(
+                        Intercambio,
+                        join(
+                            dir,
+                            f"int{str(submercados[0]).zfill(3)}"
+                            + f"{str(submercados[1]).zfill(3)}.out",
+                        ),
+                    )
                 )
             ),
             (
                 Variable.CUSTO_DEFICIT,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Cdef, join(dir, f"cdef{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Cdef, join(dir, f"cdef{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.CUSTO_DEFICIT,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Cdefsin, join(dir, "cdefsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Cdefsin, join(dir, "cdefsin.out"))
             ),
             (
                 Variable.MERCADO_LIQUIDO,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Mercl, join(dir, f"mercl{str(submercado).zfill(3)}.out")
-                )
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(Mercl, join(dir, f"mercl{str(submercado).zfill(3)}.out"))
             ),
             (
                 Variable.MERCADO_LIQUIDO,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Merclsin, join(dir, "merclsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(Merclsin, join(dir, "merclsin.out"))
             ),
             (
                 Variable.VIOLACAO_FPHA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__eval_block_0_sum(
-                self.__read_nwlistop_setting_version(
-                    ViolFpha, join(dir, f"viol_fpha{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__eval_block_0_sum(
+                read(ViolFpha, join(dir, f"viol_fpha{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    ViolEvmin, join(dir, f"viol_evmin{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__add_block_column(
+                read(ViolEvmin, join(dir, f"viol_evmin{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__add_block_column(
+                read(
                     ViolEvminm,
                     join(dir, f"vevminm{str(submercado).zfill(3)}.out"),
                 )
@@ -1022,16 +929,14 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    ViolEvminsin, join(dir, "viol_evminsin.out")
-                )
+            ): lambda read, dir, _: self.__add_block_column(
+                read(ViolEvminsin, join(dir, "viol_evminsin.out"))
             ),
             (
                 Variable.VOLUME_RETIRADO,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(
                     Vretiradauh,
                     join(dir, f"vretiradauh{str(uhe).zfill(3)}.out"),
                 )
@@ -1039,16 +944,14 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.VAZAO_DESVIADA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Qdesviouh, join(dir, f"qdesviouh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__replace_block_column(
+                read(Qdesviouh, join(dir, f"qdesviouh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__eval_block_0_sum(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, uhe=1: self.__eval_block_0_sum(
+                read(
                     ViolGhminuh,
                     join(dir, f"viol_ghminuh{str(uhe).zfill(3)}.out"),
                 )
@@ -1056,16 +959,14 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
                 SpatialResolution.RESERVATORIO_EQUIVALENTE,
-            ): lambda dir, ree=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    ViolGhmin, join(dir, f"viol_ghmin{str(ree).zfill(3)}.out")
-                )
+            ): lambda read, dir, ree=1: self.__replace_block_column(
+                read(ViolGhmin, join(dir, f"viol_ghmin{str(ree).zfill(3)}.out"))
             ),
             (
                 Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
                 SpatialResolution.SUBMERCADO,
-            ): lambda dir, submercado=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, submercado=1: self.__replace_block_column(
+                read(
                     # TODO - atualizar o nome do arquivo quando for alterado
                     ViolGhminm,
                     join(dir, f"vghminm{str(submercado).zfill(3)}.out"),
@@ -1074,48 +975,38 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
                 SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda dir, _: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    ViolGhminsin, join(dir, "viol_ghminsin.out")
-                )
+            ): lambda read, dir, _: self.__replace_block_column(
+                read(ViolGhminsin, join(dir, "viol_ghminsin.out"))
             ),
             (
                 Variable.COTA_MONTANTE,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Hmont, join(dir, f"hmont{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Hmont, join(dir, f"hmont{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.COTA_JUSANTE,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Hjus, join(dir, f"hjus{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__replace_block_column(
+                read(Hjus, join(dir, f"hjus{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.QUEDA_LIQUIDA,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__replace_block_column(
-                self.__read_nwlistop_setting_version(
-                    Hliq, join(dir, f"hliq{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__replace_block_column(
+                read(Hliq, join(dir, f"hliq{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VOLUME_EVAPORADO,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
-                    Vevapuh, join(dir, f"vevapuh{str(uhe).zfill(3)}.out")
-                )
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(Vevapuh, join(dir, f"vevapuh{str(uhe).zfill(3)}.out"))
             ),
             (
                 Variable.VIOLACAO_POSITIVA_EVAPORACAO,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(
                     ViolPosEvap,
                     join(dir, f"viol_pos_evap{str(uhe).zfill(3)}.out"),
                 )
@@ -1123,19 +1014,655 @@ class RawFilesRepository(AbstractFilesRepository):
             (
                 Variable.VIOLACAO_NEGATIVA_EVAPORACAO,
                 SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda dir, uhe=1: self.__add_block_column(
-                self.__read_nwlistop_setting_version(
+            ): lambda read, dir, uhe=1: self.__add_block_column(
+                read(
                     ViolNegEvap,
                     join(dir, f"viol_neg_evap{str(uhe).zfill(3)}.out"),
                 ).fillna(0.0)  # type: ignore
             ),
         }
+        # Padrões dos nomes dos arquivos lidos por cada regra de leitura
+        # do NWLISTOP, com um grupo para cada índice de entidade. Devem
+        # ser mantidos junto das regras, visto que são utilizados para
+        # inventariar os arquivos existentes sem realizar as leituras.
+        self.__padroes_nwlistop: Dict[
+            Tuple[Variable, SpatialResolution], List[str]
+        ] = {
+            (Variable.CUSTO_MARGINAL_OPERACAO, SpatialResolution.SUBMERCADO): [
+                r"cmarg(\d{3})-med\.out",
+                r"cmarg(\d{3})\.out",
+            ],
+            (Variable.VALOR_AGUA, SpatialResolution.RESERVATORIO_EQUIVALENTE): [
+                r"valor_agua(\d{3})\.out"
+            ],
+            (Variable.VALOR_AGUA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"pivarm(\d{3})\.out"
+            ],
+            (
+                Variable.VALOR_AGUA_INCREMENTAL,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"pivarmincr(\d{3})\.out"],
+            (Variable.CUSTO_GERACAO_TERMICA, SpatialResolution.SUBMERCADO): [
+                r"cterm(\d{3})\.out"
+            ],
+            (
+                Variable.CUSTO_GERACAO_TERMICA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"ctermsin\.out"],
+            (Variable.CUSTO_OPERACAO, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"coper\.out"
+            ],
+            (Variable.CUSTO_FUTURO, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"custo_futuro\.out"
+            ],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"eafb(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
+                SpatialResolution.SUBMERCADO,
+            ): [r"eafbm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"eafbsin\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"eaf(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
+                SpatialResolution.SUBMERCADO,
+            ): [r"eafm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_RESERVATORIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"eafmsin\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"efdf(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
+                SpatialResolution.SUBMERCADO,
+            ): [r"efdfm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_NATURAL_AFLUENTE_ABSOLUTA_FIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"efdfsin\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"earmfp(\d{3})\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
+                SpatialResolution.SUBMERCADO,
+            ): [r"earmfpm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_PERCENTUAL_FINAL,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"earmfpsin\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"earmf(\d{3})\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
+                SpatialResolution.SUBMERCADO,
+            ): [r"earmfm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"earmfsin\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA_RESERVATORIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"ghidr(\d{3})\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA_RESERVATORIO,
+                SpatialResolution.SUBMERCADO,
+            ): [r"ghidrm(\d{3})\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA_RESERVATORIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"ghidrsin\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA_FIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"gfiol(\d{3})\.out"],
+            (Variable.GERACAO_HIDRAULICA_FIO, SpatialResolution.SUBMERCADO): [
+                r"gfiolm(\d{3})\.out"
+            ],
+            (
+                Variable.GERACAO_HIDRAULICA_FIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"gfiolsin\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"ghtot(\d{3})\.out"],
+            (Variable.GERACAO_HIDRAULICA, SpatialResolution.SUBMERCADO): [
+                r"ghtotm(\d{3})\.out"
+            ],
+            (
+                Variable.GERACAO_HIDRAULICA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"ghtotsin\.out"],
+            (Variable.GERACAO_TERMICA, SpatialResolution.USINA_TERMELETRICA): [
+                r"gtert(\d{3})\.out"
+            ],
+            (Variable.GERACAO_TERMICA, SpatialResolution.SUBMERCADO): [
+                r"gttot(\d{3})\.out"
+            ],
+            (Variable.GERACAO_TERMICA, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"gttotsin\.out"
+            ],
+            (
+                Variable.ENERGIA_VERTIDA_RESERV,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"evert(\d{3})\.out"],
+            (Variable.ENERGIA_VERTIDA_RESERV, SpatialResolution.SUBMERCADO): [
+                r"evertm(\d{3})\.out"
+            ],
+            (
+                Variable.ENERGIA_VERTIDA_RESERV,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"evertsin\.out"],
+            (
+                Variable.ENERGIA_VERTIDA_FIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"perdf(\d{3})\.out"],
+            (Variable.ENERGIA_VERTIDA_FIO, SpatialResolution.SUBMERCADO): [
+                r"perdfm(\d{3})\.out"
+            ],
+            (
+                Variable.ENERGIA_VERTIDA_FIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"perdfsin\.out"],
+            (
+                Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"verturb(\d{3})\.out"],
+            (
+                Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
+                SpatialResolution.SUBMERCADO,
+            ): [r"verturbm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_VERTIDA_FIO_TURBINAVEL,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"verturbsin\.out"],
+            (
+                Variable.ENERGIA_DESVIO_RESERVATORIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"edesvc(\d{3})\.out"],
+            (
+                Variable.ENERGIA_DESVIO_RESERVATORIO,
+                SpatialResolution.SUBMERCADO,
+            ): [r"edesvcm(\d{3})\.out"],
+            (
+                Variable.ENERGIA_DESVIO_RESERVATORIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"edesvcsin\.out"],
+            (
+                Variable.ENERGIA_DESVIO_FIO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"edesvf(\d{3})\.out"],
+            (Variable.ENERGIA_DESVIO_FIO, SpatialResolution.SUBMERCADO): [
+                r"edesvfm(\d{3})\.out"
+            ],
+            (
+                Variable.ENERGIA_DESVIO_FIO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"edesvfsin\.out"],
+            (
+                Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"mevmin(\d{3})\.out"],
+            (
+                Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.SUBMERCADO,
+            ): [r"mevminm(\d{3})\.out"],
+            (
+                Variable.META_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"mevminsin\.out"],
+            (
+                Variable.ENERGIA_VOLUME_MORTO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"vmort(\d{3})\.out"],
+            (Variable.ENERGIA_VOLUME_MORTO, SpatialResolution.SUBMERCADO): [
+                r"vmortm(\d{3})\.out"
+            ],
+            (
+                Variable.ENERGIA_VOLUME_MORTO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"vmortsin\.out"],
+            (
+                Variable.ENERGIA_EVAPORACAO,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"evapo(\d{3})\.out"],
+            (Variable.ENERGIA_EVAPORACAO, SpatialResolution.SUBMERCADO): [
+                r"evapom(\d{3})\.out"
+            ],
+            (
+                Variable.ENERGIA_EVAPORACAO,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"evaporsin\.out"],
+            (Variable.VAZAO_AFLUENTE, SpatialResolution.USINA_HIDROELETRICA): [
+                r"qafluh(\d{3})\.out"
+            ],
+            (
+                Variable.VAZAO_INCREMENTAL,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"qincruh(\d{3})\.out"],
+            (Variable.VAZAO_TURBINADA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"qturuh(\d{3})\.out"
+            ],
+            (Variable.VAZAO_VERTIDA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"qvertuh(\d{3})\.out"
+            ],
+            (
+                Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"varmuh(\d{3})\.out"],
+            (
+                Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"varmpuh(\d{3})\.out"],
+            (
+                Variable.GERACAO_HIDRAULICA,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"ghiduh(\d{3})\.out"],
+            (
+                Variable.VELOCIDADE_VENTO,
+                SpatialResolution.PARQUE_EOLICO_EQUIVALENTE,
+            ): [r"vento(\d{3})\.out"],
+            (
+                Variable.GERACAO_EOLICA,
+                SpatialResolution.PARQUE_EOLICO_EQUIVALENTE,
+            ): [r"geol(\d{3})\.out"],
+            (Variable.GERACAO_EOLICA, SpatialResolution.SUBMERCADO): [
+                r"geolm(\d{3})\.out"
+            ],
+            (Variable.GERACAO_EOLICA, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"geolsin\.out"
+            ],
+            (Variable.CORTE_GERACAO_EOLICA, SpatialResolution.SUBMERCADO): [
+                r"corteolm(\d{3})\.out"
+            ],
+            (Variable.DEFICIT, SpatialResolution.SUBMERCADO): [
+                r"def(\d{3})p001\.out"
+            ],
+            (Variable.DEFICIT, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"defsinp001\.out"
+            ],
+            (Variable.EXCESSO, SpatialResolution.SUBMERCADO): [
+                r"exces(\d{3})\.out"
+            ],
+            (Variable.EXCESSO, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"excessin\.out"
+            ],
+            (Variable.INTERCAMBIO, SpatialResolution.PAR_SUBMERCADOS): [
+                r"int(\d{3})(\d{3})\.out"
+            ],
+            (Variable.CUSTO_DEFICIT, SpatialResolution.SUBMERCADO): [
+                r"cdef(\d{3})\.out"
+            ],
+            (Variable.CUSTO_DEFICIT, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"cdefsin\.out"
+            ],
+            (Variable.MERCADO_LIQUIDO, SpatialResolution.SUBMERCADO): [
+                r"mercl(\d{3})\.out"
+            ],
+            (Variable.MERCADO_LIQUIDO, SpatialResolution.SISTEMA_INTERLIGADO): [
+                r"merclsin\.out"
+            ],
+            (Variable.VIOLACAO_FPHA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"viol_fpha(\d{3})\.out"
+            ],
+            (
+                Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"viol_evmin(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.SUBMERCADO,
+            ): [r"vevminm(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_ENERGIA_DEFLUENCIA_MINIMA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"viol_evminsin\.out"],
+            (Variable.VOLUME_RETIRADO, SpatialResolution.USINA_HIDROELETRICA): [
+                r"vretiradauh(\d{3})\.out"
+            ],
+            (Variable.VAZAO_DESVIADA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"qdesviouh(\d{3})\.out"
+            ],
+            (
+                Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"viol_ghminuh(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
+                SpatialResolution.RESERVATORIO_EQUIVALENTE,
+            ): [r"viol_ghmin(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
+                SpatialResolution.SUBMERCADO,
+            ): [r"vghminm(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_GERACAO_HIDRAULICA_MINIMA,
+                SpatialResolution.SISTEMA_INTERLIGADO,
+            ): [r"viol_ghminsin\.out"],
+            (Variable.COTA_MONTANTE, SpatialResolution.USINA_HIDROELETRICA): [
+                r"hmont(\d{3})\.out"
+            ],
+            (Variable.COTA_JUSANTE, SpatialResolution.USINA_HIDROELETRICA): [
+                r"hjus(\d{3})\.out"
+            ],
+            (Variable.QUEDA_LIQUIDA, SpatialResolution.USINA_HIDROELETRICA): [
+                r"hliq(\d{3})\.out"
+            ],
+            (
+                Variable.VOLUME_EVAPORADO,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"vevapuh(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_POSITIVA_EVAPORACAO,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"viol_pos_evap(\d{3})\.out"],
+            (
+                Variable.VIOLACAO_NEGATIVA_EVAPORACAO,
+                SpatialResolution.USINA_HIDROELETRICA,
+            ): [r"viol_neg_evap(\d{3})\.out"],
+        }
 
     def __read_nwlistop_setting_version(
         self, reader: Type[BlockFile], path: str
     ) -> Optional[pd.DataFrame]:
         reader.set_version(self.__version)
-        return reader.read(path).valores
+        cache = Settings().nwlistop_cache
+        if cache:
+            df = self.__read_nwlistop_sidecar(reader, path)
+            if df is not None:
+                return df
+        df = None
+        if Settings().nwlistop_parser == "VETORIZADO":
+            df = self.__read_nwlistop_table(path)
+        if df is None:
+            df = reader.read(path).valores
+        if cache and df is not None:
+            self.__write_nwlistop_sidecar(reader, path, df)
+        return df
+
+    def __nwlistop_sidecar_path(
+        self, reader: Type[BlockFile], path: str
+    ) -> str:
+        """
+        Obtém o caminho do arquivo que armazena, em formato Arrow IPC,
+        a tabela lida de um arquivo do NWLISTOP, identificado pelo
+        tamanho e data de modificação do arquivo e pela versão do leitor.
+        """
+        fingerprint = combine_fingerprints(
+            [
+                __version__,
+                inewave_version,
+                reader.__name__,
+                self.__version,
+                files_fingerprint([path]),
+            ]
+        )
+        return join(
+            self.__tmppath,
+            Settings().synthesis_dir,
+            NWLISTOP_CACHE_SUBDIR,
+            f"{basename(path)}.{fingerprint}.arrow",
+        )
+
+    def __read_nwlistop_sidecar(
+        self, reader: Type[BlockFile], path: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Lê a tabela de um arquivo do NWLISTOP previamente armazenada
+        em formato Arrow IPC, mapeando o arquivo em memória.
+        """
+        try:
+            sidecar = self.__nwlistop_sidecar_path(reader, path)
+            if not isfile(sidecar):
+                return None
+            source = pa.memory_map(sidecar, "r")
+            return pa.ipc.open_file(source).read_all().to_pandas()
+        except Exception:
+            return None
+
+    def __write_nwlistop_sidecar(
+        self, reader: Type[BlockFile], path: str, df: pd.DataFrame
+    ):
+        """
+        Armazena a tabela lida de um arquivo do NWLISTOP em formato
+        Arrow IPC, substituindo versões obtidas de arquivos anteriores.
+        """
+        # Colunas sem tipo definido não são preservadas no formato Arrow
+        if any(pd.api.types.is_object_dtype(t) for t in df.dtypes):
+            return
+        sidecar = self.__nwlistop_sidecar_path(reader, path)
+        tmp_path = f"{sidecar}.{uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+            table = pa.Table.from_pandas(df)
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, sidecar)
+            for old_path in glob(
+                join(os.path.dirname(sidecar), f"{basename(path)}.*.arrow")
+            ):
+                if old_path != sidecar:
+                    os.remove(old_path)
+        except Exception:
+            if isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def __read_nwlistop_table(self, path: str) -> Optional[pd.DataFrame]:
+        """
+        Lê as tabelas de um arquivo do NWLISTOP de uma só vez, extraindo
+        as colunas de largura fixa de todas as linhas de dados com
+        operações vetorizadas.
+
+        O leiaute é reconhecido a partir do próprio arquivo: cada tabela
+        inicia com a linha do ano, seguida do cabeçalho com os meses e,
+        opcionalmente, a coluna de patamares, e termina na linha da média
+        ou em uma linha em branco. As colunas são delimitadas pelas
+        posições em branco em todas as linhas de dados. Retorna None
+        quando o arquivo não segue este leiaute, para que seja lido
+        pela inewave.
+        """
+        try:
+            with open(path, "rb") as f:
+                lines = np.array(f.read().splitlines(), dtype=np.bytes_)
+            if len(lines) == 0:
+                return None
+            # Delimitação das tabelas de cada ano
+            year_lines = np.flatnonzero(np.char.find(lines, b"ANO:") >= 0)
+            if len(year_lines) == 0 or year_lines[-1] + 1 >= len(lines):
+                return None
+            years: List[int] = []
+            for year_line in year_lines:
+                m = self.NWLISTOP_YEAR_LINE.fullmatch(lines[year_line])
+                if m is None:
+                    return None
+                years.append(int(m.group(1)))
+            headers = set(tuple(lines[i].split()) for i in year_lines + 1)
+            if len(headers) != 1:
+                return None
+            header = list(headers.pop())
+            if header[:1] == [b"SERIE"]:
+                header = header[1:]
+            has_block = header[:1] == [b"PAT"]
+            if header[int(has_block) :] != self.NWLISTOP_MONTHS_HEADER:
+                return None
+            stripped = np.char.strip(lines)
+            end_lines = np.flatnonzero(
+                (stripped == b"") | np.char.startswith(stripped, b"MEDIA")
+            )
+            first_rows = year_lines + 2
+            last_rows = np.append(end_lines, len(lines))[
+                np.searchsorted(end_lines, first_rows)
+            ]
+            if np.any(last_rows <= first_rows) or np.any(
+                last_rows[:-1] >= year_lines[1:]
+            ):
+                return None
+            rows = np.concatenate(
+                [np.arange(a, b) for a, b in zip(first_rows, last_rows)]
+            )
+            # Extração das colunas de largura fixa
+            width = lines.dtype.itemsize
+            table = (
+                lines[rows]
+                .astype(f"S{width}")
+                .view(np.uint8)
+                .reshape(len(rows), width)
+            )
+            if np.any(table >= 128):
+                return None
+            blank_table = (table == ord(" ")) | (table == 0)
+            filled = ~np.all(blank_table, axis=0)
+            edges = np.diff(np.concatenate([[False], filled, [False]]))
+            bounds = np.flatnonzero(edges).reshape(-1, 2)
+            # As últimas colunas são os meses e a média, e as anteriores
+            # formam a região da série e do patamar
+            num_values = len(MESES_DF) + 1
+            if len(bounds) <= num_values or len(bounds) > num_values + 2:
+                return None
+            fields = [(int(a), int(b)) for a, b in bounds[-num_values:-1]]
+            index_end = fields[0][0]
+
+            # Expoentes em notação "D" são lidos como "E"
+            numeric = table[:, index_end : fields[-1][1]]
+            numeric[numeric == ord("D")] = ord("E")
+            numeric[numeric == ord("d")] = ord("e")
+
+            def column(start: int, end: int) -> np.ndarray:
+                return (
+                    np.ascontiguousarray(table[:, start:end])
+                    .view(f"S{end - start}")
+                    .ravel()
+                )
+
+            def blank(values: np.ndarray) -> np.ndarray:
+                return np.char.strip(values) == b""
+
+            values = np.empty((len(rows), len(MESES_DF)), dtype=np.float64)
+            blank_values = np.empty(values.shape, dtype=bool)
+            for i, field in enumerate(fields):
+                v = column(*field)
+                blank_values[:, i] = blank(v)
+                values[:, i] = np.where(blank_values[:, i], b"nan", v).astype(
+                    np.float64
+                )
+            series_end = index_end
+            if has_block:
+                # O patamar é o último texto da região, alinhado à direita,
+                # e pode ser não numérico, como o TOTAL, sendo lido como
+                # texto. A série ocupa as posições anteriores.
+                positions = np.arange(index_end)
+                region = blank_table[:, :index_end]
+                block_end = int(np.flatnonzero(~np.all(region, axis=0))[-1]) + 1
+                if np.any(region[:, block_end - 1]):
+                    return None
+                block_start = (
+                    np.where(
+                        region & (positions < block_end), positions, -1
+                    ).max(axis=1)
+                    + 1
+                )
+                series_table = np.where(
+                    positions < block_start[:, None],
+                    table[:, :index_end],
+                    ord(" "),
+                ).astype(np.uint8)
+                blocks_table = np.where(
+                    positions >= block_start[:, None],
+                    table[:, :index_end],
+                    ord(" "),
+                ).astype(np.uint8)
+                blocks = np.char.strip(
+                    np.ascontiguousarray(blocks_table)
+                    .view(f"S{index_end}")
+                    .ravel()
+                ).astype(str)
+                v = np.ascontiguousarray(series_table).view(f"S{index_end}")
+                v = v.ravel()
+            else:
+                v = column(0, series_end)
+            blank_series = blank(v)
+            series = np.where(blank_series, b"0", v).astype(np.int64)
+            # Montagem da tabela de valores por ano
+            data_dfs: List[np.ndarray] = []
+            series_dfs: List[np.ndarray] = []
+            blocks_dfs: List[np.ndarray] = []
+            start = 0
+            for year, n in zip(years, last_rows - first_rows):
+                s = series[start : start + n]
+                b_s = blank_series[start : start + n]
+                # Meses sem valores em um ano não são convertidos pela
+                # inewave para números, e o arquivo é lido por ela
+                if np.any(np.all(blank_values[start : start + n], axis=0)):
+                    return None
+                if has_block:
+                    # Séries em branco repetem a última série informada
+                    last = np.maximum.accumulate(
+                        np.where(b_s, -1, np.arange(n))
+                    )
+                    s = np.where(last < 0, 1, s[np.maximum(last, 0)])
+                    b = blocks[start : start + n]
+                    unique_blocks = pd.unique(b)
+                else:
+                    s = np.where(b_s, 1, s)
+                    unique_blocks = np.array([0])
+                unique_series = pd.unique(s)
+                num_blocks = len(unique_blocks)
+                if (
+                    n != len(unique_series) * num_blocks
+                    or np.any(s != np.repeat(unique_series, num_blocks))
+                    or (
+                        has_block
+                        and np.any(
+                            b != np.tile(unique_blocks, len(unique_series))
+                        )
+                    )
+                ):
+                    return None
+                data_dfs.append(
+                    np.tile(
+                        pd.date_range(
+                            datetime(year=year, month=1, day=1),
+                            datetime(year=year, month=12, day=1),
+                            freq="MS",
+                        ).to_numpy(),
+                        n,
+                    )
+                )
+                series_dfs.append(np.repeat(s, len(MESES_DF)))
+                if has_block:
+                    blocks_dfs.append(np.repeat(b, len(MESES_DF)))
+                start += n
+            df = pd.DataFrame(
+                data={
+                    "data": np.concatenate(data_dfs),
+                    "serie": np.concatenate(series_dfs),
+                    "valor": values.ravel(),
+                }
+            )
+            if has_block:
+                df.insert(1, "patamar", np.concatenate(blocks_dfs))
+            return df
+        except (OSError, ValueError, IndexError, TypeError):
+            # Conteúdos fora do leiaute esperado falham na conversão ou
+            # na indexação das colunas, e o arquivo é lido pela inewave
+            return None
 
     def __fix_indices_cenarios(self, df: pd.DataFrame) -> pd.DataFrame:
         anos = df["data"].dt.year.unique().tolist()
@@ -1151,17 +1678,16 @@ class RawFilesRepository(AbstractFilesRepository):
         )
         return df
 
-    def __agg_cmo_dfs(self, dir: str, submercado: int) -> pd.DataFrame:
-        Cmargmed.set_version(self.__version)
-        df_med = Cmargmed.read(
-            join(dir, f"cmarg{str(submercado).zfill(3)}-med.out")
-        ).valores
+    def __agg_cmo_dfs(
+        self, read: Callable, dir: str, submercado: int
+    ) -> pd.DataFrame:
+        df_med = read(
+            Cmargmed, join(dir, f"cmarg{str(submercado).zfill(3)}-med.out")
+        )
+        df_pats = read(Cmarg, join(dir, f"cmarg{str(submercado).zfill(3)}.out"))
+        df_pats = df_pats.astype({"patamar": int})
         df_med["patamar"] = 0
         df_med = self.__fix_indices_cenarios(df_med)
-        Cmarg.set_version(self.__version)
-        df_pats = Cmarg.read(
-            join(dir, f"cmarg{str(submercado).zfill(3)}.out")
-        ).valores
         df_pats = self.__fix_indices_cenarios(df_pats)
         df = pd.concat(
             [df_med, df_pats],
@@ -1239,12 +1765,9 @@ class RawFilesRepository(AbstractFilesRepository):
             arq_dger = self.arquivos.dger
             if arq_dger is None:
                 raise RuntimeError("Nome do dger não encontrado")
-            caminho = pathlib.Path(self.__tmppath).joinpath(arq_dger)
-            script = pathlib.Path(Settings().installdir).joinpath(
-                Settings().encoding_script
+            self.__dger = Dger.read(
+                le_conteudo_normalizado(join(self.__tmppath, arq_dger))
             )
-            asyncio.run(converte_codificacao(str(caminho), str(script)))
-            self.__dger = Dger.read(join(self.__tmppath, arq_dger))
         return self.__dger
 
     def get_shist(self) -> Optional[Shist]:
@@ -1386,11 +1909,139 @@ class RawFilesRepository(AbstractFilesRepository):
             regra = self.__regras.get((variable, spatial_resolution))
             if regra is None:
                 return None
-            df = regra(self.__tmppath, *args, **kwargs)
+            df = regra(
+                self.__read_nwlistop_setting_version,
+                self.__tmppath,
+                *args,
+                **kwargs,
+            )
             return df
         except Exception:
             return None
 
+    def __get_case_files(self) -> Dict[str, NwlistopFile]:
+        """
+        Obtém os arquivos existentes no diretório do caso, com seus
+        tamanhos e datas de modificação, a partir de uma única varredura.
+        """
+        if self.__case_files is None:
+            case_files: Dict[str, NwlistopFile] = {}
+            with os.scandir(self.__tmppath) as entries:
+                for e in entries:
+                    if e.is_file():
+                        st = e.stat()
+                        case_files[e.name] = NwlistopFile(
+                            join(self.__tmppath, e.name),
+                            st.st_size,
+                            st.st_mtime_ns,
+                        )
+            self.__case_files = case_files
+        return self.__case_files
+
+    def __nwlistop_entity_patterns(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> List[re.Pattern]:
+        """
+        Obtém os padrões dos nomes dos arquivos lidos pela regra de
+        leitura de uma variável do NWLISTOP, com grupos para os índices
+        das entidades.
+        """
+        return [
+            re.compile(p)
+            for p in self.__padroes_nwlistop.get(
+                (variable, spatial_resolution), []
+            )
+        ]
+
+    def __build_nwlistop_inventory(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> Optional[Dict[Tuple[int, ...], List[NwlistopFile]]]:
+        patterns = self.__nwlistop_entity_patterns(variable, spatial_resolution)
+        if len(patterns) == 0:
+            return None
+        case_files = self.__get_case_files()
+        inventory: Optional[Dict[Tuple[int, ...], List[NwlistopFile]]] = None
+        common_files: List[NwlistopFile] = []
+        for pattern in patterns:
+            found: Dict[Tuple[int, ...], NwlistopFile] = {}
+            for name, f in case_files.items():
+                m = pattern.fullmatch(name)
+                if m is not None:
+                    found[tuple(int(i) for i in m.groups())] = f
+            # Arquivos sem índices de entidades são comuns a todas
+            if pattern.groups == 0:
+                if len(found) == 0:
+                    return {}
+                common_files += list(found.values())
+            elif inventory is None:
+                inventory = {k: [f] for k, f in found.items()}
+            else:
+                inventory = {
+                    k: files + [found[k]]
+                    for k, files in inventory.items()
+                    if k in found
+                }
+        if inventory is None:
+            return {(): common_files}
+        return {k: inventory[k] + common_files for k in sorted(inventory)}
+
+    def get_nwlistop_inventory(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> Optional[Dict[Tuple[int, ...], List[NwlistopFile]]]:
+        """
+        Obtém os arquivos do NWLISTOP existentes para uma variável,
+        indexados pelos índices das entidades a que se referem, a partir
+        de uma única varredura do diretório do caso. Somente são incluídas
+        as entidades com todos os arquivos necessários para a leitura.
+        Retorna None caso os arquivos lidos para a variável não sejam
+        conhecidos.
+        """
+        key = (variable, spatial_resolution)
+        if key not in self.__nwlistop_inventory:
+            self.__nwlistop_inventory[key] = self.__build_nwlistop_inventory(
+                variable, spatial_resolution
+            )
+        return self.__nwlistop_inventory[key]
+
+    def get_nwlistop_files(
+        self,
+        variable: Variable,
+        spatial_resolution: SpatialResolution,
+    ) -> List[str]:
+        """
+        Obtém os arquivos do NWLISTOP que são lidos para uma variável,
+        em todas as entidades.
+        """
+        inventory = self.get_nwlistop_inventory(variable, spatial_resolution)
+        if inventory is None:
+            return []
+        return sorted(set([f.path for fs in inventory.values() for f in fs]))
+
+    def get_deck_files(self) -> List[str]:
+        """
+        Obtém os arquivos de entrada do caso, listados no arquivo
+        de nomes do NEWAVE.
+        """
+        files = ["caso.dat", self.caso.arquivos, "hidr.dat", "vazoes.dat"]
+        files += list(self.arquivos.arquivos)
+        # Entradas vazias do arquivo de nomes são lidas como NaN
+        paths = [join(self.__tmppath, f) for f in files if isinstance(f, str)]
+        return sorted(set([p for p in paths if isfile(p)]))
+
+    def get_case_files(self, filenames: List[str]) -> List[str]:
+        """
+        Obtém os caminhos dos arquivos fornecidos que existem
+        no diretório do caso.
+        """
+        paths = [join(self.__tmppath, f) for f in filenames]
+        return [p for p in paths if isfile(p)]
+
     def get_nwlistcf_cortes(self) -> Optional[Nwlistcfrel]:
         if self.__nwlistcf is None:
             try:
@@ -1468,7 +2119,7 @@ class RawFilesRepository(AbstractFilesRepository):
         else:
             return self._numero_estagios_individualizados_politica()
 
-    def get_energiaf(self, iteracao: int) -> Optional[Energiaf]:
+    def get_energiaf(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"energiaf{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1497,16 +2148,18 @@ class RawFilesRepository(AbstractFilesRepository):
             n_estagios_th = 12 if parpa == 3 else ordem_maxima
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__energiaf[iteracao] = Energiaf.read(
+                self.__energiaf.clear()
+                self.__energiaf[iteracao] = ScenarioFile(
                     caminho_arq,
-                    num_forwards,
-                    n_rees,
+                    "ree",
                     n_estagios,
                     n_estagios_th,
+                    n_rees,
+                    num_forwards,
                 )
         return self.__energiaf.get(iteracao)
 
-    def get_vazaof(self, iteracao: int) -> Optional[Vazaof]:
+    def get_vazaof(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"vazaof{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1541,17 +2194,19 @@ class RawFilesRepository(AbstractFilesRepository):
             n_estagios_th = 12 if parpa == 3 else ordem_maxima
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__vazaof[iteracao] = Vazaof.read(
+                self.__vazaof.clear()
+                self.__vazaof[iteracao] = ScenarioFile(
                     caminho_arq,
-                    num_forwards,
-                    n_uhes,
+                    "uhe",
                     n_estagios,
                     n_estagios_th,
+                    n_uhes,
+                    num_forwards,
                 )
 
         return self.__vazaof.get(iteracao)
 
-    def get_energiab(self, iteracao: int) -> Optional[Energiab]:
+    def get_energiab(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"energiab{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1575,17 +2230,20 @@ class RawFilesRepository(AbstractFilesRepository):
             n_estagios = anos_estudo * 12
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__energiab[iteracao] = Energiab.read(
+                self.__energiab.clear()
+                self.__energiab[iteracao] = ScenarioFile(
                     caminho_arq,
+                    "ree",
+                    n_estagios,
+                    0,
+                    n_rees,
                     num_forwards,
                     num_aberturas,
-                    n_rees,
-                    n_estagios,
                 )
 
         return self.__energiab.get(iteracao)
 
-    def get_vazaob(self, iteracao: int) -> Optional[Vazaob]:
+    def get_vazaob(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"vazaob{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1615,17 +2273,20 @@ class RawFilesRepository(AbstractFilesRepository):
             )
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__vazaob[iteracao] = Vazaob.read(
+                self.__vazaob.clear()
+                self.__vazaob[iteracao] = ScenarioFile(
                     caminho_arq,
+                    "uhe",
+                    n_estagios_hib,
+                    0,
+                    n_uhes,
                     num_forwards,
                     num_aberturas,
-                    n_uhes,
-                    n_estagios_hib,
                 )
 
         return self.__vazaob.get(iteracao)
 
-    def get_enavazf(self, iteracao: int) -> Optional[Enavazf]:
+    def get_enavazf(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"enavazf{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1658,17 +2319,19 @@ class RawFilesRepository(AbstractFilesRepository):
             n_estagios_th = 12 if parpa == 3 else ordem_maxima
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__enavazf[iteracao] = Enavazf.read(
+                self.__enavazf.clear()
+                self.__enavazf[iteracao] = ScenarioFile(
                     caminho_arq,
-                    num_forwards,
-                    n_rees,
+                    "ree",
                     n_estagios,
                     n_estagios_th,
+                    n_rees,
+                    num_forwards,
                 )
 
         return self.__enavazf.get(iteracao)
 
-    def get_enavazb(self, iteracao: int) -> Optional[Enavazb]:
+    def get_enavazb(self, iteracao: int) -> Optional[ScenarioFile]:
         nome_arq = (
             f"enavazb{str(iteracao).zfill(3)}.dat"
             if iteracao != 1
@@ -1697,17 +2360,20 @@ class RawFilesRepository(AbstractFilesRepository):
             )
             caminho_arq = join(self.__tmppath, nome_arq)
             if pathlib.Path(caminho_arq).exists():
-                self.__enavazb[iteracao] = Enavazb.read(
+                self.__enavazb.clear()
+                self.__enavazb[iteracao] = ScenarioFile(
                     caminho_arq,
+                    "ree",
+                    n_estagios,
+                    0,
+                    n_rees,
                     num_forwards,
                     num_aberturas,
-                    n_rees,
-                    n_estagios,
                 )
 
         return self.__enavazb.get(iteracao)
 
-    def get_energias(self) -> Optional[Energias]:
+    def get_energias(self) -> Optional[ScenarioFile]:
         if self.__energias is None:
             dger = self.get_dger()
             if dger is None:
@@ -1744,17 +2410,19 @@ class RawFilesRepository(AbstractFilesRepository):
                 num_series = ano_inicio - ano_inicio_historico - 1
             caminho_arq = join(self.__tmppath, "energias.dat")
             if pathlib.Path(caminho_arq).exists():
-                self.__energias = Energias.read(
+                self.__energias = ScenarioFile(
                     caminho_arq,
-                    num_series,
-                    n_rees,
+                    "ree",
                     n_estagios,
                     n_estagios_th,
+                    n_rees,
+                    num_series,
+                    record_size=SecaoDadosEnergias.TAMANHO_REGISTRO,
                 )
 
         return self.__energias
 
-    def get_enavazs(self) -> Optional[Energias]:
+    def get_enavazs(self) -> Optional[ScenarioFile]:
         if self.__enavazs is None:
             dger = self.get_dger()
             if dger is None:
@@ -1793,16 +2461,18 @@ class RawFilesRepository(AbstractFilesRepository):
                 num_series = ano_inicio - ano_inicio_historico - 1
             caminho_arq = join(self.__tmppath, "enavazs.dat")
             if pathlib.Path(caminho_arq).exists():
-                self.__enavazs = Energias.read(
+                self.__enavazs = ScenarioFile(
                     caminho_arq,
-                    num_series,
-                    n_rees,
+                    "ree",
                     n_estagios,
                     n_estagios_th,
+                    n_rees,
+                    num_series,
+                    record_size=SecaoDadosEnergias.TAMANHO_REGISTRO,
                 )
         return self.__enavazs
 
-    def get_vazaos(self) -> Optional[Vazaos]:
+    def get_vazaos(self) -> Optional[ScenarioFile]:
         if self.__vazaos is None:
             dger = self.get_dger()
             if dger is None:
@@ -1838,12 +2508,13 @@ class RawFilesRepository(AbstractFilesRepository):
                 num_series = ano_inicio - ano_inicial_historico - 1
             caminho_arq = join(self.__tmppath, "vazaos.dat")
             if pathlib.Path(caminho_arq).exists():
-                self.__vazaos = Vazaos.read(
+                self.__vazaos = ScenarioFile(
                     caminho_arq,
-                    num_series,
-                    n_uhes,
+                    "uhe",
                     n_estagios,
                     n_estagios_th,
+                    n_uhes,
+                    num_series,
                 )
         return self.__vazaos
 
@@ -1,22 +1,162 @@
 import os
 import time
+from glob import glob
 from multiprocessing import Manager
 
 import click
 
 import app.domain.commands as commands
 import app.services.handlers as handlers
+from app.adapters.repository.export import ParquetExportRepository
 from app.services.unitofwork import factory
 from app.utils.log import Log
+from app.utils.selection import parse_selection
+
+
+def valida_selecao(ctx, param, value):
+    # Somente a seleção de iterações aceita as palavras-chave
+    last = 1 if param.name == "iteracoes" else None
+    try:
+        parse_selection(value, last)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return value
 
 
 @click.group()
-def app():
+@click.option(
+    "--cache",
+    is_flag=True,
+    default=False,
+    help="armazena os dados do deck em disco para reuso entre sínteses",
+)
+@click.option(
+    "--cache-nwlistop",
+    is_flag=True,
+    default=False,
+    help="armazena as tabelas lidas do NWLISTOP em disco para reuso",
+)
+@click.option(
+    "--leitor-nwlistop",
+    type=click.Choice(["INEWAVE", "VETORIZADO"], case_sensitive=False),
+    default="INEWAVE",
+    help="leitor utilizado para as tabelas dos arquivos do NWLISTOP",
+)
+@click.option(
+    "--compressao",
+    type=click.Choice(
+        list(ParquetExportRepository.COMPRESSIONS.keys()),
+        case_sensitive=False,
+    ),
+    default="SNAPPY",
+    help="compressão dos arquivos PARQUET",
+)
+@click.option(
+    "--nivel-compressao",
+    type=int,
+    default=None,
+    help="nível da compressão dos arquivos PARQUET",
+)
+@click.option(
+    "--linhas-grupo",
+    type=click.IntRange(min=1),
+    default=None,
+    help="número máximo de linhas por grupo dos arquivos PARQUET",
+)
+@click.option(
+    "--estatisticas-parquet",
+    is_flag=True,
+    default=False,
+    help="escreve as estatísticas das colunas nos arquivos PARQUET",
+)
+@click.option(
+    "--indice-paginas",
+    is_flag=True,
+    default=False,
+    help="escreve o índice de páginas nos arquivos PARQUET",
+)
+@click.option(
+    "--dicionario",
+    type=click.Choice(["TODAS", "CODIGOS", "NENHUMA"], case_sensitive=False),
+    default="TODAS",
+    help="colunas dos arquivos PARQUET codificadas por dicionário",
+)
+@click.option(
+    "--estagios-bloco",
+    type=click.IntRange(min=1),
+    default=12,
+    help="número de estágios por partição no formato PARQUET_PARTICIONADO",
+)
+@click.option(
+    "--escritores",
+    type=click.IntRange(min=0),
+    default=2,
+    help="threads para escrita das sínteses em segundo plano",
+)
+@click.option(
+    "--memoria-exportacao",
+    type=click.IntRange(min=1),
+    default=2048,
+    help="memória máxima (MB) dos dados aguardando escrita",
+)
+@click.option(
+    "--estatisticas",
+    type=click.Choice(["EXATO", "APROXIMADO"], case_sensitive=False),
+    default="EXATO",
+    help="modo de cálculo dos quantis das estatísticas dos cenários",
+)
+@click.option(
+    "--tamanho-esboco",
+    type=click.IntRange(min=2),
+    default=500,
+    help="pontos por grupo do resumo das estatísticas aproximadas",
+)
+def app(
+    cache,
+    cache_nwlistop,
+    leitor_nwlistop,
+    compressao,
+    nivel_compressao,
+    linhas_grupo,
+    estatisticas_parquet,
+    indice_paginas,
+    dicionario,
+    estagios_bloco,
+    escritores,
+    memoria_exportacao,
+    estatisticas,
+    tamanho_esboco,
+):
     """
     Aplicação para realizar a síntese de informações em
     um modelo unificado de dados para o NEWAVE.
     """
-    pass
+    if (
+        nivel_compressao is not None
+        and compressao.upper() not in ParquetExportRepository.LEVEL_COMPRESSIONS
+    ):
+        raise click.BadParameter(
+            f"a compressão {compressao.upper()} não aceita nível",
+            param_hint="--nivel-compressao",
+        )
+    os.environ["CACHE_DECK"] = "1" if cache else "0"
+    os.environ["CACHE_NWLISTOP"] = "1" if cache_nwlistop else "0"
+    os.environ["LEITOR_NWLISTOP"] = leitor_nwlistop.upper()
+    os.environ["COMPRESSAO_PARQUET"] = compressao.upper()
+    os.environ["NIVEL_COMPRESSAO_PARQUET"] = (
+        str(nivel_compressao) if nivel_compressao is not None else ""
+    )
+    os.environ["LINHAS_GRUPO_PARQUET"] = (
+        str(linhas_grupo) if linhas_grupo is not None else ""
+    )
+    os.environ["ESTATISTICAS_PARQUET"] = "1" if estatisticas_parquet else "0"
+    os.environ["INDICE_PAGINAS_PARQUET"] = "1" if indice_paginas else "0"
+    os.environ["DICIONARIO_PARQUET"] = dicionario.upper()
+    os.environ["ESTAGIOS_BLOCO_PARQUET"] = str(estagios_bloco)
+    os.environ["ESCRITORES_EXPORTACAO"] = str(escritores)
+    os.environ["MEMORIA_EXPORTACAO"] = str(memoria_exportacao)
+    os.environ["MODO_ESTATISTICAS"] = estatisticas.upper()
+    os.environ["TAMANHO_ESBOCO_ESTATISTICAS"] = str(tamanho_esboco)
 
 
 @click.command("sistema")
@@ -93,7 +233,13 @@ def execucao(variaveis, formato):
     default=1,
     help="numero de processadores para paralelizar",
 )
-def cenarios(variaveis, formato, processadores):
+@click.option(
+    "--iteracoes",
+    default="",
+    callback=valida_selecao,
+    help="iterações para síntese dos cenários (ex: ultima, ultimas:5, 1,3-4)",
+)
+def cenarios(variaveis, formato, processadores, iteracoes):
     """
     Realiza a síntese dos dados de cenários do NEWAVE.
     """
@@ -106,6 +252,7 @@ def cenarios(variaveis, formato, processadores):
 
     os.environ["FORMATO_SINTESE"] = formato
     os.environ["PROCESSADORES"] = str(processadores)
+    os.environ["ITERACOES_CENARIOS"] = iteracoes
     logger.info("# Realizando síntese de CENÁRIOS #")
 
     uow = factory("FS", os.curdir, q)
@@ -130,7 +277,46 @@ def cenarios(variaveis, formato, processadores):
     default=1,
     help="numero de processadores para paralelizar",
 )
-def operacao(variaveis, formato, processadores):
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="refaz apenas as sínteses da operação com entradas alteradas",
+)
+@click.option(
+    "--streaming",
+    is_flag=True,
+    default=False,
+    help="exporta as sínteses das UHEs por partes, limitando a memória",
+)
+@click.option(
+    "--uhes",
+    default="",
+    callback=valida_selecao,
+    help="códigos das UHEs para síntese (ex: 6,18,275)",
+)
+@click.option(
+    "--estagios",
+    default="",
+    callback=valida_selecao,
+    help="estágios para síntese (ex: 1-12)",
+)
+@click.option(
+    "--cenarios",
+    default="",
+    callback=valida_selecao,
+    help="cenários para síntese (ex: 1-200)",
+)
+def operacao(
+    variaveis,
+    formato,
+    processadores,
+    incremental,
+    streaming,
+    uhes,
+    estagios,
+    cenarios,
+):
     """
     Realiza a síntese dos dados da operação do NEWAVE (NWLISTOP).
     """
@@ -143,6 +329,11 @@ def operacao(variaveis, formato, processadores):
 
     os.environ["FORMATO_SINTESE"] = formato
     os.environ["PROCESSADORES"] = str(processadores)
+    os.environ["SINTESE_INCREMENTAL"] = "1" if incremental else "0"
+    os.environ["EXPORTACAO_STREAMING"] = "1" if streaming else "0"
+    os.environ["UHES_OPERACAO"] = uhes
+    os.environ["ESTAGIOS_OPERACAO"] = estagios
+    os.environ["CENARIOS_OPERACAO"] = cenarios
     logger.info("# Realizando síntese da OPERACAO #")
 
     uow = factory("FS", os.curdir, q)
@@ -199,6 +390,11 @@ def limpeza():
 @click.option(
     "--execucao", multiple=True, help="variável da execução para síntese"
 )
+@click.option(
+    "--cenarios",
+    multiple=True,
+    help="variável de cenários para síntese (omitida se não informada)",
+)
 @click.option(
     "--operacao", multiple=True, help="variável da operação para síntese"
 )
@@ -213,7 +409,43 @@ def limpeza():
     default=1,
     help="numero de processadores para paralelizar",
 )
-def completa(sistema, execucao, operacao, politica, formato, processadores):
+@click.option(
+    "--paralelo",
+    is_flag=True,
+    default=False,
+    help="realiza as sínteses simultaneamente",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="refaz apenas as sínteses da operação com entradas alteradas",
+)
+@click.option(
+    "--streaming",
+    is_flag=True,
+    default=False,
+    help="exporta as sínteses das UHEs por partes, limitando a memória",
+)
+@click.option(
+    "--iteracoes",
+    default="",
+    callback=valida_selecao,
+    help="iterações para síntese dos cenários (ex: ultima, ultimas:5, 1,3-4)",
+)
+def completa(
+    sistema,
+    execucao,
+    cenarios,
+    operacao,
+    politica,
+    formato,
+    processadores,
+    paralelo,
+    incremental,
+    streaming,
+    iteracoes,
+):
     """
     Realiza a síntese completa do NEWAVE.
     """
@@ -225,17 +457,130 @@ def completa(sistema, execucao, operacao, politica, formato, processadores):
     logger = Log.configure_main_logger(q)
     os.environ["FORMATO_SINTESE"] = formato
     os.environ["PROCESSADORES"] = str(processadores)
+    os.environ["SINTESE_INCREMENTAL"] = "1" if incremental else "0"
+    os.environ["EXPORTACAO_STREAMING"] = "1" if streaming else "0"
+    os.environ["ITERACOES_CENARIOS"] = iteracoes
     logger.info("# Realizando síntese COMPLETA #")
 
     uow = factory("FS", os.curdir, q)
-    command = commands.SynthetizeSystem(sistema)
-    handlers.synthetize_system(command, uow)
-    command = commands.SynthetizeExecution(execucao)
-    handlers.synthetize_execution(command, uow)
-    command = commands.SynthetizeOperation(operacao)
-    handlers.synthetize_operation(command, uow)
-    command = commands.SynthetizePolicy(politica)
-    handlers.synthetize_policy(command, uow)
+    command = commands.SynthetizeComplete(
+        list(sistema),
+        list(execucao),
+        list(cenarios),
+        list(operacao),
+        list(politica),
+        paralelo,
+    )
+    handlers.synthetize_complete(command, uow)
+
+    logger.info("# Fim da síntese #")
+    time.sleep(1.0)
+    Log.terminate_logging_process()
+
+
+@click.command("lote")
+@click.argument(
+    "casos",
+    nargs=-1,
+    required=True,
+)
+@click.option(
+    "--sistema", multiple=True, help="variável do sistema para síntese"
+)
+@click.option(
+    "--execucao", multiple=True, help="variável da execução para síntese"
+)
+@click.option(
+    "--cenarios",
+    multiple=True,
+    help="variável de cenários para síntese (omitida se não informada)",
+)
+@click.option(
+    "--operacao", multiple=True, help="variável da operação para síntese"
+)
+@click.option(
+    "--politica", multiple=True, help="variável da política para síntese"
+)
+@click.option(
+    "--formato", default="PARQUET", help="formato para escrita da síntese"
+)
+@click.option(
+    "--processadores",
+    default=1,
+    help="numero de processadores para paralelizar",
+)
+@click.option(
+    "--paralelo",
+    is_flag=True,
+    default=False,
+    help="realiza as sínteses de cada caso simultaneamente",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="refaz apenas as sínteses da operação com entradas alteradas",
+)
+@click.option(
+    "--streaming",
+    is_flag=True,
+    default=False,
+    help="exporta as sínteses das UHEs por partes, limitando a memória",
+)
+@click.option(
+    "--iteracoes",
+    default="",
+    callback=valida_selecao,
+    help="iterações para síntese dos cenários (ex: ultima, ultimas:5, 1,3-4)",
+)
+def lote(
+    casos,
+    sistema,
+    execucao,
+    cenarios,
+    operacao,
+    politica,
+    formato,
+    processadores,
+    paralelo,
+    incremental,
+    streaming,
+    iteracoes,
+):
+    """
+    Realiza a síntese completa de um lote de casos do NEWAVE, fornecidos
+    como diretórios ou padrões (glob) de diretórios, um caso por vez.
+    """
+
+    m = Manager()
+    q = m.Queue(-1)
+    Log.start_logging_process(q)
+
+    logger = Log.configure_main_logger(q)
+    os.environ["FORMATO_SINTESE"] = formato
+    os.environ["PROCESSADORES"] = str(processadores)
+    os.environ["SINTESE_INCREMENTAL"] = "1" if incremental else "0"
+    os.environ["EXPORTACAO_STREAMING"] = "1" if streaming else "0"
+    os.environ["ITERACOES_CENARIOS"] = iteracoes
+    logger.info("# Realizando síntese de LOTE #")
+
+    case_dirs = sorted(
+        set([d for c in casos for d in glob(c) if os.path.isdir(d)])
+    )
+    logger.info(f"Casos encontrados: {len(case_dirs)}")
+    uows = [factory("FS", d, q) for d in case_dirs]
+    command = commands.SynthetizeBatch(
+        case_dirs,
+        commands.SynthetizeComplete(
+            list(sistema),
+            list(execucao),
+            list(cenarios),
+            list(operacao),
+            list(politica),
+            paralelo,
+        ),
+    )
+    handlers.synthetize_batch(command, uows)
 
     logger.info("# Fim da síntese #")
     time.sleep(1.0)
@@ -243,6 +588,7 @@ def completa(sistema, execucao, operacao, politica, formato, processadores):
 
 
 app.add_command(completa)
+app.add_command(lote)
 app.add_command(sistema)
 app.add_command(execucao)
 app.add_command(cenarios)
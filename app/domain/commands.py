@@ -25,3 +25,19 @@ class SynthetizeOperation:
 @dataclass
 class SynthetizePolicy:
     variables: List[str]
+
+
+@dataclass
+class SynthetizeComplete:
+    system: List[str]
+    execution: List[str]
+    scenarios: List[str]
+    operation: List[str]
+    policy: List[str]
+    parallel: bool = False
+
+
+@dataclass
+class SynthetizeBatch:
+    cases: List[str]
+    synthesis: SynthetizeComplete
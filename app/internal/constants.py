@@ -62,6 +62,7 @@ DATE_COL = "data"
 CONFIG_COL = "configuracao"
 
 STATS_OR_SCENARIO_COL = "estatistica_ou_cenario"
+QUANTILE_ERROR_COL = "erro_quantil"
 
 CUT_INDEX_COL = "indice_corte"
 COEF_TYPE_COL = "tipo_coeficiente"
@@ -125,6 +126,7 @@ SCENARIO_SYNTHESIS_COMMON_COLUMNS = [
 EXECUTION_SYNTHESIS_METADATA_OUTPUT = "METADADOS_EXECUCAO"
 OPERATION_SYNTHESIS_METADATA_OUTPUT = "METADADOS_OPERACAO"
 OPERATION_SYNTHESIS_STATS_ROOT = "ESTATISTICAS_OPERACAO"
+OPERATION_SYNTHESIS_MANIFEST_OUTPUT = "MANIFESTO_OPERACAO"
 SCENARIO_SYNTHESIS_METADATA_OUTPUT = "METADADOS_CENARIOS"
 SCENARIO_SYNTHESIS_STATS_ROOT = "ESTATISTICAS_CENARIOS"
 POLICY_SYNTHESIS_METADATA_OUTPUT = "METADADOS_POLITICA"
@@ -134,6 +136,17 @@ OPERATION_SYNTHESIS_SUBDIR = ""
 SCENARIO_SYNTHESIS_SUBDIR = ""
 POLICY_SYNTHESIS_SUBDIR = ""
 SYSTEM_SYNTHESIS_SUBDIR = ""
+OPERATION_SYNTHESIS_DATASET = "operacao"
+SCENARIO_SYNTHESIS_DATASET = "cenarios"
+RESOLUTION_PARTITION_COL = "agregacao"
+STEP_PARTITION_COL = "etapa"
+STAGE_BLOCK_PARTITION_COL = "estagio_bloco"
+DATASET_METADATA_FILE = "_metadata"
+DATASET_COMMON_METADATA_FILE = "_common_metadata"
+DECK_DATA_CACHE_SUBDIR = "cache_deck"
+EXPORT_FRAGMENTS_SUBDIR = "fragmentos"
+EXPORT_FRAGMENTS_INDEX = "_chaves.json"
+NWLISTOP_CACHE_SUBDIR = "cache_nwlistop"
 
 QUANTILES_FOR_STATISTICS = [0.05 * i for i in range(21)]
 
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class NwlistopFile:
+    path: str
+    size: int
+    mtime_ns: int
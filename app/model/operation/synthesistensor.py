@@ -0,0 +1,223 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from app.internal.constants import (
+    BLOCK_COL,
+    BLOCK_DURATION_COL,
+    END_DATE_COL,
+    OPERATION_SYNTHESIS_COMMON_COLUMNS,
+    SCENARIO_COL,
+    STAGE_COL,
+    START_DATE_COL,
+    VALUE_COL,
+)
+
+
+class SynthesisTensor:
+    """
+    Dados de uma síntese da operação como um vetor denso com eixos
+    (entidade, estagio, patamar, cenario), acompanhado das coordenadas
+    de cada eixo. As operações sobre estágios, patamares e cenários são
+    realizadas sobre o vetor, e a conversão para o formato de tabela
+    é feita somente quando solicitada.
+
+    O vetor é utilizado somente na resolução dos dados de cada entidade
+    lidos do NWLISTOP, até o cálculo das estatísticas. As agregações
+    espaciais, os limites e a exportação operam sobre o formato de tabela.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        entities: pd.DataFrame,
+        stages: np.ndarray,
+        start_dates: np.ndarray,
+        end_dates: np.ndarray,
+        blocks: np.ndarray,
+        block_durations: np.ndarray,
+        scenarios: np.ndarray,
+    ):
+        self.values = values
+        self.entities = entities
+        self.stages = stages
+        self.start_dates = start_dates
+        self.end_dates = end_dates
+        self.blocks = blocks
+        # Duração, em horas, de cada patamar em cada estágio
+        self.block_durations = block_durations
+        self.scenarios = scenarios
+
+    @classmethod
+    def from_nwlistop(
+        cls,
+        df: pd.DataFrame,
+        num_scenarios: int,
+        start_dates: List[datetime],
+        end_dates: List[datetime],
+        block_lengths: pd.DataFrame,
+        stage_hours: float,
+    ) -> "SynthesisTensor":
+        """
+        Constrói o vetor a partir de uma tabela lida do NWLISTOP, com as
+        colunas `data`, `serie`, `patamar` e `valor`. Os estágios são
+        numerados de `1` ao número de datas distintas e os cenários de
+        `1` a `num_scenarios`, na ordem das datas e séries lidas. A
+        tabela deve conter uma linha para cada data, série e patamar.
+        """
+        date_codes, dates = pd.factorize(df["data"], sort=True)
+        scenario_codes, series = pd.factorize(df["serie"], sort=True)
+        block_codes, blocks = pd.factorize(df[BLOCK_COL], sort=True)
+        num_stages, num_blocks = len(dates), len(blocks)
+        num_rows = num_stages * num_scenarios * num_blocks
+        if len(series) != num_scenarios or df.shape[0] != num_rows:
+            raise ValueError(
+                f"Tabela do NWLISTOP com {df.shape[0]} linhas e"
+                + f" {len(series)} séries, enquanto são esperadas"
+                + f" {num_rows} linhas para {num_stages} datas,"
+                + f" {num_scenarios} séries e {num_blocks} patamares"
+            )
+        order = np.lexsort((block_codes, scenario_codes, date_codes))
+        values = df[VALUE_COL].to_numpy(dtype=np.float64)
+        if not np.array_equal(order, np.arange(len(order))):
+            values = values[order]
+        values = values.reshape(num_stages, num_scenarios, num_blocks)
+        durations = np.zeros((num_stages, num_blocks), dtype=np.float64)
+        block_lengths = block_lengths.loc[block_lengths[BLOCK_COL].isin(blocks)]
+        for i, d in enumerate(start_dates[:num_stages]):
+            durations[i, :] = block_lengths.loc[
+                block_lengths[START_DATE_COL] == d, VALUE_COL
+            ].to_numpy()
+        return cls(
+            values.transpose(0, 2, 1)[np.newaxis],
+            pd.DataFrame(index=[0]),
+            np.arange(1, num_stages + 1),
+            np.asarray(dates),
+            np.array(end_dates[:num_stages]),
+            np.asarray(blocks),
+            durations * stage_hours,
+            np.arange(1, num_scenarios + 1),
+        )
+
+    def select_stages(self, mask: np.ndarray) -> "SynthesisTensor":
+        """
+        Mantém somente os estágios indicados por uma máscara.
+        """
+        return SynthesisTensor(
+            self.values[:, mask],
+            self.entities,
+            self.stages[mask],
+            self.start_dates[mask],
+            self.end_dates[mask],
+            self.blocks,
+            self.block_durations[mask],
+            self.scenarios,
+        )
+
+    def select_scenarios(self, mask: np.ndarray) -> "SynthesisTensor":
+        """
+        Mantém somente os cenários indicados por uma máscara.
+        """
+        return SynthesisTensor(
+            self.values[..., mask],
+            self.entities,
+            self.stages,
+            self.start_dates,
+            self.end_dates,
+            self.blocks,
+            self.block_durations,
+            self.scenarios[mask],
+        )
+
+    def shift_stages(self, offset: int) -> "SynthesisTensor":
+        """
+        Desloca a numeração dos estágios.
+        """
+        return SynthesisTensor(
+            self.values,
+            self.entities,
+            self.stages + offset,
+            self.start_dates,
+            self.end_dates,
+            self.blocks,
+            self.block_durations,
+            self.scenarios,
+        )
+
+    def with_block_0_weighted_mean(
+        self, stage_hours: float
+    ) -> "SynthesisTensor":
+        """
+        Adiciona o patamar `0`, com o valor médio de cada estágio
+        ponderado pelas durações dos patamares.
+        """
+        weights = self.block_durations[np.newaxis, :, :, np.newaxis]
+        mean = (self.values * weights / stage_hours).sum(axis=2)
+        durations = np.full(
+            (self.block_durations.shape[0], 1), stage_hours, dtype=np.float64
+        )
+        return SynthesisTensor(
+            np.concatenate([mean[:, :, np.newaxis], self.values], axis=2),
+            self.entities,
+            self.stages,
+            self.start_dates,
+            self.end_dates,
+            np.concatenate([np.zeros(1, dtype=self.blocks.dtype), self.blocks]),
+            np.concatenate([durations, self.block_durations], axis=1),
+            self.scenarios,
+        )
+
+    def with_entity(self, columns: Dict[str, Any]) -> "SynthesisTensor":
+        """
+        Atribui as colunas de identificação de um vetor com uma
+        única entidade.
+        """
+        return SynthesisTensor(
+            self.values,
+            pd.DataFrame({c: [v] for c, v in columns.items()}, index=[0]),
+            self.stages,
+            self.start_dates,
+            self.end_dates,
+            self.blocks,
+            self.block_durations,
+            self.scenarios,
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Converte o vetor para o formato de tabela, ordenado por
+        entidade, estágio, cenário e patamar, com as colunas comuns
+        das sínteses seguidas pelas colunas das entidades.
+        """
+        num_entities, num_stages, num_blocks, num_scenarios = self.values.shape
+        stage_size = num_scenarios * num_blocks
+        entity_size = num_stages * stage_size
+        data = {
+            STAGE_COL: np.tile(
+                np.repeat(self.stages, stage_size), num_entities
+            ),
+            START_DATE_COL: np.tile(
+                np.repeat(self.start_dates, stage_size), num_entities
+            ),
+            END_DATE_COL: np.tile(
+                np.repeat(self.end_dates, stage_size), num_entities
+            ),
+            SCENARIO_COL: np.tile(
+                np.repeat(self.scenarios, num_blocks),
+                num_entities * num_stages,
+            ),
+            BLOCK_COL: np.tile(
+                self.blocks, num_entities * num_stages * num_scenarios
+            ),
+            BLOCK_DURATION_COL: np.tile(
+                np.repeat(self.block_durations, num_scenarios, axis=0).ravel(),
+                num_entities,
+            ),
+            VALUE_COL: self.values.transpose(0, 1, 3, 2).ravel(),
+        }
+        df = pd.DataFrame(data=data)[OPERATION_SYNTHESIS_COMMON_COLUMNS]
+        for col in self.entities.columns:
+            df[col] = np.repeat(self.entities[col].to_numpy(), entity_size)
+        return df
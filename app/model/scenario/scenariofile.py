@@ -0,0 +1,115 @@
+import os
+from typing import Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+class ScenarioFile:
+    """
+    Arquivo binário de cenários gerados pelo NEWAVE, mapeado em memória
+    como um vetor com eixos (estagio, entidade, serie) ou, quando existem
+    aberturas, (estagio, entidade, serie, abertura). A conversão para o
+    formato de tabela é feita somente quando solicitada.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entity: str,
+        num_stages: int,
+        num_past_stages: int,
+        num_entities: int,
+        num_series: int,
+        num_openings: Optional[int] = None,
+        record_size: Optional[int] = None,
+    ):
+        self.path = path
+        self.entity = entity
+        self.first_stage = 1 - num_past_stages
+        self.last_stage = num_stages
+        shape: Tuple[int, ...] = (num_entities, num_series)
+        if num_openings is not None:
+            shape += (num_openings,)
+        stage_size = int(np.prod(shape))
+        # Os registros de cada estágio podem ser completados até
+        # um tamanho fixo de registro
+        stride = stage_size
+        if record_size is not None and stage_size % record_size != 0:
+            stride += record_size - stage_size % record_size
+        num_total_stages = num_stages + num_past_stages
+        data = self.__map_file(path, num_total_stages * stride)
+        self.values = data.reshape(num_total_stages, stride)[
+            :, :stage_size
+        ].reshape((num_total_stages,) + shape)
+
+    @staticmethod
+    def __map_file(path: str, count: int) -> np.ndarray:
+        """
+        Mapeia os valores do arquivo em memória. Arquivos menores do
+        que o esperado são lidos com os valores ausentes nulos.
+        """
+        available = os.path.getsize(path) // np.dtype(np.float64).itemsize
+        if count > 0 and available >= count:
+            return np.memmap(path, dtype=np.float64, mode="r", shape=(count,))
+        data = np.full(count, np.nan, dtype=np.float64)
+        data[:available] = np.fromfile(
+            path, dtype=np.float64, count=min(available, count)
+        )
+        return data
+
+    @property
+    def stages(self) -> np.ndarray:
+        return np.arange(self.first_stage, self.last_stage + 1)
+
+    def to_dataframe(
+        self,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Converte os valores de um intervalo de estágios para uma tabela
+        com as colunas `estagio`, a entidade, `serie`, `abertura` (quando
+        existir) e `valor`.
+        """
+        first = self.first_stage if first_stage is None else first_stage
+        last = self.last_stage if last_stage is None else last_stage
+        first = max(first, self.first_stage)
+        last = min(last, self.last_stage)
+        values = self.values[
+            first - self.first_stage : max(last - self.first_stage + 1, 0)
+        ]
+        num_stages = values.shape[0]
+        num_entities, num_series = values.shape[1], values.shape[2]
+        num_openings = values.shape[3] if values.ndim == 4 else 1
+        stage_size = num_entities * num_series * num_openings
+        data = {
+            "estagio": np.repeat(
+                np.arange(first, first + num_stages), stage_size
+            ),
+            self.entity: np.tile(
+                np.repeat(
+                    np.arange(1, num_entities + 1), num_series * num_openings
+                ),
+                num_stages,
+            ),
+            "serie": np.tile(
+                np.repeat(np.arange(1, num_series + 1), num_openings),
+                num_entities * num_stages,
+            ),
+        }
+        if values.ndim == 4:
+            data["abertura"] = np.tile(
+                np.arange(1, num_openings + 1),
+                num_entities * num_stages * num_series,
+            )
+        data["valor"] = np.array(values, dtype=np.float64).ravel()
+        return pd.DataFrame(data=data)
+
+    @property
+    def series(self) -> pd.DataFrame:
+        """
+        Tabela com os valores de todos os estágios, no mesmo formato
+        fornecido pela inewave.
+        """
+        return self.to_dataframe()
@@ -7,8 +7,30 @@ class Settings(metaclass=Singleton):
         # Execution parameters
         self.installdir = getenv("APP_INSTALLDIR")
         self.basedir = getenv("APP_BASEDIR")
-        self.encoding_script = "app/static/converte_utf8.sh"
         self.file_repository = getenv("REPOSITORIO_ARQUIVOS", "FS")
         self.synthesis_format = getenv("FORMATO_SINTESE", "PARQUET")
         self.synthesis_dir = getenv("DIRETORIO_SINTESE", "sintese")
         self.processors = getenv("PROCESSADORES", 1)
+        self.incremental_synthesis = getenv("SINTESE_INCREMENTAL", "0") == "1"
+        self.deck_data_cache = getenv("CACHE_DECK", "0") == "1"
+        self.nwlistop_cache = getenv("CACHE_NWLISTOP", "0") == "1"
+        self.nwlistop_parser = getenv("LEITOR_NWLISTOP", "INEWAVE")
+        self.scenario_iterations = getenv("ITERACOES_CENARIOS", "")
+        self.operation_hydros = getenv("UHES_OPERACAO", "")
+        self.operation_stages = getenv("ESTAGIOS_OPERACAO", "")
+        self.operation_scenarios = getenv("CENARIOS_OPERACAO", "")
+        self.streaming_export = getenv("EXPORTACAO_STREAMING", "0") == "1"
+        self.export_threads = getenv("ESCRITORES_EXPORTACAO", "2")
+        self.export_memory_budget = getenv("MEMORIA_EXPORTACAO", "2048")
+        self.statistics_mode = getenv("MODO_ESTATISTICAS", "EXATO")
+        self.statistics_sketch_size = getenv(
+            "TAMANHO_ESBOCO_ESTATISTICAS", "500"
+        )
+        # Parquet export profile
+        self.parquet_compression = getenv("COMPRESSAO_PARQUET", "SNAPPY")
+        self.parquet_compression_level = getenv("NIVEL_COMPRESSAO_PARQUET", "")
+        self.parquet_row_group_size = getenv("LINHAS_GRUPO_PARQUET", "")
+        self.parquet_statistics = getenv("ESTATISTICAS_PARQUET", "0") == "1"
+        self.parquet_page_index = getenv("INDICE_PAGINAS_PARQUET", "0") == "1"
+        self.parquet_dictionary = getenv("DICIONARIO_PARQUET", "TODAS")
+        self.parquet_stage_block = getenv("ESTAGIOS_BLOCO_PARQUET", "12")
@@ -0,0 +1,201 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from app.internal.constants import (
+    EER_CODE_COL,
+    HYDRO_CODE_COL,
+    SUBMARKET_CODE_COL,
+    THERMAL_CODE_COL,
+)
+from app.services.deck.deck import Deck
+from app.services.unitofwork import AbstractUnitOfWork
+from app.utils.operations import group_labels, sum_by_labels
+
+
+class SpatialAggregation:
+    """
+    Agregação espacial das sínteses a partir da relação entre as
+    entidades do caso. Para cada cadeia de agregação (UHE → REE → SBM
+    → SIN e UTE → SBM → SIN) é construída, uma única vez por caso, a
+    matriz de incidência de cada nível no nível seguinte. Como cada
+    entidade pertence a uma única entidade do nível seguinte, a matriz
+    é armazenada como o índice da entidade agregada de cada entidade.
+
+    A agregação de uma tabela para qualquer nível mais grosso é obtida
+    pelo produto das matrizes de incidência, aplicado ao índice da
+    entidade de cada linha, seguido de uma soma dos valores por grupo.
+    """
+
+    HYDRO_LEVELS = [HYDRO_CODE_COL, EER_CODE_COL, SUBMARKET_CODE_COL]
+    THERMAL_LEVELS = [THERMAL_CODE_COL, SUBMARKET_CODE_COL]
+
+    # Tabela do deck com os códigos de todos os níveis de cada cadeia
+    CHAINS: Dict[Tuple[str, ...], Callable] = {
+        tuple(HYDRO_LEVELS): Deck.hydro_eer_submarket_map,
+        tuple(THERMAL_LEVELS): Deck.thermal_submarket_map,
+    }
+
+    # Para cada cadeia, os códigos das entidades de cada nível e o
+    # índice da entidade do nível seguinte de cada entidade
+    INCIDENCES: Dict[Tuple[str, ...], List[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Limpa o cache de matrizes de incidência.
+        """
+        cls.INCIDENCES.clear()
+
+    @staticmethod
+    def _build_incidences(
+        entities_df: pd.DataFrame, levels: List[str]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Constrói as matrizes de incidência entre os níveis de uma cadeia
+        de agregação, a partir de uma tabela com os códigos de todos os
+        níveis para cada entidade do nível mais fino.
+        """
+        incidences: List[Tuple[np.ndarray, np.ndarray]] = []
+        for i, col in enumerate(levels):
+            level_df = entities_df.drop_duplicates(subset=[col])
+            codes = np.sort(level_df[col].to_numpy())
+            parents = np.zeros(len(codes), dtype=np.int64)
+            if i + 1 < len(levels):
+                parent_codes = np.unique(entities_df[levels[i + 1]])
+                parents[np.searchsorted(codes, level_df[col].to_numpy())] = (
+                    np.searchsorted(
+                        parent_codes, level_df[levels[i + 1]].to_numpy()
+                    )
+                )
+            incidences.append((codes, parents))
+        return incidences
+
+    @classmethod
+    def _incidences(
+        cls, levels: List[str], uow: AbstractUnitOfWork
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Obtém as matrizes de incidência de uma cadeia de agregação,
+        construindo-as a partir dos dados do deck na primeira chamada.
+        """
+        chain = tuple(levels)
+        if chain not in cls.CHAINS:
+            raise ValueError(f"Cadeia de agregação não suportada: {levels}")
+        if chain not in cls.INCIDENCES:
+            entities_df = cls.CHAINS[chain](uow)
+            cls.INCIDENCES[chain] = cls._build_incidences(
+                entities_df.reset_index(), levels
+            )
+        return cls.INCIDENCES[chain]
+
+    @classmethod
+    def _entity_groups(
+        cls,
+        df: pd.DataFrame,
+        levels: List[str],
+        entity_columns: List[str],
+        uow: AbstractUnitOfWork,
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Obtém o índice da entidade agregada de cada linha, partindo do
+        nível mais fino existente na tabela até o nível da primeira
+        coluna de entidade, e o número de entidades agregadas. Retorna
+        None caso existam entidades desconhecidas ou cujas entidades
+        agregadas na tabela difiram das obtidas pelas incidências.
+        """
+        incidences = cls._incidences(levels, uow)
+        finest = next(i for i, c in enumerate(levels) if c in df.columns)
+        target = levels.index(entity_columns[0])
+        codes, _ = incidences[finest]
+        values = df[levels[finest]].to_numpy()
+        known = pd.notna(values)
+        if finest != target and not known.all():
+            return None
+        index = np.searchsorted(codes, np.where(known, values, codes[0]))
+        index = np.minimum(index, len(codes) - 1)
+        for level in range(finest, len(levels)):
+            codes, parents = incidences[level]
+            col = levels[level]
+            if col in entity_columns or level == finest:
+                values = df[col].to_numpy()
+                known = pd.notna(values)
+                if not (codes[index][known] == values[known]).all():
+                    return None
+            if level == target:
+                return np.where(known, index, -1), len(codes)
+            index = parents[index]
+        return None
+
+    @staticmethod
+    def _group_sum(
+        df: pd.DataFrame,
+        grouping_columns: List[str],
+        value_columns: List[str],
+        engine: str,
+        sort: bool,
+    ) -> pd.DataFrame:
+        return (
+            df.groupby(grouping_columns, sort=sort)[value_columns]
+            .sum(engine=engine)
+            .reset_index()
+        )
+
+    @classmethod
+    def aggregate(
+        cls,
+        df: pd.DataFrame,
+        levels: List[str],
+        entity_columns: List[str],
+        other_columns: List[str],
+        value_columns: List[str],
+        uow: AbstractUnitOfWork,
+        engine: str,
+        sort: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Agrega os valores de uma tabela no nível da primeira das colunas
+        de entidade fornecidas, dentre os níveis de uma cadeia de
+        agregação, somando-os para cada combinação das demais colunas de
+        identificação. Sem colunas de entidade, a agregação é feita para
+        o SIN. O resultado é idêntico ao de
+        `df.groupby(entity_columns + other_columns, sort=sort).sum()`
+        com a engine fornecida.
+        """
+        grouping_columns = entity_columns + other_columns
+        entity_groups: Optional[Tuple[np.ndarray, int]] = None
+        if len(entity_columns) == 0:
+            entity_groups = (np.zeros(df.shape[0], dtype=np.int64), 1)
+        elif not df.empty:
+            entity_groups = cls._entity_groups(df, levels, entity_columns, uow)
+        if entity_groups is None:
+            return cls._group_sum(
+                df, grouping_columns, value_columns, engine, sort
+            )
+        keys, num_keys = entity_groups
+        for col in entity_columns:
+            keys = np.where(df[col].notna().to_numpy(), keys, -1)
+        try:
+            labels = group_labels(
+                df, other_columns, sort=sort, keys=keys, num_keys=num_keys
+            )
+        except OverflowError:
+            return cls._group_sum(
+                df, grouping_columns, value_columns, engine, sort
+            )
+        num_groups = int(labels.max(initial=-1)) + 1
+        rows = pd.Series(labels).drop_duplicates()
+        rows = rows.loc[rows >= 0]
+        first = np.empty(num_groups, dtype=np.int64)
+        first[rows.to_numpy()] = rows.index.to_numpy()
+        grouped_df = df[grouping_columns].iloc[first].reset_index(drop=True)
+        sums = sum_by_labels(
+            df[value_columns].to_numpy(dtype=np.float64),
+            labels,
+            num_groups,
+            engine,
+        )
+        for i, col in enumerate(value_columns):
+            grouped_df[col] = sums[:, i]
+        return grouped_df
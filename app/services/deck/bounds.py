@@ -15,6 +15,7 @@ from app.internal.constants import (
     HYDRO_CODE_COL,
     IDENTIFICATION_COLUMNS,
     LOWER_BOUND_COL,
+    PANDAS_GROUPING_ENGINE,
     SCENARIO_COL,
     STAGE_COL,
     STAGE_DURATION_HOURS,
@@ -28,9 +29,9 @@ from app.model.operation.operationsynthesis import OperationSynthesis
 from app.model.operation.spatialresolution import SpatialResolution
 from app.model.operation.unit import Unit
 from app.model.operation.variable import Variable
+from app.services.deck.aggregation import SpatialAggregation
 from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
-from app.utils.operations import fast_group_df
 
 
 class OperationVariableBounds:
@@ -397,19 +398,19 @@ class OperationVariableBounds:
             Variable.VOLUME_AFLUENTE,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_AFLUENTE,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_AFLUENTE,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_AFLUENTE,
@@ -423,7 +424,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_AFLUENTE,
@@ -431,7 +432,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_AFLUENTE,
@@ -439,7 +440,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_INCREMENTAL,
@@ -451,19 +452,19 @@ class OperationVariableBounds:
             Variable.VOLUME_INCREMENTAL,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_INCREMENTAL,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_INCREMENTAL,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_INCREMENTAL,
@@ -477,7 +478,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_INCREMENTAL,
@@ -485,7 +486,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_INCREMENTAL,
@@ -493,7 +494,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_TURBINADO,
@@ -511,19 +512,19 @@ class OperationVariableBounds:
             Variable.VOLUME_TURBINADO,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_TURBINADO,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_TURBINADO,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_TURBINADA,
@@ -543,7 +544,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_TURBINADA,
@@ -551,7 +552,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_TURBINADA,
@@ -559,7 +560,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_VERTIDO,
@@ -571,19 +572,19 @@ class OperationVariableBounds:
             Variable.VOLUME_VERTIDO,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_VERTIDO,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_VERTIDO,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_VERTIDA,
@@ -597,7 +598,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_VERTIDA,
@@ -605,7 +606,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_VERTIDA,
@@ -613,7 +614,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_DEFLUENTE,
@@ -629,19 +630,19 @@ class OperationVariableBounds:
             Variable.VOLUME_DEFLUENTE,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_DEFLUENTE,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_DEFLUENTE,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_DEFLUENTE,
@@ -659,7 +660,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_DEFLUENTE,
@@ -667,7 +668,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_DEFLUENTE,
@@ -675,7 +676,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_RETIRADO,
@@ -693,19 +694,19 @@ class OperationVariableBounds:
             Variable.VOLUME_RETIRADO,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_RETIRADO,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_RETIRADO,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_RETIRADA,
@@ -725,7 +726,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_RETIRADA,
@@ -733,7 +734,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_RETIRADA,
@@ -741,7 +742,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_DESVIADO,
@@ -755,19 +756,19 @@ class OperationVariableBounds:
             Variable.VOLUME_DESVIADO,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_DESVIADO,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_DESVIADO,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_DESVIADA,
@@ -783,7 +784,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_DESVIADA,
@@ -791,7 +792,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_DESVIADA,
@@ -799,7 +800,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VOLUME_EVAPORADO,
@@ -811,19 +812,19 @@ class OperationVariableBounds:
             Variable.VOLUME_EVAPORADO,
             SpatialResolution.RESERVATORIO_EQUIVALENTE,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_EVAPORADO,
             SpatialResolution.SUBMERCADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VOLUME_EVAPORADO,
             SpatialResolution.SISTEMA_INTERLIGADO,
         ): lambda df, uow, _: OperationVariableBounds._group_hydro_df(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.VAZAO_EVAPORADA,
@@ -837,7 +838,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=EER_CODE_COL
+            df, uow, grouping_column=EER_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_EVAPORADA,
@@ -845,7 +846,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=SUBMARKET_CODE_COL
+            df, uow, grouping_column=SUBMARKET_CODE_COL
         ),
         OperationSynthesis(
             Variable.VAZAO_EVAPORADA,
@@ -853,7 +854,7 @@ class OperationVariableBounds:
         ): lambda df,
         uow,
         _: OperationVariableBounds._group_hydro_df_vol_flow_cast(
-            df, grouping_column=None
+            df, uow, grouping_column=None
         ),
         OperationSynthesis(
             Variable.INTERCAMBIO,
@@ -927,17 +928,21 @@ class OperationVariableBounds:
             upper_bound_df = Deck.stored_energy_upper_bounds(uow)
             lower_bound_df = Deck.eer_stored_energy_lower_bounds(uow)
             if initial:
-                for df, limit in zip(
+                for bound_df, limit in zip(
                     [upper_bound_df, lower_bound_df], [float("inf"), 0.0]
                 ):
-                    df[START_DATE_COL] += pd.DateOffset(months=1)
+                    bound_df[START_DATE_COL] += pd.DateOffset(months=1)
                     stages = Deck.stages_starting_dates_final_simulation(uow)
                     first_stage = stages[0]
                     last_stage = stages[-1] + relativedelta(months=1)
-                    df.loc[df[START_DATE_COL] == last_stage, VALUE_COL] = limit
-                    df.loc[df[START_DATE_COL] == last_stage, START_DATE_COL] = (
-                        first_stage
-                    )
+                    bound_df.loc[
+                        bound_df[START_DATE_COL] == last_stage, VALUE_COL
+                    ] = limit
+                    bound_df.loc[
+                        bound_df[START_DATE_COL] == last_stage, START_DATE_COL
+                    ] = first_stage
+            upper_bound_df = cls._filter_synthesis_dates(upper_bound_df, df)
+            lower_bound_df = cls._filter_synthesis_dates(lower_bound_df, df)
 
             upper_bounds = (
                 upper_bound_df.groupby(grouping_columns, as_index=False)
@@ -996,6 +1001,18 @@ class OperationVariableBounds:
         df = _sort_and_round_bounds(df)
         return df
 
+    @classmethod
+    def _filter_synthesis_dates(
+        cls, bounds_df: pd.DataFrame, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Mantém somente os limites das datas existentes na síntese, que
+        pode conter apenas parte dos estágios do caso.
+        """
+        return bounds_df.loc[
+            bounds_df[START_DATE_COL].isin(df[START_DATE_COL].unique())
+        ].reset_index(drop=True)
+
     @classmethod
     def _repeats_data_by_scenario(
         cls,
@@ -1048,7 +1065,10 @@ class OperationVariableBounds:
 
     @classmethod
     def _group_hydro_df(
-        cls, df: pd.DataFrame, grouping_column: Optional[str] = None
+        cls,
+        df: pd.DataFrame,
+        uow: AbstractUnitOfWork,
+        grouping_column: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Realiza a agregação de variáveis fornecidas a nível de UHE
@@ -1078,24 +1098,30 @@ class OperationVariableBounds:
         mapped_columns = (
             grouping_column_map[grouping_column] if grouping_column else []
         )
-        grouping_columns = mapped_columns + [
+        other_columns = [
             c
             for c in df.columns
             if c in IDENTIFICATION_COLUMNS and c not in valid_grouping_columns
         ]
 
-        grouped_df = fast_group_df(
+        grouped_df = SpatialAggregation.aggregate(
             df,
-            grouping_columns,
+            SpatialAggregation.HYDRO_LEVELS,
+            mapped_columns,
+            other_columns,
             [VALUE_COL, LOWER_BOUND_COL, UPPER_BOUND_COL],
-            operation="sum",
+            uow,
+            engine=PANDAS_GROUPING_ENGINE,
         )
 
         return grouped_df
 
     @classmethod
     def _group_thermal_df(
-        cls, df: pd.DataFrame, grouping_column: Optional[str] = None
+        cls,
+        df: pd.DataFrame,
+        uow: AbstractUnitOfWork,
+        grouping_column: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Realiza a agregação de variáveis fornecidas a nível de UHE
@@ -1119,24 +1145,30 @@ class OperationVariableBounds:
         mapped_columns = (
             grouping_column_map[grouping_column] if grouping_column else []
         )
-        grouping_columns = mapped_columns + [
+        other_columns = [
             c
             for c in df.columns
             if c in IDENTIFICATION_COLUMNS and c not in valid_grouping_columns
         ]
 
-        grouped_df = fast_group_df(
+        grouped_df = SpatialAggregation.aggregate(
             df,
-            grouping_columns,
+            SpatialAggregation.THERMAL_LEVELS,
+            mapped_columns,
+            other_columns,
             [VALUE_COL],
-            operation="sum",
+            uow,
+            engine=PANDAS_GROUPING_ENGINE,
         )
 
         return grouped_df
 
     @classmethod
     def _group_hydro_df_vol_flow_cast(
-        cls, df: pd.DataFrame, grouping_column: Optional[str] = None
+        cls,
+        df: pd.DataFrame,
+        uow: AbstractUnitOfWork,
+        grouping_column: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Realiza a agregação de variáveis fornecidas a nível de UHE
@@ -1146,7 +1178,7 @@ class OperationVariableBounds:
         É usada em casos em que osdados são fornecidos em unidade
         de volume, mas a síntese desejada é em unidade de vazão.
         """
-        df_group = cls._group_hydro_df(df, grouping_column)
+        df_group = cls._group_hydro_df(df, uow, grouping_column)
         for c in [VALUE_COL, LOWER_BOUND_COL, UPPER_BOUND_COL]:
             df_group[c] = (
                 df_group[c]
@@ -1199,6 +1231,9 @@ class OperationVariableBounds:
                     volume_bounds_in_stages_df[START_DATE_COL] == last_stage,
                     START_DATE_COL,
                 ] = first_stage
+            volume_bounds_in_stages_df = cls._filter_synthesis_dates(
+                volume_bounds_in_stages_df, df
+            )
 
             grouped_bounds_df = (
                 volume_bounds_in_stages_df.groupby(
@@ -1266,7 +1301,7 @@ class OperationVariableBounds:
         grouping_columns = entity_column_list + [START_DATE_COL]
         lower_bounds, upper_bounds = _get_group_and_cast_bounds()
         if entity_column != HYDRO_CODE_COL:
-            df = cls._group_hydro_df(df, entity_column)
+            df = cls._group_hydro_df(df, uow, entity_column)
         df = _repeat_bounds_by_scenario(
             df,
             lower_bounds,
@@ -1296,6 +1331,7 @@ class OperationVariableBounds:
             outflow_bounds = outflow_bounds.loc[
                 outflow_bounds[HYDRO_CODE_COL].isin(synthesis_hydro_codes)
             ].reset_index(drop=True)
+            outflow_bounds = cls._filter_synthesis_dates(outflow_bounds, df)
 
             grouped_bounds_df = (
                 outflow_bounds.groupby(grouping_columns, as_index=False)
@@ -1361,7 +1397,7 @@ class OperationVariableBounds:
         ]
         lower_bounds, upper_bounds = _get_group_for_bounds()
         if entity_column != HYDRO_CODE_COL:
-            df = cls._group_hydro_df(df, entity_column)
+            df = cls._group_hydro_df(df, uow, entity_column)
         df = _repeat_bounds_by_scenario_and_cast(
             df,
             lower_bounds,
@@ -1397,6 +1433,9 @@ class OperationVariableBounds:
             turbined_flow_bounds = turbined_flow_bounds.loc[
                 turbined_flow_bounds[HYDRO_CODE_COL].isin(synthesis_hydro_codes)
             ].reset_index(drop=True)
+            turbined_flow_bounds = cls._filter_synthesis_dates(
+                turbined_flow_bounds, df
+            )
 
             grouped_bounds_df = (
                 turbined_flow_bounds.groupby(grouping_columns, as_index=False)
@@ -1463,7 +1502,7 @@ class OperationVariableBounds:
         ]
         lower_bounds, upper_bounds = _get_group_for_bounds()
         if entity_column != HYDRO_CODE_COL:
-            df = cls._group_hydro_df(df, entity_column)
+            df = cls._group_hydro_df(df, uow, entity_column)
         df = _repeat_bounds_by_scenario_and_cast(
             df,
             lower_bounds,
@@ -1495,6 +1534,9 @@ class OperationVariableBounds:
                     synthesis_hydro_codes
                 )
             ].reset_index(drop=True)
+            flow_diversion_bounds = cls._filter_synthesis_dates(
+                flow_diversion_bounds, df
+            )
 
             grouped_bounds_df = (
                 flow_diversion_bounds.groupby(grouping_columns, as_index=False)
@@ -1560,7 +1602,7 @@ class OperationVariableBounds:
         ]
         lower_bounds, upper_bounds = _get_group_for_bounds()
         if entity_column != HYDRO_CODE_COL:
-            df = cls._group_hydro_df(df, entity_column)
+            df = cls._group_hydro_df(df, uow, entity_column)
         df = _repeat_bounds_by_scenario_and_cast(
             df,
             lower_bounds,
@@ -1744,6 +1786,7 @@ class OperationVariableBounds:
             bounds_df = Deck.thermal_generation_bounds(uow)
             dates = Deck.stages_starting_dates_final_simulation(uow)
             bounds_df = bounds_df.loc[bounds_df[START_DATE_COL] >= dates[0]]
+            bounds_df = cls._filter_synthesis_dates(bounds_df, df)
             if entity_column:
                 bounds_entities = bounds_df[entity_column].unique().tolist()
                 diff = list(set(entity_list).difference(bounds_entities))
@@ -1820,7 +1863,7 @@ class OperationVariableBounds:
             entity_column, entity_list
         )
         if entity_column != THERMAL_CODE_COL:
-            df = cls._group_thermal_df(df, entity_column)
+            df = cls._group_thermal_df(df, uow, entity_column)
 
         df = _repeat_bounds_by_scenario_and_block(
             df,
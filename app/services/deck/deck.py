@@ -1,7 +1,22 @@
+import os
+import pickle
 from datetime import datetime, timedelta
 from functools import partial
-from logging import ERROR, INFO, Logger
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from glob import glob
+from logging import DEBUG, ERROR, INFO, Logger
+from os.path import isfile, join
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from uuid import uuid4
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
@@ -14,11 +29,6 @@ from inewave.newave import (
     Curva,
     Dger,
     Dsvagua,
-    Enavazb,
-    Enavazf,
-    Energiab,
-    Energiaf,
-    Energias,
     Engnat,
     Expt,
     Hidr,
@@ -31,10 +41,6 @@ from inewave.newave import (
     Shist,
     Sistema,
     Term,
-    Vazaob,
-    Vazaof,
-    # Enavazs,
-    Vazaos,
     Vazoes,
 )
 from inewave.newave.modelos.modif import (
@@ -54,6 +60,7 @@ from inewave.newave.modelos.modif import (
 )
 from inewave.nwlistcf import Estados, Nwlistcfrel
 
+from app import __version__
 from app.internal.constants import (
     BLOCK_COL,
     COEF_TYPE_COL,
@@ -107,8 +114,12 @@ from app.internal.constants import (
 )
 from app.model.operation.unit import Unit
 from app.model.policy.unit import Unit as PolicyUnit
+from app.model.scenario.scenariofile import ScenarioFile
+from app.model.settings import Settings
 from app.services.unitofwork import AbstractUnitOfWork
-from app.utils.graph import Graph
+from app.utils.fingerprint import combine_fingerprints, files_fingerprint
+from app.utils.graph import Cascade
+from app.utils.selection import parse_selection
 
 
 class Deck:
@@ -122,6 +133,104 @@ class Deck:
 
     DECK_DATA_CACHING: Dict[str, Any] = {}
 
+    # Dados do deck que também são armazenados em disco, no diretório
+    # da síntese, com os arquivos de saída do NEWAVE dos quais dependem
+    # além dos arquivos de entrada do caso.
+    PERSISTENT_DATA_SOURCES: Dict[str, List[str]] = {
+        "pmo": [],
+        "curva": [],
+        "modif": [],
+        "confhd": [],
+        "clast": [],
+        "term": [],
+        "manutt": [],
+        "expt": [],
+        "hidr": [],
+        "vazoes": [],
+        "thermal_generation_bounds": [],
+        "hydros": [],
+        "hydro_volume_bounds_in_stages": [],
+        "block_lengths": [],
+        "common_policy_df": ["nwlistcf.rel", "estados.rel"],
+    }
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Limpa o cache de dados do deck.
+        """
+        cls.DECK_DATA_CACHING.clear()
+
+    @classmethod
+    def _persistent_data_fingerprint(
+        cls, key: str, uow: AbstractUnitOfWork
+    ) -> str:
+        """
+        Obtém a assinatura dos arquivos dos quais depende um dado
+        do deck armazenado em disco.
+        """
+        with uow:
+            deck_fingerprint = cls.DECK_DATA_CACHING.get("deck_fingerprint")
+            if deck_fingerprint is None:
+                deck_fingerprint = combine_fingerprints(
+                    [__version__, files_fingerprint(uow.files.get_deck_files())]
+                )
+                cls.DECK_DATA_CACHING["deck_fingerprint"] = deck_fingerprint
+            sources = uow.files.get_case_files(
+                cls.PERSISTENT_DATA_SOURCES[key]
+            )
+        return combine_fingerprints(
+            [deck_fingerprint, files_fingerprint(sources)]
+        )
+
+    @classmethod
+    def _get_cached_data(cls, key: str, uow: AbstractUnitOfWork) -> Any:
+        """
+        Obtém um dado do deck da cache em memória ou, caso habilitado,
+        do armazenamento em disco, se os arquivos dos quais depende não
+        tiverem sido alterados.
+        """
+        data = cls.DECK_DATA_CACHING.get(key)
+        if data is not None or not Settings().deck_data_cache:
+            return data
+        fingerprint = cls._persistent_data_fingerprint(key, uow)
+        path = join(uow.cache_dir, f"{key}.{fingerprint}.pkl")
+        if not isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            cls._log(f"Erro na leitura de {key} da cache: {e}", ERROR)
+            return None
+        cls.DECK_DATA_CACHING[key] = data
+        return data
+
+    @classmethod
+    def _set_cached_data(cls, key: str, data: Any, uow: AbstractUnitOfWork):
+        """
+        Armazena um dado do deck na cache em memória e, caso habilitado,
+        em disco, substituindo versões obtidas de arquivos anteriores.
+        """
+        cls.DECK_DATA_CACHING[key] = data
+        if not Settings().deck_data_cache:
+            return
+        fingerprint = cls._persistent_data_fingerprint(key, uow)
+        path = join(uow.cache_dir, f"{key}.{fingerprint}.pkl")
+        tmp_path = f"{path}.{uuid4().hex}.tmp"
+        try:
+            os.makedirs(uow.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            for old_path in glob(join(uow.cache_dir, f"{key}.*.pkl")):
+                if old_path != path:
+                    os.remove(old_path)
+        except Exception as e:
+            cls._log(f"Erro na escrita de {key} na cache: {e}", ERROR)
+            if isfile(tmp_path):
+                os.remove(tmp_path)
+
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
         if cls.logger is not None:
@@ -377,7 +486,7 @@ class Deck:
     @classmethod
     def _get_energiaf(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Energiaf]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             energiaf = uow.files.get_energiaf(iteracao)
             return energiaf
@@ -385,7 +494,7 @@ class Deck:
     @classmethod
     def _get_enavazf(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Enavazf]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             enavazf = uow.files.get_enavazf(iteracao)
             return enavazf
@@ -393,7 +502,7 @@ class Deck:
     @classmethod
     def _get_vazaof(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Vazaof]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             vazaof = uow.files.get_vazaof(iteracao)
             return vazaof
@@ -401,7 +510,7 @@ class Deck:
     @classmethod
     def _get_energiab(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Energiab]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             energiab = uow.files.get_energiab(iteracao)
             return energiab
@@ -409,7 +518,7 @@ class Deck:
     @classmethod
     def _get_enavazb(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Enavazb]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             enavazb = uow.files.get_enavazb(iteracao)
             return enavazb
@@ -417,25 +526,25 @@ class Deck:
     @classmethod
     def _get_vazaob(
         cls, iteracao: int, uow: AbstractUnitOfWork
-    ) -> Optional[Vazaob]:
+    ) -> Optional[ScenarioFile]:
         with uow:
             vazaob = uow.files.get_vazaob(iteracao)
             return vazaob
 
     @classmethod
-    def _get_energias(cls, uow: AbstractUnitOfWork) -> Optional[Energias]:
+    def _get_energias(cls, uow: AbstractUnitOfWork) -> Optional[ScenarioFile]:
         with uow:
             energias = uow.files.get_energias()
             return energias
 
     @classmethod
-    def _get_enavazs(cls, uow: AbstractUnitOfWork) -> Optional[Energias]:
+    def _get_enavazs(cls, uow: AbstractUnitOfWork) -> Optional[ScenarioFile]:
         with uow:
             enavazs = uow.files.get_enavazs()
             return enavazs
 
     @classmethod
-    def _get_vazaos(cls, uow: AbstractUnitOfWork) -> Optional[Vazaos]:
+    def _get_vazaos(cls, uow: AbstractUnitOfWork) -> Optional[ScenarioFile]:
         with uow:
             vazaos = uow.files.get_vazaos()
             return vazaos
@@ -452,6 +561,30 @@ class Deck:
             estados = uow.files.get_nwlistcf_estados()
             return estados
 
+    @classmethod
+    def prewarm(
+        cls,
+        getters: List[Callable[[AbstractUnitOfWork], Any]],
+        uow: AbstractUnitOfWork,
+    ) -> int:
+        """
+        Constrói antecipadamente os dados do deck que serão utilizados
+        pelas tarefas executadas no pool de processos. Os processos criados
+        a seguir herdam a cache já construída, evitando que cada processo
+        reconstrua os mesmos dados.
+        """
+        num_prewarmed = 0
+        for getter in getters:
+            try:
+                getter(uow)
+                num_prewarmed += 1
+            except Exception as e:
+                cls._log(
+                    f"Dado do deck nao pre-carregado ({getter.__name__}): {e}",
+                    DEBUG,
+                )
+        return num_prewarmed
+
     @classmethod
     def _validate_data(cls, data, type: Type[T], msg: str = "dados") -> T:
         if not isinstance(data, type):
@@ -474,79 +607,79 @@ class Deck:
 
     @classmethod
     def pmo(cls, uow: AbstractUnitOfWork) -> Pmo:
-        pmo = cls.DECK_DATA_CACHING.get("pmo")
+        pmo = cls._get_cached_data("pmo", uow)
         if pmo is None:
             pmo = cls._validate_data(
                 cls._get_pmo(uow),
                 Pmo,
                 "processamento do pmo.dat",
             )
-            cls.DECK_DATA_CACHING["pmo"] = pmo
+            cls._set_cached_data("pmo", pmo, uow)
         return pmo
 
     @classmethod
     def curva(cls, uow: AbstractUnitOfWork) -> Curva:
-        curva = cls.DECK_DATA_CACHING.get("curva")
+        curva = cls._get_cached_data("curva", uow)
         if curva is None:
             curva = cls._validate_data(
                 cls._get_curva(uow),
                 Curva,
                 "processamento do curva.dat",
             )
-            cls.DECK_DATA_CACHING["curva"] = curva
+            cls._set_cached_data("curva", curva, uow)
         return curva
 
     @classmethod
     def modif(cls, uow: AbstractUnitOfWork) -> Modif:
-        modif = cls.DECK_DATA_CACHING.get("modif")
+        modif = cls._get_cached_data("modif", uow)
         if modif is None:
             modif = cls._validate_data(
                 cls._get_modif(uow),
                 Modif,
                 "processamento do modif.dat",
             )
-            cls.DECK_DATA_CACHING["modif"] = modif
+            cls._set_cached_data("modif", modif, uow)
         return modif
 
     @classmethod
     def confhd(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        confhd = cls.DECK_DATA_CACHING.get("confhd")
+        confhd = cls._get_cached_data("confhd", uow)
         if confhd is None:
             confhd = cls._validate_data(
                 cls._get_confhd(uow).usinas,
                 pd.DataFrame,
                 "processamento do confhd.dat",
             )
-            cls.DECK_DATA_CACHING["confhd"] = confhd
+            cls._set_cached_data("confhd", confhd, uow)
         return confhd.copy()
 
     @classmethod
     def clast(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        clast = cls.DECK_DATA_CACHING.get("clast")
+        clast = cls._get_cached_data("clast", uow)
         if clast is None:
             clast = cls._validate_data(
                 cls._get_clast(uow).usinas,
                 pd.DataFrame,
                 "processamento do clast.dat",
             )
-            cls.DECK_DATA_CACHING["clast"] = clast
+            cls._set_cached_data("clast", clast, uow)
         return clast.copy()
 
     @classmethod
     def term(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        term = cls.DECK_DATA_CACHING.get("term")
+        term = cls._get_cached_data("term", uow)
         if term is None:
             term = cls._validate_data(
                 cls._get_term(uow).usinas,
                 pd.DataFrame,
                 "processamento do term.dat",
             )
-            cls.DECK_DATA_CACHING["term"] = term
+            cls._set_cached_data("term", term, uow)
         return term.copy()
 
     @classmethod
     def manutt(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        manutt = cls.DECK_DATA_CACHING.get("manutt")
+        manutt = cls._get_cached_data("manutt", uow)
         if manutt is None:
             df_manutt = cls._get_manutt(uow).manutencoes
             if df_manutt is None:
@@ -567,31 +700,31 @@ class Deck:
                 pd.DataFrame,
                 "processamento do manutt.dat",
             )
-            cls.DECK_DATA_CACHING["manutt"] = manutt
+            cls._set_cached_data("manutt", manutt, uow)
         return manutt.copy()
 
     @classmethod
     def expt(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        expt = cls.DECK_DATA_CACHING.get("expt")
+        expt = cls._get_cached_data("expt", uow)
         if expt is None:
             expt = cls._validate_data(
                 cls._get_expt(uow).expansoes,
                 pd.DataFrame,
                 "processamento do expt.dat",
             )
-            cls.DECK_DATA_CACHING["expt"] = expt
+            cls._set_cached_data("expt", expt, uow)
         return expt.copy()
 
     @classmethod
     def hidr(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        hidr = cls.DECK_DATA_CACHING.get("hidr")
+        hidr = cls._get_cached_data("hidr", uow)
         if hidr is None:
             hidr = cls._validate_data(
                 cls._get_hidr(uow).cadastro,
                 pd.DataFrame,
                 "processamento do hidr.dat",
             )
-            cls.DECK_DATA_CACHING["hidr"] = hidr
+            cls._set_cached_data("hidr", hidr, uow)
         return hidr.copy()
 
     @classmethod
@@ -619,10 +752,16 @@ class Deck:
         return engnat
 
     @classmethod
-    def energiaf(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def energiaf(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_energiaf = cls._get_energiaf(iteracao, uow)
         if arq_energiaf is not None:
-            df = arq_energiaf.series
+            df = arq_energiaf.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -633,10 +772,16 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def enavazf(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def enavazf(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_enavaz = cls._get_enavazf(iteracao, uow)
         if arq_enavaz is not None:
-            df = arq_enavaz.series
+            df = arq_enavaz.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -647,10 +792,16 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def vazaof(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def vazaof(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_vazaof = cls._get_vazaof(iteracao, uow)
         if arq_vazaof is not None:
-            df = arq_vazaof.series
+            df = arq_vazaof.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -661,10 +812,16 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def energiab(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def energiab(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_energiab = cls._get_energiab(iteracao, uow)
         if arq_energiab is not None:
-            df = arq_energiab.series
+            df = arq_energiab.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -675,10 +832,16 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def enavazb(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def enavazb(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_enavaz = cls._get_enavazb(iteracao, uow)
         if arq_enavaz is not None:
-            df = arq_enavaz.series
+            df = arq_enavaz.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -689,10 +852,16 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def vazaob(cls, iteracao: int, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def vazaob(
+        cls,
+        iteracao: int,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_vazaob = cls._get_vazaob(iteracao, uow)
         if arq_vazaob is not None:
-            df = arq_vazaob.series
+            df = arq_vazaob.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -703,10 +872,15 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def energias(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def energias(
+        cls,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_energias = cls._get_energias(uow)
         if arq_energias is not None:
-            df = arq_energias.series
+            df = arq_energias.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -717,10 +891,15 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def enavazs(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def enavazs(
+        cls,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_enavaz = cls._get_enavazs(uow)
         if arq_enavaz is not None:
-            df = arq_enavaz.series
+            df = arq_enavaz.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -731,10 +910,15 @@ class Deck:
             return pd.DataFrame()
 
     @classmethod
-    def vazaos(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
+    def vazaos(
+        cls,
+        uow: AbstractUnitOfWork,
+        first_stage: Optional[int] = None,
+        last_stage: Optional[int] = None,
+    ) -> pd.DataFrame:
         arq_vazaos = cls._get_vazaos(uow)
         if arq_vazaos is not None:
-            df = arq_vazaos.series
+            df = arq_vazaos.to_dataframe(first_stage, last_stage)
             if df is None:
                 return pd.DataFrame()
             else:
@@ -746,14 +930,14 @@ class Deck:
 
     @classmethod
     def vazoes(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        vazoes = cls.DECK_DATA_CACHING.get("vazoes")
+        vazoes = cls._get_cached_data("vazoes", uow)
         if vazoes is None:
             vazoes = cls._validate_data(
                 cls._get_vazoes(uow).vazoes,
                 pd.DataFrame,
                 "processamento do vazoes.dat",
             )
-            cls.DECK_DATA_CACHING["vazoes"] = vazoes
+            cls._set_cached_data("vazoes", vazoes, uow)
         return vazoes.copy()
 
     @classmethod
@@ -1956,8 +2140,8 @@ class Deck:
             )
             return df
 
-        thermal_generation_bounds = cls.DECK_DATA_CACHING.get(
-            "thermal_generation_bounds"
+        thermal_generation_bounds = cls._get_cached_data(
+            "thermal_generation_bounds", uow
         )
         if thermal_generation_bounds is None:
             bounds_df = cls._thermal_generation_bounds_pmo(uow)
@@ -1966,8 +2150,8 @@ class Deck:
             bounds_df = _add_submarket_data(bounds_df, uow)
 
             thermal_generation_bounds = bounds_df
-            cls.DECK_DATA_CACHING["thermal_generation_bounds"] = (
-                thermal_generation_bounds
+            cls._set_cached_data(
+                "thermal_generation_bounds", thermal_generation_bounds, uow
             )
         return thermal_generation_bounds.copy()
 
@@ -2095,6 +2279,21 @@ class Deck:
             cls.DECK_DATA_CACHING["num_iterations"] = num_iterations
         return num_iterations
 
+    @classmethod
+    def scenario_iterations(cls, uow: AbstractUnitOfWork) -> List[int]:
+        """
+        Obtém as iterações consideradas na síntese dos cenários, de acordo
+        com a seleção configurada. Sem seleção, todas as iterações feitas
+        pelo modelo são consideradas.
+        """
+        num_iterations = cls.num_iterations(uow)
+        iterations = parse_selection(
+            Settings().scenario_iterations, num_iterations
+        )
+        if iterations is None:
+            return list(range(1, num_iterations + 1))
+        return [it for it in iterations if 1 <= it <= num_iterations]
+
     @classmethod
     def runtimes(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         runtimes = cls.DECK_DATA_CACHING.get("runtimes")
@@ -2169,7 +2368,7 @@ class Deck:
 
     @classmethod
     def hydros(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        hydros = cls.DECK_DATA_CACHING.get("hydros")
+        hydros = cls._get_cached_data("hydros", uow)
         if hydros is None:
             hydros = cls._validate_data(
                 cls._get_confhd(uow).usinas,
@@ -2185,7 +2384,7 @@ class Deck:
             )
             hydros = hydros.astype({HYDRO_NAME_COL: STRING_DF_TYPE})
             hydros = hydros.set_index(HYDRO_CODE_COL)
-            cls.DECK_DATA_CACHING["hydros"] = hydros
+            cls._set_cached_data("hydros", hydros, uow)
         return hydros.copy()
 
     @classmethod
@@ -2519,8 +2718,8 @@ class Deck:
 
             return df
 
-        hydro_volume_bounds_in_stages = cls.DECK_DATA_CACHING.get(
-            "hydro_volume_bounds_in_stages"
+        hydro_volume_bounds_in_stages = cls._get_cached_data(
+            "hydro_volume_bounds_in_stages", uow
         )
         if hydro_volume_bounds_in_stages is None:
             hm3_df = cls.hydro_volume_bounds_with_changes(uow)
@@ -2529,8 +2728,10 @@ class Deck:
             casted_df = _cast_bounds_to_hm3(df, hm3_df)
 
             hydro_volume_bounds_in_stages = casted_df
-            cls.DECK_DATA_CACHING["hydro_volume_bounds_in_stages"] = (
-                hydro_volume_bounds_in_stages
+            cls._set_cached_data(
+                "hydro_volume_bounds_in_stages",
+                hydro_volume_bounds_in_stages,
+                uow,
             )
         return hydro_volume_bounds_in_stages.copy()
 
@@ -3006,7 +3207,7 @@ class Deck:
             df_pat.sort_values([START_DATE_COL, BLOCK_COL], inplace=True)
             return df_pat
 
-        block_lengths = cls.DECK_DATA_CACHING.get("block_lengths")
+        block_lengths = cls._get_cached_data("block_lengths", uow)
         if block_lengths is None:
             block_lengths = cls._validate_data(
                 cls._get_patamar(uow).duracao_mensal_patamares,
@@ -3018,7 +3219,7 @@ class Deck:
             )
             block_lengths = cls._consider_post_study_years(block_lengths, uow)
             block_lengths = __eval_pat0(block_lengths)
-            cls.DECK_DATA_CACHING["block_lengths"] = block_lengths
+            cls._set_cached_data("block_lengths", block_lengths, uow)
         return block_lengths.copy()
 
     @classmethod
@@ -3145,23 +3346,10 @@ class Deck:
 
     @classmethod
     def _accumulate_productivity(cls, df: pd.DataFrame) -> pd.DataFrame:
-        np_edges = list(
-            df.reset_index()[[FOLLOWING_HYDRO_COL, HYDRO_CODE_COL]].to_numpy()
+        cascade = Cascade(df.index.to_numpy(), df[FOLLOWING_HYDRO_COL])
+        df[PRODUCTIVITY_TMP_COL] = cascade.accumulate(
+            df[PRODUCTIVITY_TMP_COL].to_numpy()
         )
-        edges = [tuple(e) for e in np_edges]
-        bfs = Graph(edges, directed=True).bfs(0)[1:]
-        for hydro_code in bfs:
-            downstream_hydro_code = df.at[
-                hydro_code,
-                FOLLOWING_HYDRO_COL,
-            ]
-            if downstream_hydro_code == 0:
-                continue
-            downstream_productivity = df.at[
-                downstream_hydro_code,
-                PRODUCTIVITY_TMP_COL,
-            ]
-            df.at[hydro_code, PRODUCTIVITY_TMP_COL] += downstream_productivity
         return df
 
     @classmethod
@@ -3474,6 +3662,21 @@ class Deck:
             cls.DECK_DATA_CACHING["hydro_code_order"] = hydro_code_order
         return hydro_code_order
 
+    @classmethod
+    def hydro_cascade(cls, uow: AbstractUnitOfWork) -> Cascade:
+        """
+        Obtém a cascata das usinas hidrelétricas do caso, com o mapa
+        das usinas a montante e a ordem topológica das usinas.
+        """
+        cascade = cls.DECK_DATA_CACHING.get("hydro_cascade")
+        if cascade is None:
+            hydros = cls.hydros(uow)
+            cascade = Cascade(
+                hydros.index.to_numpy(), hydros[FOLLOWING_HYDRO_COL]
+            )
+            cls.DECK_DATA_CACHING["hydro_cascade"] = cascade
+        return cascade
+
     @classmethod
     def hydro_eer_submarket_map(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         aux_df = cls.DECK_DATA_CACHING.get("hydro_eer_submarket_map")
@@ -3896,7 +4099,7 @@ class Deck:
 
     @classmethod
     def common_policy_df(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        aux_df = cls.DECK_DATA_CACHING.get("common_policy_df")
+        aux_df = cls._get_cached_data("common_policy_df", uow)
 
         if aux_df is None:
             nwlistcfrel = cls._validate_data(
@@ -3945,7 +4148,7 @@ class Deck:
                 ignore_index=True,
             )
 
-            cls.DECK_DATA_CACHING["common_policy_df"] = aux_df
+            cls._set_cached_data("common_policy_df", aux_df, uow)
         return aux_df.copy()
 
     @classmethod
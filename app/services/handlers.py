@@ -1,14 +1,22 @@
+import logging
 import pathlib
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from typing import Any, Callable, List, Tuple
 
 import app.domain.commands as commands
 from app.model.settings import Settings
+from app.services.deck.aggregation import SpatialAggregation
+from app.services.deck.deck import Deck
 from app.services.synthesis.execution import ExecutionSynthetizer
 from app.services.synthesis.operation import OperationSynthetizer
 from app.services.synthesis.policy import PolicySynthetizer
 from app.services.synthesis.scenario import ScenarioSynthetizer
 from app.services.synthesis.system import SystemSynthetizer
 from app.services.unitofwork import AbstractUnitOfWork
+from app.utils.pool import WorkerPool
+from app.utils.timing import time_and_log
 
 
 def synthetize_system(
@@ -41,6 +49,112 @@ def synthetize_policy(
     PolicySynthetizer.synthetize(command.variables, uow)
 
 
+def _synthetize_with_progress(
+    name: str,
+    handler: Callable,
+    command: Any,
+    uow: AbstractUnitOfWork,
+):
+    logger = logging.getLogger("main")
+    logger.info(f"Iniciando síntese: {name}")
+    with time_and_log(message_root=f"Síntese concluída: {name}", logger=logger):
+        handler(command, uow)
+
+
+def synthetize_complete(
+    command: commands.SynthetizeComplete, uow: AbstractUnitOfWork
+):
+    synthesis: List[Tuple[str, Callable, Any]] = [
+        (
+            "SISTEMA",
+            synthetize_system,
+            commands.SynthetizeSystem(command.system),
+        ),
+        (
+            "EXECUCAO",
+            synthetize_execution,
+            commands.SynthetizeExecution(command.execution),
+        ),
+        (
+            "OPERACAO",
+            synthetize_operation,
+            commands.SynthetizeOperation(command.operation),
+        ),
+        (
+            "POLITICA",
+            synthetize_policy,
+            commands.SynthetizePolicy(command.policy),
+        ),
+    ]
+    # A síntese de cenários só é realizada se solicitada explicitamente
+    if len(command.scenarios) > 0:
+        synthesis.insert(
+            2,
+            (
+                "CENARIOS",
+                synthetize_scenarios,
+                commands.SynthetizeScenarios(command.scenarios),
+            ),
+        )
+    if not command.parallel:
+        for _, handler, c in synthesis:
+            handler(c, uow)
+        return
+    # Os dados comuns do deck são lidos antes de iniciar os processos,
+    # sendo compartilhados por todas as sínteses
+    worker_deck_data: List[Callable[[AbstractUnitOfWork], Any]] = [
+        Deck.pmo
+    ] + OperationSynthetizer.WORKER_DECK_DATA
+    if len(command.scenarios) > 0:
+        worker_deck_data += ScenarioSynthetizer.WORKER_DECK_DATA
+    Deck.prewarm(worker_deck_data, uow)
+    with WorkerPool.start():
+        with ThreadPoolExecutor(max_workers=len(synthesis)) as executor:
+            futures = [
+                executor.submit(
+                    _synthetize_with_progress, name, handler, c, copy(uow)
+                )
+                for name, handler, c in synthesis
+            ]
+            for f in futures:
+                f.result()
+
+
+def synthetize_batch(
+    command: commands.SynthetizeBatch, uows: List[AbstractUnitOfWork]
+):
+    """
+    Realiza a síntese completa de cada caso de um lote, no mesmo processo
+    e com o mesmo processo de logging. Os casos são sintetizados um após
+    o outro, visto que as caches do deck e das sínteses são compartilhadas
+    pelo processo, e os processos do pool são criados com os dados do
+    deck de um único caso, sendo reiniciados a cada caso.
+    """
+    logger = logging.getLogger("main")
+    for i, (case, uow) in enumerate(zip(command.cases, uows)):
+        # As caches são isoladas por caso, sendo descartadas antes
+        # do início de um novo caso
+        Deck.clear_cache()
+        SpatialAggregation.clear_cache()
+        OperationSynthetizer.clear_cache()
+        ScenarioSynthetizer.clear_cache()
+        logger.info(f"# Caso {i + 1}/{len(command.cases)}: {case} #")
+        try:
+            with time_and_log(
+                message_root=f"Tempo para sintese do caso {case}",
+                logger=logger,
+            ):
+                synthetize_complete(command.synthesis, uow)
+        except Exception as e:
+            logger.error(f"Erro na síntese do caso {case}: {str(e)}")
+        finally:
+            uow.invalidate()
+    Deck.clear_cache()
+    SpatialAggregation.clear_cache()
+    OperationSynthetizer.clear_cache()
+    ScenarioSynthetizer.clear_cache()
+
+
 def clean():
     path = pathlib.Path(Settings().basedir).joinpath(Settings().synthesis_dir)
     shutil.rmtree(path)
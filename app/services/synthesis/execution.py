@@ -18,6 +18,7 @@ from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.writer import ExportWriter
 
 # TODO - rever nomes das colunas
 # TODO - tirar tempo total
@@ -30,6 +31,9 @@ class ExecutionSynthetizer:
 
     logger: Optional[logging.Logger] = None
 
+    # Escritor da execução atual da síntese, síncrono fora dela
+    writer = ExportWriter(threads=0, budget=0)
+
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
         if cls.logger is not None:
@@ -145,17 +149,10 @@ class ExecutionSynthetizer:
                 s.variable.long_name,
             ]
         with uow:
-            existing_df = uow.export.read_df(
-                EXECUTION_SYNTHESIS_METADATA_OUTPUT
-            )
-            if existing_df is not None:
-                metadata_df = pd.concat(
-                    [existing_df, metadata_df], ignore_index=True
-                )
-                metadata_df = metadata_df.drop_duplicates()
-            uow.export.synthetize_df(
-                metadata_df, EXECUTION_SYNTHESIS_METADATA_OUTPUT
+            uow.export.upsert_df(
+                metadata_df, EXECUTION_SYNTHESIS_METADATA_OUTPUT, "chave"
             )
+            uow.export.compact(EXECUTION_SYNTHESIS_METADATA_OUTPUT)
 
     @classmethod
     def _synthetize_single_variable(
@@ -175,7 +172,9 @@ class ExecutionSynthetizer:
                 df = cls._resolve(s, uow)
                 if df is not None:
                     with uow:
-                        uow.export.synthetize_df(df, filename)
+                        cls.writer.submit(
+                            filename, uow.export.synthetize_df, df, filename
+                        )
                         return s
                 return None
             except Exception as e:
@@ -203,9 +202,14 @@ class ExecutionSynthetizer:
                 variables, uow
             )
             success_synthesis: List[ExecutionSynthesis] = []
-            for s in synthesis_variables:
-                r = cls._synthetize_single_variable(s, uow)
-                if r:
-                    success_synthesis.append(r)
+            cls.writer = ExportWriter()
+            with cls.writer.start():
+                for s in synthesis_variables:
+                    r = cls._synthetize_single_variable(s, uow)
+                    if r:
+                        success_synthesis.append(r)
+                success_synthesis = cls.writer.wait_export(
+                    success_synthesis, cls.logger
+                )
 
             cls._export_metadata(success_synthesis, uow)
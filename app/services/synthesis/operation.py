@@ -1,13 +1,27 @@
 import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from copy import copy
 from datetime import datetime
+from functools import partial
 from logging import DEBUG, ERROR, INFO, WARNING
-from multiprocessing import Pool
+from threading import Lock
 from traceback import print_exc
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import numpy as np
 import pandas as pd  # type: ignore
 
+from app import __version__
 from app.internal.constants import (
     BLOCK_COL,
     BLOCK_DURATION_COL,
@@ -21,7 +35,7 @@ from app.internal.constants import (
     HYDRO_CODE_COL,
     HYDRO_NAME_COL,
     LOWER_BOUND_COL,
-    OPERATION_SYNTHESIS_COMMON_COLUMNS,
+    OPERATION_SYNTHESIS_MANIFEST_OUTPUT,
     OPERATION_SYNTHESIS_METADATA_OUTPUT,
     OPERATION_SYNTHESIS_STATS_ROOT,
     OPERATION_SYNTHESIS_SUBDIR,
@@ -46,22 +60,29 @@ from app.model.operation.operationsynthesis import (
     OperationSynthesis,
 )
 from app.model.operation.spatialresolution import SpatialResolution
+from app.model.operation.synthesistensor import SynthesisTensor
 from app.model.operation.variable import Variable
 from app.model.settings import Settings
 from app.services.deck.bounds import OperationVariableBounds
 from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
-from app.utils.graph import Graph
+from app.utils.fingerprint import combine_fingerprints, files_fingerprint
 from app.utils.log import Log
 from app.utils.operations import calc_statistics
+from app.utils.pool import WorkerPool
 from app.utils.regex import match_variables_with_wildcards
+from app.utils.selection import parse_selection
 from app.utils.timing import time_and_log
+from app.utils.writer import ExportWriter
 
 
 class OperationSynthetizer:
     T = TypeVar("T")
     logger: Optional[logging.Logger] = None
 
+    # Escritor da execução atual da síntese, síncrono fora dela
+    writer = ExportWriter(threads=0, budget=0)
+
     # Por padrão, todas as sínteses suportadas são consideradas
     DEFAULT_OPERATION_SYNTHESIS_ARGS: List[str] = SUPPORTED_SYNTHESIS
 
@@ -71,12 +92,37 @@ class OperationSynthetizer:
         set([p for pr in SYNTHESIS_DEPENDENCIES.values() for p in pr])
     )
 
+    # Sínteses das quais dependem outras sínteses da execução atual
+    DEPENDENCY_SYNTHESIS: Set[OperationSynthesis] = set()
+
     # Estratégias de cache para reduzir tempo total de síntese
     CACHED_SYNTHESIS: Dict[OperationSynthesis, pd.DataFrame] = {}
     ORDERED_SYNTHESIS_ENTITIES: Dict[OperationSynthesis, Dict[str, list]] = {}
 
-    # Estatísticas das sínteses são armazenadas separadamente
-    SYNTHESIS_STATS: Dict[SpatialResolution, List[pd.DataFrame]] = {}
+    # Estatísticas das sínteses são escritas como fragmentos, que são
+    # consolidados ao final da síntese para cada agregação espacial
+    SYNTHESIS_STATS: Set[SpatialResolution] = set()
+
+    # Sínteses independentes são realizadas simultaneamente
+    SYNTHESIS_LOCK = Lock()
+
+    # Assinaturas dos arquivos de entrada de cada síntese, registradas
+    # no manifesto para a síntese incremental
+    SYNTHESIS_MANIFEST: Dict[str, str] = {}
+    SYNTHESIS_FINGERPRINTS: Dict[OperationSynthesis, str] = {}
+
+    # Dados do deck utilizados pelas tarefas executadas no pool de
+    # processos, construídos antes da criação do pool
+    WORKER_DECK_DATA: List[Callable[[AbstractUnitOfWork], Any]] = [
+        Deck.block_lengths,
+        Deck.num_blocks,
+        Deck.num_scenarios_final_simulation,
+        Deck.internal_stages_starting_dates_final_simulation,
+        Deck.internal_stages_ending_dates_final_simulation,
+        Deck.study_period_starting_month,
+        Deck.eer_submarket_map,
+        Deck.hydro_eer_submarket_map,
+    ]
 
     @classmethod
     def clear_cache(cls):
@@ -86,6 +132,9 @@ class OperationSynthetizer:
         cls.CACHED_SYNTHESIS.clear()
         cls.ORDERED_SYNTHESIS_ENTITIES.clear()
         cls.SYNTHESIS_STATS.clear()
+        cls.SYNTHESIS_MANIFEST.clear()
+        cls.SYNTHESIS_FINGERPRINTS.clear()
+        cls.DEPENDENCY_SYNTHESIS.clear()
 
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
@@ -127,6 +176,33 @@ class OperationSynthetizer:
         valid_args = [arg for arg in args_data if arg is not None]
         return valid_args
 
+    @staticmethod
+    def _validate_hydro_selection(variables: List[OperationSynthesis]):
+        """
+        Verifica se a seleção de UHEs é compatível com as sínteses
+        solicitadas. As sínteses de REE, SBM e SIN são agregadas a
+        partir dos dados de todas as UHEs, e a energia armazenada de
+        cada UHE depende da produtividade das UHEs a jusante, de modo
+        que não podem ser realizadas com somente parte das UHEs.
+        """
+        if parse_selection(Settings().operation_hydros) is None:
+            return
+        other_synthesis = [
+            str(v)
+            for v in variables
+            if v.spatial_resolution != SpatialResolution.USINA_HIDROELETRICA
+            or v.variable
+            in [
+                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_INICIAL,
+                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
+            ]
+        ]
+        if len(other_synthesis) > 0:
+            raise ValueError(
+                "A seleção de UHEs só é permitida para sínteses de UHE: "
+                + ", ".join(other_synthesis)
+            )
+
     @classmethod
     def _filter_valid_variables(
         cls, variables: List[OperationSynthesis], uow: AbstractUnitOfWork
@@ -173,10 +249,99 @@ class OperationSynthetizer:
                 not has_hydro,
             ]):
                 continue
+            # Sínteses lidas do NWLISTOP sem arquivos no caso são ignoradas
+            if (
+                cls._stub_mappings(v) is None
+                and cls._available_entities(v, uow) == set()
+            ):
+                continue
             valid_variables.append(v)
         cls._log(f"Sinteses: {valid_variables}")
         return valid_variables
 
+    @classmethod
+    def _available_entities(
+        cls, s: OperationSynthesis, uow: AbstractUnitOfWork
+    ) -> Optional[Set[Tuple[int, ...]]]:
+        """
+        Obtém os índices das entidades que possuem arquivos do NWLISTOP
+        para uma síntese, a partir do inventário dos arquivos do caso.
+        Retorna None caso os arquivos da síntese não sejam conhecidos.
+        """
+        with uow:
+            inventory = uow.files.get_nwlistop_inventory(
+                s.variable, s.spatial_resolution
+            )
+        return set(inventory.keys()) if inventory is not None else None
+
+    @staticmethod
+    def _is_available(
+        available: Optional[Set[Tuple[int, ...]]], *indices: int
+    ) -> bool:
+        """
+        Verifica se uma entidade possui arquivos do NWLISTOP no
+        inventário dos arquivos do caso.
+        """
+        return available is None or tuple(int(i) for i in indices) in available
+
+    @staticmethod
+    def _is_selected(selection: Optional[List[int]], index: int) -> bool:
+        """
+        Verifica se uma entidade foi selecionada para a síntese.
+        """
+        return selection is None or int(index) in selection
+
+    @classmethod
+    def _limit_read_stages(
+        cls, df: Optional[pd.DataFrame], uow: AbstractUnitOfWork
+    ) -> Optional[pd.DataFrame]:
+        """
+        Descarta, na tabela lida do NWLISTOP, as datas posteriores ao
+        último estágio selecionado para a síntese. Os arquivos são
+        sempre lidos por completo, e o corte somente evita o
+        processamento das datas descartadas. Os estágios anteriores são
+        mantidos, pois são utilizados pelas sínteses dependentes.
+        """
+        stages = parse_selection(Settings().operation_stages)
+        if df is None or stages is None:
+            return df
+        num_dates = max(stages) + Deck.study_period_starting_month(uow) - 1
+        dates = np.sort(df["data"].unique())[:num_dates]
+        if len(dates) == 0:
+            return df.iloc[0:0]
+        return df.loc[df["data"] <= dates[-1]].reset_index(drop=True)
+
+    @staticmethod
+    def _selected_scenarios(scenarios: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Obtém a máscara dos cenários selecionados para a síntese, ou
+        None caso não exista uma seleção de cenários.
+        """
+        selection = parse_selection(Settings().operation_scenarios)
+        if selection is None:
+            return None
+        return np.isin(scenarios, selection)
+
+    @classmethod
+    def _filter_selected_scenarios(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mantém somente os cenários selecionados para a síntese.
+        """
+        selected = cls._selected_scenarios(df[SCENARIO_COL].to_numpy())
+        if selected is None:
+            return df
+        return df.loc[selected].reset_index(drop=True)
+
+    @staticmethod
+    def _filter_selected_stages(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mantém somente os estágios selecionados para a síntese.
+        """
+        stages = parse_selection(Settings().operation_stages)
+        if stages is None:
+            return df
+        return df.loc[df[STAGE_COL].isin(stages)].reset_index(drop=True)
+
     @classmethod
     def _add_synthesis_dependencies(
         cls, synthesis: List[OperationSynthesis]
@@ -203,6 +368,226 @@ class OperationSynthetizer:
             _add_synthesis_dependencies_recursive(result_synthesis, v)
         return result_synthesis
 
+    @classmethod
+    def _synthesis_dependency_graph(
+        cls, synthesis: List[OperationSynthesis]
+    ) -> Dict[OperationSynthesis, List[OperationSynthesis]]:
+        """
+        Constrói o grafo de dependências entre as sínteses fornecidas,
+        mapeando cada síntese para as sínteses das quais depende.
+        """
+        return {
+            s: [d for d in SYNTHESIS_DEPENDENCIES.get(s, []) if d in synthesis]
+            for s in synthesis
+        }
+
+    @classmethod
+    def _release_from_cache(cls, s: OperationSynthesis):
+        """
+        Remove uma síntese da cache, quando não existem mais sínteses
+        pendentes que dependam dela.
+        """
+        if cls.CACHED_SYNTHESIS.pop(s, None) is not None:
+            cls._log(f"Removendo da cache - {str(s)}", DEBUG)
+
+    @classmethod
+    def _synthetize_with_dependencies(
+        cls, synthesis: List[OperationSynthesis], uow: AbstractUnitOfWork
+    ) -> List[OperationSynthesis]:
+        """
+        Realiza as sínteses fornecidas respeitando as dependências entre
+        elas. Sínteses cujas dependências já foram resolvidas são realizadas
+        simultaneamente, e os dados armazenados em cache são liberados
+        assim que a última síntese dependente é concluída.
+        """
+        dependencies = cls._synthesis_dependency_graph(synthesis)
+        pending_dependents = {
+            s: sum([s in deps for deps in dependencies.values()])
+            for s in synthesis
+        }
+        cls.DEPENDENCY_SYNTHESIS = {
+            s for s, n in pending_dependents.items() if n > 0
+        }
+        pending = list(synthesis)
+        done: List[OperationSynthesis] = []
+        success_synthesis: List[OperationSynthesis] = []
+        max_workers = max(1, min(int(Settings().processors), len(synthesis)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running: Dict[Future, OperationSynthesis] = {}
+            while len(pending) > 0 or len(running) > 0:
+                ready = [
+                    s
+                    for s in pending
+                    if all([d in done for d in dependencies[s]])
+                ]
+                if len(ready) == 0 and len(running) == 0:
+                    raise RuntimeError(
+                        f"Dependências não resolvidas para: {pending}"
+                    )
+                for s in ready[: max_workers - len(running)]:
+                    pending.remove(s)
+                    running[
+                        executor.submit(
+                            cls._synthetize_single_variable, s, copy(uow)
+                        )
+                    ] = s
+                finished, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for f in finished:
+                    s = running.pop(f)
+                    done.append(s)
+                    cls._log(
+                        "Sinteses da operacao concluidas:"
+                        + f" {len(done)}/{len(synthesis)}"
+                    )
+                    r = f.result()
+                    if r:
+                        success_synthesis.append(r)
+                        # A síntese é registrada no manifesto assim que a
+                        # escrita dos seus dados é concluída
+                        cls.writer.on_complete(
+                            str(r),
+                            partial(cls._store_in_manifest_if_needed, r, uow),
+                        )
+                    for d in dependencies[s]:
+                        pending_dependents[d] -= 1
+                        if pending_dependents[d] == 0:
+                            cls._release_from_cache(d)
+                    if pending_dependents[s] == 0:
+                        cls._release_from_cache(s)
+        success_synthesis = cls.writer.wait_export(
+            success_synthesis, cls.logger
+        )
+        return [s for s in synthesis if s in success_synthesis]
+
+    @classmethod
+    def _prewarm_deck_data(cls, uow: AbstractUnitOfWork):
+        """
+        Constrói os dados do deck utilizados pelas tarefas do pool
+        de processos antes da sua criação.
+        """
+        with time_and_log(
+            message_root="Tempo para pre-carregamento do deck",
+            logger=cls.logger,
+        ):
+            Deck.prewarm(cls.WORKER_DECK_DATA, uow)
+
+    @classmethod
+    def _synthesis_fingerprints(
+        cls, synthesis: List[OperationSynthesis], uow: AbstractUnitOfWork
+    ) -> Dict[OperationSynthesis, str]:
+        """
+        Calcula as assinaturas dos arquivos de entrada de cada síntese,
+        considerando os arquivos do deck, os arquivos do NWLISTOP lidos
+        para a síntese e as assinaturas das suas dependências.
+        """
+        with uow:
+            deck_fingerprint = files_fingerprint(uow.files.get_deck_files())
+            nwlistop_fingerprints = {
+                s: files_fingerprint(
+                    uow.files.get_nwlistop_files(
+                        s.variable, s.spatial_resolution
+                    )
+                )
+                for s in synthesis
+            }
+        dependencies = cls._synthesis_dependency_graph(synthesis)
+        fingerprints: Dict[OperationSynthesis, str] = {}
+        # As dependências sempre precedem as sínteses dependentes
+        for s in synthesis:
+            fingerprints[s] = combine_fingerprints(
+                [
+                    __version__,
+                    Settings().synthesis_format,
+                    Settings().operation_hydros,
+                    Settings().operation_stages,
+                    Settings().operation_scenarios,
+                    uow.version,
+                    deck_fingerprint,
+                    nwlistop_fingerprints[s],
+                ]
+                + [fingerprints[d] for d in dependencies[s]]
+            )
+        return fingerprints
+
+    @classmethod
+    def _filter_unchanged_synthesis(
+        cls, synthesis: List[OperationSynthesis], uow: AbstractUnitOfWork
+    ) -> Tuple[List[OperationSynthesis], List[OperationSynthesis]]:
+        """
+        Separa as sínteses cujos arquivos de entrada não foram alterados
+        desde a última síntese registrada no manifesto, que não precisam
+        ser refeitas, das demais.
+        """
+        with time_and_log(
+            message_root="Tempo para verificacao do manifesto",
+            logger=cls.logger,
+        ):
+            with uow:
+                manifest = uow.export.read_json(
+                    OPERATION_SYNTHESIS_MANIFEST_OUTPUT
+                )
+            cls.SYNTHESIS_MANIFEST = manifest if manifest is not None else {}
+            cls.SYNTHESIS_FINGERPRINTS = cls._synthesis_fingerprints(
+                synthesis, uow
+            )
+            dependencies = cls._synthesis_dependency_graph(synthesis)
+            required: List[OperationSynthesis] = []
+            # Uma síntese refeita exige que suas dependências também sejam,
+            # pois seus dados são obtidos da cache
+            for s in reversed(synthesis):
+                changed = cls.SYNTHESIS_MANIFEST.get(
+                    str(s)
+                ) != cls.SYNTHESIS_FINGERPRINTS.get(s)
+                if changed or s in required:
+                    required.append(s)
+                    required += dependencies[s]
+            pending = [s for s in synthesis if s in required]
+            unchanged = [s for s in synthesis if s not in required]
+        if len(unchanged) > 0:
+            cls._log(f"Sinteses sem alteracoes nas entradas: {unchanged}")
+        return pending, unchanged
+
+    @classmethod
+    def _store_in_manifest_if_needed(
+        cls, s: OperationSynthesis, uow: AbstractUnitOfWork
+    ):
+        """
+        Registra no manifesto a assinatura dos arquivos de entrada de
+        uma síntese concluída, permitindo retomar uma síntese interrompida.
+        """
+        if s not in cls.SYNTHESIS_FINGERPRINTS:
+            return
+        with cls.SYNTHESIS_LOCK:
+            cls.SYNTHESIS_MANIFEST[str(s)] = cls.SYNTHESIS_FINGERPRINTS[s]
+            with uow:
+                uow.export.write_json(
+                    cls.SYNTHESIS_MANIFEST, OPERATION_SYNTHESIS_MANIFEST_OUTPUT
+                )
+
+    @classmethod
+    def _restore_unchanged_synthesis_stats(
+        cls, synthesis: List[OperationSynthesis], uow: AbstractUnitOfWork
+    ):
+        """
+        Garante que as estatísticas das sínteses que não foram refeitas
+        existam no arquivo de estatísticas, calculando-as a partir da
+        síntese existente caso a síntese anterior tenha sido interrompida.
+        """
+        existing_stats: Dict[SpatialResolution, List[str]] = {}
+        for s in synthesis:
+            res = s.spatial_resolution
+            with uow:
+                if res not in existing_stats:
+                    existing_stats[res] = uow.export.read_keys(
+                        f"{OPERATION_SYNTHESIS_STATS_ROOT}_{res.value}",
+                        VARIABLE_COL,
+                    )
+                if s.variable.value in existing_stats[res]:
+                    continue
+                df = uow.export.read_df(str(s))
+            if df is not None:
+                cls._add_synthesis_stats(s, calc_statistics(df), uow)
+
     @classmethod
     def _get_unique_column_values_in_order(
         cls, df: pd.DataFrame, cols: List[str]
@@ -244,12 +629,18 @@ class OperationSynthetizer:
         """
         if df is None:
             return df
-        df = cls._resolve_temporal_resolution(df, uow)
-        for col, val in entity_column_values.items():
-            df[col] = val
-        df = cls._resolve_starting_stage(df, uow)
+        df = cls._limit_read_stages(df, uow)
+        tensor = cls._resolve_temporal_resolution(df, uow)
+        tensor = tensor.with_entity(entity_column_values)
+        tensor = tensor.shift_stages(1 - Deck.study_period_starting_month(uow))
+        tensor = tensor.select_stages(tensor.stages > 0)
+        selected = cls._selected_scenarios(tensor.scenarios)
+        if selected is not None:
+            tensor = tensor.select_scenarios(selected)
         if s.variable in internal_stubs:
-            df = internal_stubs[s.variable](df, uow)
+            tensor = internal_stubs[s.variable](tensor, uow)
+        # As etapas seguintes da síntese operam sobre o formato de tabela
+        df = tensor.to_dataframe()
         df_stats = calc_statistics(df)
         df[STATS_OR_SCENARIO_COL] = False
         df_stats[STATS_OR_SCENARIO_COL] = True
@@ -309,122 +700,20 @@ class OperationSynthetizer:
     @staticmethod
     def _resolve_temporal_resolution(
         df: pd.DataFrame, uow: AbstractUnitOfWork
-    ) -> pd.DataFrame:
+    ) -> SynthesisTensor:
         """
-        Adiciona informação temporal a um DataFrame de síntese, utilizando
-        as informações de duração dos patamares e datas de início dos estágios.
+        Organiza os dados lidos do NWLISTOP em um vetor com eixos de
+        estágio, patamar e cenário, utilizando as informações de duração
+        dos patamares e datas de início e fim dos estágios.
         """
-
-        def _replace_scenario_info(
-            df: pd.DataFrame,
-            num_stages: int,
-            num_scenarios: int,
-            num_blocks: int,
-        ) -> pd.DataFrame:
-            """
-            Substitui a informação de cenário por um intervalo fixo de `1`a
-            `num_scenarios`, caso os dados fornecidos contenham informações
-            de cenários de índices não regulares.
-            """
-            df[SCENARIO_COL] = np.tile(
-                np.repeat(np.arange(1, num_scenarios + 1), num_blocks),
-                num_stages,
-            )
-            return df
-
-        def _add_stage_info(
-            df: pd.DataFrame,
-            num_stages: int,
-            num_scenarios: int,
-            num_blocks: int,
-            end_dates: List[datetime],
-        ) -> pd.DataFrame:
-            """
-            Adiciona informações de estágio a um DataFrame, utilizando o
-            número de valores de data distintos fornecidos para definir uma
-            faixa ordenada de estágios de `1` a `num_stages`.
-            """
-            stages = np.arange(1, num_stages + 1)
-            stages_to_df_column = np.repeat(stages, num_scenarios * num_blocks)
-            end_dates_to_df_column: np.ndarray = np.repeat(
-                np.array(end_dates), num_scenarios * num_blocks
-            )
-            df[STAGE_COL] = stages_to_df_column
-            df[END_DATE_COL] = end_dates_to_df_column
-            return df
-
-        def _add_block_duration_info(
-            df: pd.DataFrame,
-            num_stages: int,
-            num_scenarios: int,
-            num_blocks: int,
-            blocks: List[int],
-            start_dates: List[datetime],
-        ) -> pd.DataFrame:
-            """
-            Adiciona informações de duração de patamares a um DataFrame, utilizando
-            as informações dos patamares e datas de início dos estágios.
-            """
-            df_block_lengths = Deck.block_lengths(uow)
-            df_block_lengths = df_block_lengths.loc[
-                df_block_lengths[BLOCK_COL].isin(blocks)
-            ]
-            block_durations = np.zeros(
-                (num_scenarios * num_blocks * num_stages,), dtype=np.float64
-            )
-            data_block_size = num_scenarios * num_blocks
-            for i, d in enumerate(start_dates):
-                date_durations = df_block_lengths.loc[
-                    df_block_lengths[START_DATE_COL] == d, VALUE_COL
-                ].to_numpy()
-                i_i = i * data_block_size
-                i_f = i_i + data_block_size
-                block_durations[i_i:i_f] = np.tile(
-                    date_durations, num_scenarios
-                )
-            df[BLOCK_DURATION_COL] = block_durations * STAGE_DURATION_HOURS
-            return df
-
-        def _add_temporal_info(
-            df: pd.DataFrame, uow: AbstractUnitOfWork
-        ) -> pd.DataFrame:
-            """
-            Adiciona informação temporal a um DataFrame de síntese.
-            """
-            df = df.rename(
-                columns={"data": START_DATE_COL, "serie": SCENARIO_COL}
-            ).copy()
-            df.sort_values(
-                [START_DATE_COL, SCENARIO_COL, BLOCK_COL], inplace=True
-            )
-            num_stages = df[START_DATE_COL].unique().shape[0]
-            num_scenarios = Deck.num_scenarios_final_simulation(uow)
-            blocks = df[BLOCK_COL].unique().tolist()
-            num_blocks = len(blocks)
-            start_dates = Deck.internal_stages_starting_dates_final_simulation(
-                uow
-            )[:num_stages]
-            end_dates = Deck.internal_stages_ending_dates_final_simulation(uow)[
-                :num_stages
-            ]
-            df = _replace_scenario_info(
-                df, num_stages, num_scenarios, num_blocks
-            )
-            df = _add_stage_info(
-                df,
-                num_stages,
-                num_scenarios,
-                num_blocks,
-                end_dates,
-            )
-            df = _add_block_duration_info(
-                df, num_stages, num_scenarios, num_blocks, blocks, start_dates
-            )
-            return df[OPERATION_SYNTHESIS_COMMON_COLUMNS]
-
-        if df is None:
-            return None
-        return _add_temporal_info(df, uow)
+        return SynthesisTensor.from_nwlistop(
+            df,
+            Deck.num_scenarios_final_simulation(uow),
+            Deck.internal_stages_starting_dates_final_simulation(uow),
+            Deck.internal_stages_ending_dates_final_simulation(uow),
+            Deck.block_lengths(uow),
+            STAGE_DURATION_HOURS,
+        )
 
     @classmethod
     def __resolve_SIN(
@@ -496,18 +785,18 @@ class OperationSynthetizer:
             for s in sbms_idx
         ]
 
-        n_procs = int(Settings().processors)
         with time_and_log(
             message_root="Tempo para obter dados de SBM", logger=cls.logger
         ):
-            with Pool(processes=n_procs) as pool:
-                async_res = {
-                    idx: pool.apply_async(
-                        cls._resolve_SBM_entity, (uow, synthesis, idx, name)
-                    )
+            available = cls._available_entities(synthesis, uow)
+            dfs = WorkerPool.map(
+                cls._resolve_SBM_entity,
+                {
+                    idx: (uow, synthesis, idx, name)
                     for idx, name in zip(sbms_idx, sbms_name)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+                    if cls._is_available(available, idx)
+                },
+            )
 
         df = cls._post_resolve(
             dfs,
@@ -574,20 +863,19 @@ class OperationSynthetizer:
             for s in sbms_idx
         ]
 
-        n_procs = int(Settings().processors)
         with time_and_log(
             message_root="Tempo para obter dados de SBP", logger=cls.logger
         ):
-            with Pool(processes=n_procs) as pool:
-                async_res = {
-                    f"{idx1}-{idx2}": pool.apply_async(
-                        cls._resolve_SBP_entity,
-                        (uow, synthesis, idx1, name1, idx2, name2),
-                    )
+            available = cls._available_entities(synthesis, uow)
+            dfs = WorkerPool.map(
+                cls._resolve_SBP_entity,
+                {
+                    f"{idx1}-{idx2}": (uow, synthesis, idx1, name1, idx2, name2)
                     for idx1, name1 in zip(sbms_idx, sbms_name)
                     for idx2, name2 in zip(sbms_idx, sbms_name)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+                    if idx1 < idx2 and cls._is_available(available, idx1, idx2)
+                },
+            )
 
         df = cls._post_resolve(
             dfs,
@@ -646,18 +934,18 @@ class OperationSynthetizer:
         eers_idx = eers[EER_CODE_COL]
         eers_name = eers[EER_NAME_COL]
 
-        n_procs = int(Settings().processors)
         with time_and_log(
             message_root="Tempo para ler dados de REE", logger=cls.logger
         ):
-            with Pool(processes=n_procs) as pool:
-                async_res = {
-                    idx: pool.apply_async(
-                        cls._resolve_REE_entity, (uow, synthesis, idx, name)
-                    )
+            available = cls._available_entities(synthesis, uow)
+            dfs = WorkerPool.map(
+                cls._resolve_REE_entity,
+                {
+                    idx: (uow, synthesis, idx, name)
                     for idx, name in zip(eers_idx, eers_name)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+                    if cls._is_available(available, idx)
+                },
+            )
 
         df = cls._post_resolve(
             dfs,
@@ -680,33 +968,14 @@ class OperationSynthetizer:
         """
 
         def _calc_block_0_weighted_mean(
-            df: pd.DataFrame, uow: AbstractUnitOfWork
-        ) -> pd.DataFrame:
+            tensor: SynthesisTensor, uow: AbstractUnitOfWork
+        ) -> SynthesisTensor:
             """
             Calcula um valor médio ponderado para o estágio a partir
             de valores fornecidos por patamar de alguma variável operativa
             de uma UHE.
             """
-            n_blocks = Deck.num_blocks(uow)
-            unique_cols_for_block_0 = [HYDRO_CODE_COL, STAGE_COL, SCENARIO_COL]
-            df_block_0 = df.copy()
-            df_block_0[VALUE_COL] = (
-                df_block_0[VALUE_COL] * df_block_0[BLOCK_DURATION_COL]
-            ) / STAGE_DURATION_HOURS
-            df_base = df.iloc[::n_blocks].reset_index(drop=True).copy()
-            df_base[BLOCK_COL] = 0
-            df_base[BLOCK_DURATION_COL] = STAGE_DURATION_HOURS
-            arr = df_block_0[VALUE_COL].to_numpy()
-            n_linhas = arr.shape[0]
-            n_elementos_distintos = n_linhas // n_blocks
-            df_base[VALUE_COL] = arr.reshape((n_elementos_distintos, -1)).sum(
-                axis=1
-            )
-            df_block_0 = pd.concat([df_base, df], ignore_index=True, copy=True)
-            df_block_0 = df_block_0.sort_values(
-                unique_cols_for_block_0 + [BLOCK_COL]
-            )
-            return df_block_0
+            return tensor.with_block_0_weighted_mean(STAGE_DURATION_HOURS)
 
         logger_name = f"{synthesis.variable.value}_{uhe_name}"
         logger = Log.configure_process_logger(uow.queue, logger_name, uhe_index)
@@ -751,43 +1020,85 @@ class OperationSynthetizer:
         de uma UHE a partir dos arquivos de saída do NWLISTOP.
         """
 
-        def _limit_stages_with_hydro(
-            s: OperationSynthesis, df: pd.DataFrame, uow: AbstractUnitOfWork
-        ) -> pd.DataFrame:
-            df = df.loc[
-                df[START_DATE_COL]
-                < Deck.hydro_simulation_stages_ending_date_final_simulation(
-                    uow
-                ),
-            ].reset_index(drop=True)
-            return df
-
-        hydros = Deck.hydros(uow).reset_index().sort_values(HYDRO_CODE_COL)
-        hydros_idx = hydros[HYDRO_CODE_COL]
-        hydros_name = hydros[HYDRO_NAME_COL]
-
-        n_procs = int(Settings().processors)
         with time_and_log(
             message_root="Tempo para ler dados de UHE",
             logger=cls.logger,
         ):
-            with Pool(processes=n_procs) as pool:
-                async_res = {
-                    name: pool.apply_async(
-                        cls._resolve_UHE_entity, (uow, synthesis, idx, name)
-                    )
-                    for idx, name in zip(hydros_idx, hydros_name)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+            dfs = WorkerPool.map(
+                cls._resolve_UHE_entity, cls._UHE_tasks(synthesis, uow)
+            )
 
         df = cls._post_resolve(
             dfs,
             synthesis,
             uow,
-            early_hooks=[_limit_stages_with_hydro],
+            early_hooks=[cls._limit_stages_with_hydro],
         )
         return df
 
+    @classmethod
+    def _UHE_tasks(
+        cls, synthesis: OperationSynthesis, uow: AbstractUnitOfWork
+    ) -> Dict[str, Tuple[Any, ...]]:
+        """
+        Obtém as tarefas de leitura dos dados de cada UHE para uma
+        síntese, na ordem dos códigos das UHEs.
+        """
+        hydros = Deck.hydros(uow).reset_index().sort_values(HYDRO_CODE_COL)
+        hydros_idx = hydros[HYDRO_CODE_COL]
+        hydros_name = hydros[HYDRO_NAME_COL]
+        available = cls._available_entities(synthesis, uow)
+        selection = parse_selection(Settings().operation_hydros)
+        return {
+            name: (uow, synthesis, idx, name)
+            for idx, name in zip(hydros_idx, hydros_name)
+            if cls._is_available(available, idx)
+            and cls._is_selected(selection, idx)
+        }
+
+    @staticmethod
+    def _limit_stages_with_hydro(
+        s: OperationSynthesis, df: pd.DataFrame, uow: AbstractUnitOfWork
+    ) -> pd.DataFrame:
+        df = df.loc[
+            df[START_DATE_COL]
+            < Deck.hydro_simulation_stages_ending_date_final_simulation(uow),
+        ].reset_index(drop=True)
+        return df
+
+    @classmethod
+    def _resolve_UHE_stream(
+        cls, synthesis: OperationSynthesis, uow: AbstractUnitOfWork
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Resolve a síntese de operação de uma UHE fornecendo os dados
+        de cada UHE, já com os limites, à medida que são lidos, sem
+        que os dados de todas as UHEs sejam mantidos em memória.
+        """
+        spatial_resolution = synthesis.spatial_resolution
+        for _, df in WorkerPool.imap(
+            cls._resolve_UHE_entity, cls._UHE_tasks(synthesis, uow)
+        ):
+            if df is None:
+                continue
+            df_entity = cls._limit_stages_with_hydro(synthesis, df, uow)
+            df_entity = df_entity.sort_values(
+                spatial_resolution.sorting_synthesis_df_columns
+            ).reset_index(drop=True)
+            entities = {
+                **cls._get_unique_column_values_in_order(
+                    df_entity,
+                    spatial_resolution.sorting_synthesis_df_columns,
+                ),
+                **cls._get_unique_column_values_in_order(
+                    df,
+                    spatial_resolution.non_entity_sorting_synthesis_df_columns,
+                ),
+            }
+            yield OperationVariableBounds.resolve_bounds(
+                synthesis, df_entity, entities, uow
+            )
+
     @classmethod
     def _convert_volume_to_flow(
         cls, synthesis: OperationSynthesis, uow: AbstractUnitOfWork
@@ -1300,47 +1611,30 @@ class OperationSynthetizer:
     def _calc_accumulated_productivity(
         cls, df: pd.DataFrame, entities: dict, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
-        hydro_df = Deck.hydros(uow).reset_index()
-        # Monta a lista de arestas e constroi o grafo
-        # direcionado das usinas (JUSANTE -> MONTANTE)
-        hydro_codes = entities[HYDRO_CODE_COL]
-        np_edges = list(
-            hydro_df.loc[
-                hydro_df[HYDRO_CODE_COL].isin(hydro_codes),
-                ["codigo_usina_jusante", HYDRO_CODE_COL],
-            ].to_numpy()
+        """
+        Acumula a produtividade das usinas ao longo da cascata, somando
+        à produtividade de cada usina a produtividade acumulada da usina
+        a jusante, para todos os estágios, cenários e patamares de uma
+        única vez. Usinas sem dados na síntese interrompem a cascata.
+        """
+        hydro_codes = df[HYDRO_CODE_COL].to_numpy()
+        cascade = Deck.hydro_cascade(uow).restrict(
+            np.intersect1d(entities[HYDRO_CODE_COL], hydro_codes)
         )
-        edges = [tuple(e) for e in np_edges]
-        hydro_nodes_bfs = Graph(edges, directed=True).bfs(0)[1:]
-        # Percorre todas as usinas a partir de um BFS, tendo
-        # como nó de origem o 0 (MAR).
-        for hydro_code in hydro_nodes_bfs:
-            hydro_name = hydro_df.loc[
-                hydro_df[HYDRO_CODE_COL] == hydro_code, HYDRO_CODE_COL
-            ].iloc[0]
-            cls._log(f"Calculando prodt. acumulada para {hydro_name}...")
-            downstream_hydro_code = hydro_df.loc[
-                hydro_df[HYDRO_CODE_COL] == hydro_code,
-                "codigo_usina_jusante",
-            ].iloc[0]
-            if downstream_hydro_code == 0:
-                continue
-            downstream_hydro_name = hydro_df.loc[
-                hydro_df[HYDRO_CODE_COL] == downstream_hydro_code,
-                HYDRO_CODE_COL,
-            ].iloc[0]
-            hydro_productivity = df.loc[
-                df[HYDRO_CODE_COL] == hydro_name, PRODUCTIVITY_TMP_COL
-            ]
-            downstream_productivity = df.loc[
-                df[HYDRO_CODE_COL] == downstream_hydro_name,
-                PRODUCTIVITY_TMP_COL,
-            ].to_numpy()
-            if (
-                not hydro_productivity.empty
-                and len(downstream_productivity) > 0
-            ):
-                hydro_productivity += downstream_productivity
+        if cascade.num_nodes == 0:
+            return df
+        # Agrupa as linhas de cada usina na ordem da cascata, mantendo
+        # a ordem original das linhas de uma mesma usina
+        hydro_index = cascade.index_of(hydro_codes)
+        order = np.argsort(hydro_index, kind="stable")
+        order = order[np.count_nonzero(hydro_index < 0) :]
+        productivity = df[PRODUCTIVITY_TMP_COL].to_numpy(
+            dtype=np.float64, copy=True
+        )
+        productivity[order] = cascade.accumulate(
+            productivity[order].reshape(cascade.num_nodes, -1)
+        ).ravel()
+        df[PRODUCTIVITY_TMP_COL] = productivity
         return df
 
     @classmethod
@@ -1536,21 +1830,18 @@ class OperationSynthetizer:
                 for s in sbms_idx
             ]
 
-            n_procs = int(Settings().processors)
             with time_and_log(
                 message_root="Tempo para obter dados de SBM", logger=cls.logger
             ):
-                with Pool(processes=n_procs) as pool:
-                    async_res = {
-                        idx: pool.apply_async(
-                            cls._resolve_SBM_entity_MER_MERL,
-                            (uow, synthesis, idx, name),
-                        )
+                available = cls._available_entities(synthesis, uow)
+                dfs = WorkerPool.map(
+                    cls._resolve_SBM_entity_MER_MERL,
+                    {
+                        idx: (uow, synthesis, idx, name)
                         for idx, name in zip(sbms_idx, sbms_name)
-                    }
-                    dfs = {
-                        ir: r.get(timeout=3600) for ir, r in async_res.items()
-                    }
+                        if cls._is_available(available, idx)
+                    },
+                )
 
             df = cls._post_resolve(
                 dfs,
@@ -1746,8 +2037,10 @@ class OperationSynthetizer:
         """
         if df is None:
             return df
+        df = cls._limit_read_stages(df, uow)
         df = cls._resolve_temporal_resolution_GTER_UTE(df, uow)
         df = cls._resolve_starting_stage(df, uow)
+        df = cls._filter_selected_scenarios(df)
         df_stats = calc_statistics(df)
         df[STATS_OR_SCENARIO_COL] = False
         df_stats[STATS_OR_SCENARIO_COL] = True
@@ -1813,7 +2106,6 @@ class OperationSynthetizer:
             for s in sbms_idx
         ]
 
-        n_procs = int(Settings().processors)
         synthesis = OperationSynthesis(
             variable=synthesis.variable,
             spatial_resolution=synthesis.spatial_resolution,
@@ -1822,15 +2114,15 @@ class OperationSynthetizer:
             message_root="Tempo para ler dados de UTE",
             logger=cls.logger,
         ):
-            with Pool(processes=n_procs) as pool:
-                async_res = {
-                    idx: pool.apply_async(
-                        cls._resolve_GTER_UTE_entity,
-                        (uow, synthesis, idx, name),
-                    )
+            available = cls._available_entities(synthesis, uow)
+            dfs = WorkerPool.map(
+                cls._resolve_GTER_UTE_entity,
+                {
+                    idx: (uow, synthesis, idx, name)
                     for idx, name in zip(sbms_idx, sbms_name)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+                    if cls._is_available(available, idx)
+                },
+            )
 
         df = cls._post_resolve(
             dfs,
@@ -2267,30 +2559,104 @@ class OperationSynthetizer:
                 OperationVariableBounds.is_bounded(s),
             ]
         with uow:
-            existing_df = uow.export.read_df(
-                OPERATION_SYNTHESIS_METADATA_OUTPUT
-            )
-            if existing_df is not None:
-                metadata_df = pd.concat(
-                    [existing_df, metadata_df], ignore_index=True
-                )
-                metadata_df = metadata_df.drop_duplicates()
-            uow.export.synthetize_df(
-                metadata_df, OPERATION_SYNTHESIS_METADATA_OUTPUT
+            uow.export.upsert_df(
+                metadata_df, OPERATION_SYNTHESIS_METADATA_OUTPUT, "chave"
             )
+            uow.export.compact(OPERATION_SYNTHESIS_METADATA_OUTPUT)
 
     @classmethod
-    def _add_synthesis_stats(cls, s: OperationSynthesis, df: pd.DataFrame):
+    def _add_synthesis_stats(
+        cls, s: OperationSynthesis, df: pd.DataFrame, uow: AbstractUnitOfWork
+    ):
         """
-        Adiciona um DataFrame com estatísticas de uma síntese ao
-        DataFrame de estatísticas da agregação espacial em questão.
+        Escreve um DataFrame com estatísticas de uma síntese como
+        o fragmento da variável no arquivo de estatísticas da
+        agregação espacial em questão.
         """
+        res = s.spatial_resolution
         df[VARIABLE_COL] = s.variable.value
+        df = df[[VARIABLE_COL] + res.all_synthesis_df_columns]
+        df = df.astype({VARIABLE_COL: STRING_DF_TYPE})
+        df = df.sort_values(
+            [VARIABLE_COL] + res.sorting_synthesis_df_columns
+        ).reset_index(drop=True)
+        with cls.SYNTHESIS_LOCK:
+            cls.SYNTHESIS_STATS.add(res)
+        with uow:
+            cls.writer.submit(
+                str(s),
+                uow.export.upsert_df,
+                df,
+                f"{OPERATION_SYNTHESIS_STATS_ROOT}_{res.value}",
+                VARIABLE_COL,
+            )
 
-        if s.spatial_resolution not in cls.SYNTHESIS_STATS:
-            cls.SYNTHESIS_STATS[s.spatial_resolution] = [df]
-        else:
-            cls.SYNTHESIS_STATS[s.spatial_resolution].append(df)
+    @classmethod
+    def _split_scenarios_and_stats(
+        cls, s: OperationSynthesis, df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Separa os dados dos cenários e as estatísticas de uma síntese,
+        calculando as estatísticas caso não existam.
+        """
+        scenarios_df = df.loc[~df[STATS_OR_SCENARIO_COL]]
+        stats_df = df.loc[df[STATS_OR_SCENARIO_COL]]
+        scenarios_df = scenarios_df.astype({SCENARIO_COL: int})
+        stats_df = stats_df.reset_index(drop=True)
+        scenarios_df = scenarios_df.sort_values(
+            s.spatial_resolution.sorting_synthesis_df_columns
+        ).reset_index(drop=True)
+        if stats_df.empty:
+            stats_df = calc_statistics(scenarios_df)
+        stats_df = stats_df.drop(columns=[STATS_OR_SCENARIO_COL])
+        return scenarios_df, stats_df
+
+    @classmethod
+    def _is_streaming_synthesis(cls, s: OperationSynthesis) -> bool:
+        """
+        Verifica se uma síntese pode ser exportada por partes, sendo
+        lida, processada e escrita uma UHE de cada vez.
+        """
+        return all([
+            Settings().streaming_export,
+            s.spatial_resolution == SpatialResolution.USINA_HIDROELETRICA,
+            cls._stub_mappings(s) is None,
+            s not in cls.DEPENDENCY_SYNTHESIS,
+        ])
+
+    @classmethod
+    def _export_scenario_synthesis_streaming(
+        cls, s: OperationSynthesis, uow: AbstractUnitOfWork
+    ) -> bool:
+        """
+        Realiza a exportação dos dados para uma síntese da operação
+        por partes, escrevendo os dados de cada UHE à medida que são
+        lidos. As estatísticas são calculadas para cada UHE e somente
+        elas são mantidas em memória até o fim da síntese.
+        """
+        stats_dfs: List[pd.DataFrame] = []
+
+        def _scenario_chunks() -> Iterator[pd.DataFrame]:
+            for df in cls._resolve_UHE_stream(s, uow):
+                scenarios_df, stats_df = cls._split_scenarios_and_stats(s, df)
+                stats_dfs.append(cls._filter_selected_stages(stats_df))
+                scenarios_df = cls._filter_selected_stages(scenarios_df)
+                yield scenarios_df.drop(columns=[STATS_OR_SCENARIO_COL])[
+                    s.spatial_resolution.all_synthesis_df_columns
+                ]
+
+        with time_and_log(
+            message_root="Tempo para leitura e exportacao dos dados",
+            logger=cls.logger,
+        ):
+            with uow:
+                uow.export.synthetize_dfs(_scenario_chunks(), str(s))
+        if len(stats_dfs) == 0:
+            return False
+        cls._add_synthesis_stats(
+            s, pd.concat(stats_dfs, ignore_index=True), uow
+        )
+        return True
 
     @classmethod
     def _export_scenario_synthesis(
@@ -2307,18 +2673,11 @@ class OperationSynthetizer:
             message_root="Tempo para preparacao para exportacao",
             logger=cls.logger,
         ):
-            scenarios_df = df.loc[~df[STATS_OR_SCENARIO_COL]]
-            stats_df = df.loc[df[STATS_OR_SCENARIO_COL]]
-            scenarios_df = scenarios_df.astype({SCENARIO_COL: int})
-            stats_df = stats_df.reset_index(drop=True)
-            scenarios_df = scenarios_df.sort_values(
-                s.spatial_resolution.sorting_synthesis_df_columns
-            ).reset_index(drop=True)
-            if stats_df.empty:
-                stats_df = calc_statistics(scenarios_df)
-            stats_df = stats_df.drop(columns=[STATS_OR_SCENARIO_COL])
-            cls._add_synthesis_stats(s, stats_df)
+            scenarios_df, stats_df = cls._split_scenarios_and_stats(s, df)
+            stats_df = cls._filter_selected_stages(stats_df)
+            cls._add_synthesis_stats(s, stats_df, uow)
             cls.__store_in_cache_if_needed(s, scenarios_df)
+            scenarios_df = cls._filter_selected_stages(scenarios_df)
         with time_and_log(
             message_root="Tempo para exportacao dos dados", logger=cls.logger
         ):
@@ -2329,7 +2688,9 @@ class OperationSynthetizer:
                 scenarios_df = scenarios_df[
                     s.spatial_resolution.all_synthesis_df_columns
                 ]
-                uow.export.synthetize_df(scenarios_df, filename)
+                cls.writer.submit(
+                    filename, uow.export.synthetize_df, scenarios_df, filename
+                )
 
     @classmethod
     def _export_stats(
@@ -2338,31 +2699,21 @@ class OperationSynthetizer:
     ):
         """
         Realiza a exportação dos dados de estatísticas de síntese
-        da operação. As estatísticas são exportadas para um arquivo
-        único por agregação espacial, de nome
-        `OPERACAO_{agregacao}`.
+        da operação. Os fragmentos de estatísticas escritos durante a
+        síntese são consolidados em um arquivo único por agregação
+        espacial, de nome `ESTATISTICAS_OPERACAO_{agregacao}`.
         """
-        for res, dfs in cls.SYNTHESIS_STATS.items():
+        for res in cls.SYNTHESIS_STATS:
             with time_and_log(
                 message_root="Tempo para exportacao"
                 + f" das estatisticas de {res.value}",
                 logger=cls.logger,
             ):
                 with uow:
-                    df = pd.concat(dfs, ignore_index=True)
-                    df = df[[VARIABLE_COL] + res.all_synthesis_df_columns]
-                    df = df.astype({VARIABLE_COL: STRING_DF_TYPE})
-                    df = df.sort_values(
-                        [VARIABLE_COL] + res.sorting_synthesis_df_columns
-                    ).reset_index(drop=True)
-                    stats_filename = (
-                        f"{OPERATION_SYNTHESIS_STATS_ROOT}_{res.value}"
+                    uow.export.compact(
+                        f"{OPERATION_SYNTHESIS_STATS_ROOT}_{res.value}",
+                        [VARIABLE_COL] + res.sorting_synthesis_df_columns,
                     )
-                    existing_df = uow.export.read_df(stats_filename)
-                    if existing_df is not None:
-                        df = pd.concat([existing_df, df], ignore_index=True)
-                        df = df.drop_duplicates()
-                    uow.export.synthetize_df(df, stats_filename)
 
     @classmethod
     def _preprocess_synthesis_variables(
@@ -2381,6 +2732,7 @@ class OperationSynthetizer:
                 synthesis_variables = cls._process_variable_arguments(
                     all_variables
                 )
+            cls._validate_hydro_selection(synthesis_variables)
             valid_synthesis = cls._filter_valid_variables(
                 synthesis_variables, uow
             )
@@ -2412,7 +2764,11 @@ class OperationSynthetizer:
                 cls._log(f"Realizando sintese de {filename}")
                 df = cls.__get_from_cache_if_exists(s)
                 is_stub = cls._stub_mappings(s) is not None
-                if df.empty:
+                if df.empty and cls._is_streaming_synthesis(s):
+                    if cls._export_scenario_synthesis_streaming(s, uow):
+                        return s
+                    df = None
+                elif df.empty:
                     df, is_stub = cls._resolve_stub(s, uow)
                     if not is_stub:
                         df = cls._resolve_synthesis(s, uow)
@@ -2462,11 +2818,22 @@ class OperationSynthetizer:
             synthesis_with_dependencies = cls._preprocess_synthesis_variables(
                 variables, uow
             )
-            success_synthesis: List[OperationSynthesis] = []
-            for s in synthesis_with_dependencies:
-                r = cls._synthetize_single_variable(s, uow)
-                if r:
-                    success_synthesis.append(r)
+            unchanged_synthesis: List[OperationSynthesis] = []
+            if Settings().incremental_synthesis:
+                synthesis_with_dependencies, unchanged_synthesis = (
+                    cls._filter_unchanged_synthesis(
+                        synthesis_with_dependencies, uow
+                    )
+                )
+            cls._prewarm_deck_data(uow)
+            cls.writer = ExportWriter()
+            with WorkerPool.start(), cls.writer.start():
+                success_synthesis = cls._synthetize_with_dependencies(
+                    synthesis_with_dependencies, uow
+                )
+            cls._restore_unchanged_synthesis_stats(unchanged_synthesis, uow)
 
             cls._export_stats(uow)
-            cls._export_metadata(success_synthesis, uow)
+            cls._export_metadata(
+                unchanged_synthesis + success_synthesis, uow
+            )
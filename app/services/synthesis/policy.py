@@ -18,6 +18,7 @@ from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.writer import ExportWriter
 
 
 class PolicySynthetizer:
@@ -27,6 +28,9 @@ class PolicySynthetizer:
 
     logger: Optional[logging.Logger] = None
 
+    # Escritor da execução atual da síntese, síncrono fora dela
+    writer = ExportWriter(threads=0, budget=0)
+
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
         if cls.logger is not None:
@@ -122,15 +126,10 @@ class PolicySynthetizer:
                 s.variable.long_name,
             ]
         with uow:
-            existing_df = uow.export.read_df(POLICY_SYNTHESIS_METADATA_OUTPUT)
-            if existing_df is not None:
-                metadata_df = pd.concat(
-                    [existing_df, metadata_df], ignore_index=True
-                )
-                metadata_df = metadata_df.drop_duplicates()
-            uow.export.synthetize_df(
-                metadata_df, POLICY_SYNTHESIS_METADATA_OUTPUT
+            uow.export.upsert_df(
+                metadata_df, POLICY_SYNTHESIS_METADATA_OUTPUT, "chave"
             )
+            uow.export.compact(POLICY_SYNTHESIS_METADATA_OUTPUT)
 
     @classmethod
     def _synthetize_single_variable(
@@ -150,7 +149,9 @@ class PolicySynthetizer:
                 df = cls._resolve(s, uow)
                 if df is not None:
                     with uow:
-                        uow.export.synthetize_df(df, filename)
+                        cls.writer.submit(
+                            filename, uow.export.synthetize_df, df, filename
+                        )
                         return s
                 return None
             except Exception as e:
@@ -170,9 +171,14 @@ class PolicySynthetizer:
                 variables, uow
             )
             success_synthesis: List[PolicySynthesis] = []
-            for s in synthesis_variables:
-                r = cls._synthetize_single_variable(s, uow)
-                if r:
-                    success_synthesis.append(r)
+            cls.writer = ExportWriter()
+            with cls.writer.start():
+                for s in synthesis_variables:
+                    r = cls._synthetize_single_variable(s, uow)
+                    if r:
+                        success_synthesis.append(r)
+                success_synthesis = cls.writer.wait_export(
+                    success_synthesis, cls.logger
+                )
 
             cls._export_metadata(success_synthesis, uow)
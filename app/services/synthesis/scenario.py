@@ -1,9 +1,8 @@
 import logging
 from datetime import datetime
 from logging import ERROR, INFO
-from multiprocessing import Pool
 from traceback import print_exc
-from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
@@ -16,11 +15,11 @@ from app.internal.constants import (
     END_DATE_COL,
     HYDRO_CODE_COL,
     ITERATION_COL,
-    LOWER_BOUND_COL,
     LTA_COL,
     LTA_VALUE_COL,
     MONTH_COL,
     NULL_INFLOW_STATION,
+    QUANTILE_ERROR_COL,
     SCENARIO_COL,
     SCENARIO_SYNTHESIS_METADATA_OUTPUT,
     SCENARIO_SYNTHESIS_STATS_ROOT,
@@ -30,7 +29,6 @@ from app.internal.constants import (
     START_DATE_COL,
     STRING_DF_TYPE,
     SUBMARKET_CODE_COL,
-    UPPER_BOUND_COL,
     VALUE_COL,
     VARIABLE_COL,
 )
@@ -43,12 +41,20 @@ from app.model.scenario.spatialresolution import SpatialResolution
 from app.model.scenario.step import Step
 from app.model.scenario.variable import Variable
 from app.model.settings import Settings
+from app.services.deck.aggregation import SpatialAggregation
 from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
 from app.utils.log import Log
-from app.utils.operations import calc_statistics
+from app.utils.operations import (
+    StatisticsSketch,
+    calc_statistics,
+    calc_statistics_sketch,
+    merge_statistics_sketches,
+)
+from app.utils.pool import WorkerPool
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.writer import ExportWriter
 
 
 class ScenarioSynthetizer:
@@ -74,9 +80,26 @@ class ScenarioSynthetizer:
 
     logger: Optional[logging.Logger] = None
 
-    SYNTHESIS_STATS: Dict[
-        Tuple[SpatialResolution, Step], List[pd.DataFrame]
-    ] = {}
+    # Escritor da execução atual da síntese, síncrono fora dela
+    writer = ExportWriter(threads=0, budget=0)
+
+    # Estatísticas das sínteses são escritas como fragmentos, que são
+    # consolidados ao final da síntese para cada agregação e etapa
+    SYNTHESIS_STATS: Set[Tuple[SpatialResolution, Step]] = set()
+
+    # Dados do deck utilizados pelas tarefas executadas no pool de
+    # processos, construídos antes da criação do pool
+    WORKER_DECK_DATA: List[Callable[[AbstractUnitOfWork], Any]] = [
+        Deck.num_hydro_simulation_stages_policy,
+        Deck.internal_stages_starting_dates_policy,
+        Deck.internal_stages_starting_dates_policy_with_past_tendency,
+        Deck.starting_date_with_past_tendency_period,
+        Deck.study_period_starting_month,
+        Deck.eer_submarket_map,
+        Deck.eer_code_order,
+        Deck.hydro_eer_submarket_map,
+        Deck.hydro_code_order,
+    ]
 
     @classmethod
     def clear_cache(cls):
@@ -887,6 +910,37 @@ class ScenarioSynthetizer:
         inflow_df_columns += [SPAN_COL] if SPAN_COL in inflow_df.columns else []
         return inflow_df[inflow_df_columns]
 
+    @classmethod
+    def _generated_energy_first_stage(
+        cls, converted_energy_df: pd.DataFrame, hydro_simulation_stages: int
+    ) -> Optional[int]:
+        """
+        Obtém o primeiro estágio das energias geradas que é utilizado
+        na síntese. Quando existem energias convertidas, os estágios
+        individualizados não precisam ser convertidos para tabela.
+        """
+        if converted_energy_df.empty:
+            return None
+        return hydro_simulation_stages + 1
+
+    @classmethod
+    def _calc_iteration_statistics(
+        cls, df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
+        """
+        Calcula as estatísticas dos dados de uma iteração, adicionando-as
+        ao DataFrame. No modo aproximado, os valores de cada grupo são
+        resumidos em um `QuantileSketch`, que é retornado para ser
+        combinado com os das demais iterações no processo principal.
+        """
+        settings = Settings()
+        if settings.statistics_mode.upper() == "APROXIMADO":
+            return df, calc_statistics_sketch(
+                df, int(settings.statistics_sketch_size)
+            )
+        df_stats = calc_statistics(df)
+        return pd.concat([df, df_stats], ignore_index=True), None
+
     @classmethod
     def _post_resolve_energy_iteration(
         cls,
@@ -896,11 +950,12 @@ class ScenarioSynthetizer:
         hydro_simulation_stages: int,
         dates: List[datetime],
         it: Optional[int] = None,
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Realiza o pós-processamento para cálculo de estatísticas e adição
         de dados de submercado aos dados de energias lidos.
         """
+        sketch = None
         if not converted_energy_df.empty and not generated_energy_df.empty:
             energy_df = pd.concat(
                 [
@@ -920,10 +975,9 @@ class ScenarioSynthetizer:
             energy_df = cls._add_energy_eer_data(uow, energy_df, dates)
             if it is not None:
                 energy_df[ITERATION_COL] = it
-            df_stats = calc_statistics(energy_df)
-            energy_df = pd.concat([energy_df, df_stats], ignore_index=True)
+            energy_df, sketch = cls._calc_iteration_statistics(energy_df)
             energy_df = energy_df.astype({SCENARIO_COL: STRING_DF_TYPE})
-        return energy_df
+        return energy_df, sketch
 
     @classmethod
     def _post_resolve_inflow_iteration(
@@ -931,24 +985,24 @@ class ScenarioSynthetizer:
         inflow_df: pd.DataFrame,
         uow: AbstractUnitOfWork,
         it: Optional[int] = None,
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Realiza o pós-processamento para cálculo de estatísticas e adição
         de dados de REE e submercado aos dados de vazão lidos.
         """
+        sketch = None
         if not inflow_df.empty:
             inflow_df = cls._add_inflow_hydro_data(uow, inflow_df)
             if it is not None:
                 inflow_df[ITERATION_COL] = it
-            df_stats = calc_statistics(inflow_df)
-            inflow_df = pd.concat([inflow_df, df_stats], ignore_index=True)
+            inflow_df, sketch = cls._calc_iteration_statistics(inflow_df)
             inflow_df = inflow_df.astype({SCENARIO_COL: STRING_DF_TYPE})
-        return inflow_df
+        return inflow_df, sketch
 
     @classmethod
     def _resolve_forward_energy_iteration(
         cls, uow: AbstractUnitOfWork, it: int
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Obtem os dados de ENA para a etapa forward em uma determinada
         iteração de interesse, considerando já os estágios individualizados
@@ -956,16 +1010,25 @@ class ScenarioSynthetizer:
         `enavazf.dat` e `energiaf.dat`, respectivamente. É adicionada uma
         coluna `iteracao` ao DataFrame resultante.
 
-        :return: Os dados como um DataFrame.
-        :rtype: pd.DataFrame
+        :return: Os dados como um DataFrame, acompanhados do resumo
+            das estatísticas no modo aproximado.
+        :rtype: Tuple[pd.DataFrame, Optional[StatisticsSketch]]
         """
         logger = Log.configure_process_logger(
             uow._queue, Variable.ENA_ABSOLUTA.value, it
         )
         logger.info(f"Obtendo energias forward da it. {it}")
-        generated_energy_df = Deck.energiaf(it, uow)
-        converted_energy_df = Deck.enavazf(it, uow)
         hydro_simulation_stages = Deck.num_hydro_simulation_stages_policy(uow)
+        converted_energy_df = Deck.enavazf(
+            it, uow, last_stage=hydro_simulation_stages
+        )
+        generated_energy_df = Deck.energiaf(
+            it,
+            uow,
+            first_stage=cls._generated_energy_first_stage(
+                converted_energy_df, hydro_simulation_stages
+            ),
+        )
         dates = Deck.internal_stages_starting_dates_policy_with_past_tendency(
             uow
         )
@@ -981,16 +1044,26 @@ class ScenarioSynthetizer:
 
     @classmethod
     def _post_resolve(
-        cls, resolve_responses: Dict[int, pd.DataFrame]
+        cls,
+        resolve_responses: Dict[
+            int, Tuple[pd.DataFrame, Optional[StatisticsSketch]]
+        ],
     ) -> pd.DataFrame:
         """
         Realiza o pós-processamento para agregação dos dados de todos os
-        DataFrames lidos de um conjunto de arquivos.
+        DataFrames lidos de um conjunto de arquivos. Os resumos das
+        estatísticas aproximadas construídos em cada processo são
+        combinados e as estatísticas resultantes são adicionadas aos dados.
         """
         with time_and_log("Tempo para compactacao dos dados", cls.logger):
-            valid_dfs = [
-                df for df in resolve_responses.values() if df is not None
-            ]
+            responses = [r for r in resolve_responses.values() if r is not None]
+            valid_dfs = [df for df, _ in responses if df is not None]
+            sketches = [s for _, s in responses if s is not None]
+            if len(sketches) > 0:
+                stats_df = merge_statistics_sketches(sketches)
+                valid_dfs.append(
+                    stats_df.astype({SCENARIO_COL: STRING_DF_TYPE})
+                )
             if len(valid_dfs) > 0:
                 df = pd.concat(valid_dfs, ignore_index=True)
             else:
@@ -1000,41 +1073,37 @@ class ScenarioSynthetizer:
     @classmethod
     def _resolve_forward_energy(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         """
-        Obtem os dados de ENA para a etapa forward em todas as iterações feitas
-        pelo modelo.
+        Obtem os dados de ENA para a etapa forward nas iterações selecionadas
+        para a síntese.
 
         :return: Os dados como um DataFrame.
         :rtype: pd.DataFrame
         """
-        num_iterations = Deck.num_iterations(uow)
-        num_procs = int(Settings().processors)
+        iterations = Deck.scenario_iterations(uow)
         with time_and_log(
             message_root="Tempo para obter energias forward",
             logger=cls.logger,
         ):
-            with Pool(processes=num_procs) as pool:
-                async_res = {
-                    it: pool.apply_async(
-                        cls._resolve_forward_energy_iteration, (uow, it)
-                    )
-                    for it in range(1, num_iterations + 1)
-                }
-                dfs = {it: r.get(timeout=3600) for it, r in async_res.items()}
+            dfs = WorkerPool.map(
+                cls._resolve_forward_energy_iteration,
+                {it: (uow, it) for it in iterations},
+            )
 
         return cls._post_resolve(dfs)
 
     @classmethod
     def _resolve_forward_inflow_iteration(
         cls, uow: AbstractUnitOfWork, it: int
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Obtem os dados de QINC para a etapa forward em uma determinada
         iteração de interesse, considerando apenas os estágios individualizados,
         nos quais a vazão é lida do arquivo binário `vazaof.dat`. É adicionada
         uma coluna `iteracao` ao DataFrame resultante.
 
-        :return: Os dados como um DataFrame.
-        :rtype: pd.DataFrame
+        :return: Os dados como um DataFrame, acompanhados do resumo
+            das estatísticas no modo aproximado.
+        :rtype: Tuple[pd.DataFrame, Optional[StatisticsSketch]]
         """
         logger = Log.configure_process_logger(
             uow.queue, Variable.VAZAO_INCREMENTAL.value, it
@@ -1046,32 +1115,27 @@ class ScenarioSynthetizer:
     @classmethod
     def _resolve_forward_inflow(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         """
-        Obtem os dados de QINC para a etapa forward em todas as iterações
-        feitas pelo modelo.
+        Obtem os dados de QINC para a etapa forward nas iterações
+        selecionadas para a síntese.
 
         :return: Os dados como um DataFrame.
         :rtype: pd.DataFrame
         """
-        num_iterations = Deck.num_iterations(uow)
-        num_procs = int(Settings().processors)
+        iterations = Deck.scenario_iterations(uow)
         with time_and_log(
             message_root="Tempo para obter vazoes forward",
             logger=cls.logger,
         ):
-            with Pool(processes=num_procs) as pool:
-                async_res = {
-                    it: pool.apply_async(
-                        cls._resolve_forward_inflow_iteration, (uow, it)
-                    )
-                    for it in range(1, num_iterations + 1)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+            dfs = WorkerPool.map(
+                cls._resolve_forward_inflow_iteration,
+                {it: (uow, it) for it in iterations},
+            )
         return cls._post_resolve(dfs)
 
     @classmethod
     def _resolve_backward_energy_iteration(
         cls, uow: AbstractUnitOfWork, it: int
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Obtem os dados de ENA para a etapa backward em uma determinada
         iteração de interesse, considerando já os estágios individualizados
@@ -1079,16 +1143,25 @@ class ScenarioSynthetizer:
         `enavazb.dat` e `energiab.dat`, respectivamente. É adicionada uma
         coluna `iteracao` ao DataFrame resultante.
 
-        :return: Os dados como um DataFrame.
-        :rtype: pd.DataFrame
+        :return: Os dados como um DataFrame, acompanhados do resumo
+            das estatísticas no modo aproximado.
+        :rtype: Tuple[pd.DataFrame, Optional[StatisticsSketch]]
         """
         logger = Log.configure_process_logger(
             uow._queue, Variable.ENA_ABSOLUTA.value, it
         )
         logger.info(f"Obtendo energias backward da it. {it}")
-        generated_energy_df = Deck.energiab(it, uow)
-        converted_energy_df = Deck.enavazb(it, uow)
         hydro_simulation_stages = Deck.num_hydro_simulation_stages_policy(uow)
+        converted_energy_df = Deck.enavazb(
+            it, uow, last_stage=hydro_simulation_stages
+        )
+        generated_energy_df = Deck.energiab(
+            it,
+            uow,
+            first_stage=cls._generated_energy_first_stage(
+                converted_energy_df, hydro_simulation_stages
+            ),
+        )
         dates = Deck.internal_stages_starting_dates_policy(uow)
 
         return cls._post_resolve_energy_iteration(
@@ -1103,41 +1176,37 @@ class ScenarioSynthetizer:
     @classmethod
     def _resolve_backward_energy(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         """
-        Obtem os dados de ENA para a etapa backward em todas as iterações
-        feitas pelo modelo.
+        Obtem os dados de ENA para a etapa backward nas iterações
+        selecionadas para a síntese.
 
         :return: Os dados como um DataFrame.
         :rtype: pd.DataFrame
         """
-        num_iterations = Deck.num_iterations(uow)
-        num_procs = int(Settings().processors)
+        iterations = Deck.scenario_iterations(uow)
         with time_and_log(
             message_root="Tempo para obter energias backward",
             logger=cls.logger,
         ):
-            with Pool(processes=num_procs) as pool:
-                async_res = {
-                    it: pool.apply_async(
-                        cls._resolve_backward_energy_iteration, (uow, it)
-                    )
-                    for it in range(1, num_iterations + 1)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+            dfs = WorkerPool.map(
+                cls._resolve_backward_energy_iteration,
+                {it: (uow, it) for it in iterations},
+            )
 
         return cls._post_resolve(dfs)
 
     @classmethod
     def _resolve_backward_inflow_iteration(
         cls, uow: AbstractUnitOfWork, it: int
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Optional[StatisticsSketch]]:
         """
         Obtem os dados de QINC para a etapa backward em uma determinada
         iteração de interesse, considerando apenas os estágios individualizados,
         nos quais a vazão é lida do arquivo binário `vazaob.dat`. É adicionada
         uma coluna `iteracao` ao DataFrame resultante.
 
-        :return: Os dados como um DataFrame.
-        :rtype: pd.DataFrame
+        :return: Os dados como um DataFrame, acompanhados do resumo
+            das estatísticas no modo aproximado.
+        :rtype: Tuple[pd.DataFrame, Optional[StatisticsSketch]]
         """
         logger = Log.configure_process_logger(
             uow.queue, Variable.VAZAO_INCREMENTAL.value, it
@@ -1150,26 +1219,21 @@ class ScenarioSynthetizer:
     @classmethod
     def _resolve_backward_inflow(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         """
-        Obtem os dados de QINC para a etapa backward em todas as iterações
-        feitas pelo modelo.
+        Obtem os dados de QINC para a etapa backward nas iterações
+        selecionadas para a síntese.
 
         :return: Os dados como um DataFrame.
         :rtype: pd.DataFrame
         """
-        num_iterations = Deck.num_iterations(uow)
-        num_procs = int(Settings().processors)
+        iterations = Deck.scenario_iterations(uow)
         with time_and_log(
             message_root="Tempo para obter vazoes backward",
             logger=cls.logger,
         ):
-            with Pool(processes=num_procs) as pool:
-                async_res = {
-                    it: pool.apply_async(
-                        cls._resolve_backward_inflow_iteration, (uow, it)
-                    )
-                    for it in range(1, num_iterations + 1)
-                }
-                dfs = {ir: r.get(timeout=3600) for ir, r in async_res.items()}
+            dfs = WorkerPool.map(
+                cls._resolve_backward_inflow_iteration,
+                {it: (uow, it) for it in iterations},
+            )
         return cls._post_resolve(dfs)
 
     @classmethod
@@ -1183,20 +1247,27 @@ class ScenarioSynthetizer:
         :rtype: pd.DataFrame
         """
         cls._log("Obtendo energias da simulação final")
+        hydro_simulation_stages = (
+            Deck.num_hydro_simulation_stages_final_simulation(uow)
+        )
         with time_and_log(
             message_root="Tempo para obter energias da simulacao final",
             logger=cls.logger,
         ):
-            generated_energy_df = Deck.energias(uow)
-            converted_energy_df = Deck.enavazs(uow)
-        hydro_simulation_stages = (
-            Deck.num_hydro_simulation_stages_final_simulation(uow)
-        )
+            converted_energy_df = Deck.enavazs(
+                uow, last_stage=hydro_simulation_stages
+            )
+            generated_energy_df = Deck.energias(
+                uow,
+                first_stage=cls._generated_energy_first_stage(
+                    converted_energy_df, hydro_simulation_stages
+                ),
+            )
         dates = Deck.internal_stages_starting_dates_policy_with_past_tendency(
             uow
         )
 
-        df = cls._post_resolve_energy_iteration(
+        response = cls._post_resolve_energy_iteration(
             generated_energy_df,
             converted_energy_df,
             uow,
@@ -1204,7 +1275,7 @@ class ScenarioSynthetizer:
             dates,
             it=None,
         )
-        return cls._post_resolve({0: df})
+        return cls._post_resolve({0: response})
 
     @classmethod
     def _resolve_final_simulation_inflow(
@@ -1223,12 +1294,12 @@ class ScenarioSynthetizer:
         ):
             inflow_df = Deck.vazaos(uow)
 
-        df = cls._post_resolve_inflow_iteration(
+        response = cls._post_resolve_inflow_iteration(
             inflow_df,
             uow,
             it=None,
         )
-        return cls._post_resolve({0: df})
+        return cls._post_resolve({0: response})
 
     @classmethod
     def _get_cached_variable(
@@ -1278,22 +1349,34 @@ class ScenarioSynthetizer:
 
     @classmethod
     def _resolve_group(
-        cls, group_col: List[str], df: pd.DataFrame
+        cls, group_col: List[str], df: pd.DataFrame, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
         """
         Realiza o agrupamento dos dados por meio de uma soma, cosiderando
         uma lista de colunas para agrupamento e excluindo a coluna "valor",
-        que será sempre agregada.
+        que será sempre agregada. A agregação das entidades é feita
+        a partir das incidências entre UHEs, REEs e SBMs do caso.
 
         :return: Os dados agrupados como um DataFrame.
         :rtype: pd.DataFrame
         """
         if not df.empty:
-            cols = group_col + [
-                c for c in cls.COMMON_COLUMNS if c in df.columns
-            ]
-            grouped_df = df.groupby(cols).sum(numeric_only=True).reset_index()
-            return grouped_df[cols + [VALUE_COL]]
+            # O limite do erro dos quantis aproximados das entidades
+            # agregadas é somado, sendo limitado à totalidade dos cenários
+            error_col = [c for c in [QUANTILE_ERROR_COL] if c in df.columns]
+            df = SpatialAggregation.aggregate(
+                df,
+                SpatialAggregation.HYDRO_LEVELS,
+                group_col,
+                [c for c in cls.COMMON_COLUMNS if c in df.columns],
+                [VALUE_COL] + error_col,
+                uow,
+                engine="cython",
+                sort=True,
+            )
+            if len(error_col) > 0:
+                df[QUANTILE_ERROR_COL] = df[QUANTILE_ERROR_COL].clip(upper=1.0)
+            return df
         else:
             return df
 
@@ -1429,7 +1512,7 @@ class ScenarioSynthetizer:
         }
         df = cls._get_cached_variable(synthesis.variable, synthesis.step, uow)
         df = cls._resolve_group(
-            RESOLUTION_MAP[synthesis.spatial_resolution], df
+            RESOLUTION_MAP[synthesis.spatial_resolution], df, uow
         )
         return cls._resolve_lta(synthesis, df, uow)
 
@@ -1478,30 +1561,36 @@ class ScenarioSynthetizer:
                 UNITS[s].value if s in UNITS else "",
             ]
         with uow:
-            existing_df = uow.export.read_df(SCENARIO_SYNTHESIS_METADATA_OUTPUT)
-            if existing_df is not None:
-                metadata_df = pd.concat(
-                    [existing_df, metadata_df], ignore_index=True
-                )
-                metadata_df = metadata_df.drop_duplicates()
-            uow.export.synthetize_df(
-                metadata_df, SCENARIO_SYNTHESIS_METADATA_OUTPUT
+            uow.export.upsert_df(
+                metadata_df, SCENARIO_SYNTHESIS_METADATA_OUTPUT, "chave"
             )
+            uow.export.compact(SCENARIO_SYNTHESIS_METADATA_OUTPUT)
 
     @classmethod
-    def _add_synthesis_stats(cls, s: ScenarioSynthesis, df: pd.DataFrame):
+    def _add_synthesis_stats(
+        cls, s: ScenarioSynthesis, df: pd.DataFrame, uow: AbstractUnitOfWork
+    ):
         """
-        Adiciona um DataFrame com estatísticas de uma síntese ao
-        DataFrame de estatísticas da agregação espacial e etapa em questão.
+        Escreve um DataFrame com estatísticas de uma síntese como o
+        fragmento da variável no arquivo de estatísticas da agregação
+        espacial e etapa em questão.
         """
         df[VARIABLE_COL] = s.variable.value
+        df = df[[VARIABLE_COL] + [c for c in df.columns if c != VARIABLE_COL]]
+        df = df.astype({VARIABLE_COL: STRING_DF_TYPE})
+        cls.SYNTHESIS_STATS.add((s.spatial_resolution, s.step))
+        with uow:
+            cls.writer.submit(
+                str(s),
+                uow.export.upsert_df,
+                df,
+                cls._stats_filename(s.spatial_resolution, s.step),
+                VARIABLE_COL,
+            )
 
-        key = (s.spatial_resolution, s.step)
-
-        if key not in cls.SYNTHESIS_STATS:
-            cls.SYNTHESIS_STATS[key] = [df]
-        else:
-            cls.SYNTHESIS_STATS[key].append(df)
+    @staticmethod
+    def _stats_filename(res: SpatialResolution, step: Step) -> str:
+        return f"{SCENARIO_SYNTHESIS_STATS_ROOT}_{res.value}_{step.value}"
 
     @classmethod
     def _export_scenario_synthesis(
@@ -1527,15 +1616,19 @@ class ScenarioSynthetizer:
             scenarios_df = df.loc[df[SCENARIO_COL].isin(scenarios)]
             scenarios_df = scenarios_df.astype({SCENARIO_COL: int})
             stats_df = df.drop(index=scenarios_df.index).reset_index(drop=True)
+            if QUANTILE_ERROR_COL in scenarios_df.columns:
+                scenarios_df = scenarios_df.drop(columns=[QUANTILE_ERROR_COL])
             scenarios_df = scenarios_df.sort_values(
                 s.sorting_synthesis_df_columns
             ).reset_index(drop=True)
 
             if stats_df.empty:
                 stats_df = calc_statistics(scenarios_df)
-            cls._add_synthesis_stats(s, stats_df)
+            cls._add_synthesis_stats(s, stats_df, uow)
             with uow:
-                uow.export.synthetize_df(scenarios_df, filename)
+                cls.writer.submit(
+                    filename, uow.export.synthetize_df, scenarios_df, filename
+                )
 
     @classmethod
     def _export_stats(
@@ -1544,34 +1637,13 @@ class ScenarioSynthetizer:
     ):
         """
         Realiza a exportação dos dados de estatísticas de síntese
-        da operação. As estatísticas são exportadas para um arquivo
-        único por agregação espacial e etapa, de nome
-        `CENARIOS_{agregacao}_{etapa}`.
+        dos cenários. Os fragmentos de estatísticas escritos durante a
+        síntese são consolidados em um arquivo único por agregação
+        espacial e etapa, de nome `ESTATISTICAS_CENARIOS_{agregacao}_{etapa}`.
         """
-        for (res, step), dfs in cls.SYNTHESIS_STATS.items():
+        for res, step in cls.SYNTHESIS_STATS:
             with uow:
-                df = pd.concat(dfs, ignore_index=True)
-                df_columns = df.columns.tolist()
-                columns_without_variable = [
-                    c for c in df_columns if c != VARIABLE_COL
-                ]
-                df = df[[VARIABLE_COL] + columns_without_variable]
-                df = df.astype({VARIABLE_COL: STRING_DF_TYPE})
-                filename = (
-                    f"{SCENARIO_SYNTHESIS_STATS_ROOT}_{res.value}_{step.value}"
-                )
-                existing_df = uow.export.read_df(filename)
-                if existing_df is not None:
-                    df = pd.concat([existing_df, df], ignore_index=True)
-                    df = df.drop_duplicates(
-                        subset=[
-                            c
-                            for c in df.columns
-                            if c
-                            not in [VALUE_COL, UPPER_BOUND_COL, LOWER_BOUND_COL]
-                        ]
-                    )
-                uow.export.synthetize_df(df, filename)
+                uow.export.compact(cls._stats_filename(res, step))
 
     @classmethod
     def _preprocess_synthesis_variables(
@@ -1635,6 +1707,18 @@ class ScenarioSynthetizer:
         if version is not None:
             uow.version = version
 
+    @classmethod
+    def _prewarm_deck_data(cls, uow: AbstractUnitOfWork):
+        """
+        Constrói os dados do deck utilizados pelas tarefas do pool
+        de processos antes da sua criação.
+        """
+        with time_and_log(
+            message_root="Tempo para pre-carregamento do deck",
+            logger=cls.logger,
+        ):
+            Deck.prewarm(cls.WORKER_DECK_DATA, uow)
+
     @classmethod
     def synthetize(cls, variables: List[str], uow: AbstractUnitOfWork):
         """
@@ -1654,10 +1738,16 @@ class ScenarioSynthetizer:
                 variables, uow
             )
             success_synthesis: List[ScenarioSynthesis] = []
-            for s in valid_synthesis:
-                r = cls._synthetize_single_variable(s, uow)
-                if r:
-                    success_synthesis.append(r)
+            cls._prewarm_deck_data(uow)
+            cls.writer = ExportWriter()
+            with WorkerPool.start(), cls.writer.start():
+                for s in valid_synthesis:
+                    r = cls._synthetize_single_variable(s, uow)
+                    if r:
+                        success_synthesis.append(r)
+                success_synthesis = cls.writer.wait_export(
+                    success_synthesis, cls.logger
+                )
 
             cls._export_stats(uow)
             cls._export_metadata(success_synthesis, uow)
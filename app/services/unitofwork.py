@@ -1,8 +1,7 @@
 from abc import ABC, abstractmethod
 from multiprocessing import Queue
-from os import chdir, curdir
 from pathlib import Path
-from typing import Dict, Type
+from typing import Dict, Tuple, Type
 
 from app.adapters.repository.export import (
     AbstractExportRepository,
@@ -16,6 +15,7 @@ from app.adapters.repository.files import (
 from app.adapters.repository.files import (
     factory as files_factory,
 )
+from app.internal.constants import DECK_DATA_CACHE_SUBDIR
 from app.model.settings import Settings
 
 
@@ -35,6 +35,10 @@ class AbstractUnitOfWork(ABC):
     def rollback(self):
         raise NotImplementedError
 
+    @abstractmethod
+    def invalidate(self):
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def files(self) -> AbstractFilesRepository:
@@ -45,6 +49,11 @@ class AbstractUnitOfWork(ABC):
     def export(self) -> AbstractExportRepository:
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def cache_dir(self) -> str:
+        raise NotImplementedError
+
     @property
     def version(self) -> str:
         return self._version
@@ -67,18 +76,31 @@ class AbstractUnitOfWork(ABC):
 
 
 class FSUnitOfWork(AbstractUnitOfWork):
+    # Repositórios de arquivos mantidos ao longo do processo para cada
+    # caso, preservando os arquivos já processados entre os contextos.
+    # Os processos do pool herdam os repositórios já existentes.
+    FILES_REPOSITORIES: Dict[Tuple[str, str, str], AbstractFilesRepository] = {}
+
     def __init__(self, directory: str, q: Queue):
         super().__init__(q)
-        self._current_path = str(Path(curdir).resolve())
         self._path = str(Path(directory).resolve())
         self._files = None
         self._exporter = None
 
     def __create_repository(self):
         if self._files is None:
-            self._files = files_factory(
-                Settings().file_repository, str(self._path), self._version
-            )
+            key = (Settings().file_repository, self._path, self._version)
+            files = self.FILES_REPOSITORIES.get(key)
+            if files is None:
+                files = self.FILES_REPOSITORIES.setdefault(
+                    key,
+                    files_factory(
+                        Settings().file_repository,
+                        str(self._path),
+                        self._version,
+                    ),
+                )
+            self._files = files
         if self._exporter is None:
             synthesis_outdir = (
                 Path(self._path)
@@ -91,12 +113,13 @@ class FSUnitOfWork(AbstractUnitOfWork):
             )
 
     def __enter__(self) -> "AbstractUnitOfWork":
-        chdir(self._path)
+        # Os caminhos dos repositórios são absolutos, de modo que o
+        # diretório de trabalho do processo não é alterado, visto que
+        # as sínteses podem utilizar o mesmo caso em várias threads.
         self.__create_repository()
         return super().__enter__()
 
     def __exit__(self, *args):
-        chdir(self._current_path)
         self._files = None
         self._exporter = None
         super().__exit__(*args)
@@ -113,6 +136,14 @@ class FSUnitOfWork(AbstractUnitOfWork):
             raise RuntimeError()
         return self._exporter
 
+    @property
+    def cache_dir(self) -> str:
+        return str(
+            Path(self._path)
+            .joinpath(Settings().synthesis_dir)
+            .joinpath(DECK_DATA_CACHE_SUBDIR)
+        )
+
     @property
     def version(self) -> str:
         return self._version
@@ -124,6 +155,15 @@ class FSUnitOfWork(AbstractUnitOfWork):
     def rollback(self):
         pass
 
+    def invalidate(self):
+        """
+        Descarta os repositórios de arquivos do caso mantidos
+        pelo processo, forçando a releitura dos arquivos.
+        """
+        for key in list(self.FILES_REPOSITORIES.keys()):
+            if key[1] == self._path:
+                self.FILES_REPOSITORIES.pop(key, None)
+
 
 def factory(kind: str, *args, **kwargs) -> AbstractUnitOfWork:
     mappings: Dict[str, Type[AbstractUnitOfWork]] = {
@@ -1,17 +1,49 @@
-import platform
+import codecs
+import os
+from threading import Lock
+from typing import Dict, Tuple
 
-from app.utils.terminal import run_terminal_retry
+# Codificação assumida para arquivos que não são UTF-8 válidos
+FALLBACK_ENCODING = "ISO-8859-1"
 
-TIMEOUT_DEFAULT = 10.0
+# Tamanho dos blocos lidos durante a detecção da codificação
+CHUNK_SIZE = 1 << 16
 
+DECODED_FILES: Dict[str, Tuple[Tuple[int, int], str]] = {}
+DECODED_FILES_LOCK = Lock()
 
-async def converte_codificacao(path: str, script: str):
-    if platform.system() == "Windows":
-        return
-    _, out = await run_terminal_retry([f"file -i {path}"])
-    cod = out.split("charset=")[1].strip()
-    if "unknown" in cod:
-        cod = "ISO-8859-1"
-    if all([cod != "utf-8", cod != "us-ascii", cod != "binary"]):
-        cod = cod.upper()
-        c, _ = await run_terminal_retry([f"{script}" + f" {path} {cod}"])
+
+def detecta_codificacao(path: str) -> str:
+    """
+    Detecta a codificação de um arquivo, lendo-o em blocos e validando
+    o conteúdo como UTF-8. Arquivos que não são UTF-8 válidos são
+    considerados como ISO-8859-1.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def le_conteudo_normalizado(path: str) -> str:
+    """
+    Lê o conteúdo de um arquivo de texto na codificação detectada,
+    normalizando as quebras de linha, sem alterar o arquivo em disco.
+    O conteúdo é mantido em cache enquanto o arquivo não for modificado.
+    """
+    st = os.stat(path)
+    key = (st.st_size, st.st_mtime_ns)
+    with DECODED_FILES_LOCK:
+        cached = DECODED_FILES.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "r", encoding=detecta_codificacao(path), newline="") as f:
+        content = f.read().replace("\r\n", "\n")
+    with DECODED_FILES_LOCK:
+        DECODED_FILES[path] = (key, content)
+    return content
@@ -0,0 +1,27 @@
+import hashlib
+import os
+from typing import List
+
+
+def files_fingerprint(paths: List[str]) -> str:
+    """
+    Calcula uma assinatura para um conjunto de arquivos a partir dos
+    seus nomes, tamanhos e datas de modificação.
+    """
+    h = hashlib.sha1()
+    for p in sorted(paths):
+        st = os.stat(p)
+        h.update(
+            f"{os.path.basename(p)}:{st.st_size}:{st.st_mtime_ns};".encode()
+        )
+    return h.hexdigest()
+
+
+def combine_fingerprints(fingerprints: List[str]) -> str:
+    """
+    Combina um conjunto ordenado de assinaturas em uma única assinatura.
+    """
+    h = hashlib.sha1()
+    for f in fingerprints:
+        h.update(f"{f};".encode())
+    return h.hexdigest()
@@ -1,61 +1,99 @@
-from typing import List, Tuple
+from typing import List
 
 import numpy as np
 
 
-class Graph:
-    def __init__(
-        self, edgelist: List[Tuple[int, int]], directed: bool = True
-    ) -> None:
-        self.edgelist = edgelist
-        self.directed = directed
-        self.nodes = self._init_node_set()
-        self.adjacency_matrix = self._make_adjacency_matrix()
-
-    def _init_node_set(self) -> List[int]:
-        nodes = set()
-        for e in self.edgelist:
-            nodes.add(e[0])
-            nodes.add(e[1])
-        return sorted(list(nodes))
-
-    def _make_adjacency_matrix(self) -> np.ndarray:
-        a = np.zeros((self.num_nodes, self.num_nodes), dtype=np.int64)
-        for e in self.edgelist:
-            e_indices = (
-                self.node_label_to_index(e[0]),
-                self.node_label_to_index(e[1]),
-            )
-            a[e_indices[0], e_indices[1]] = 1
-            if not self.directed:
-                a[e_indices[1], e_indices[0]] = 1
-        return a
-
-    def node_index_to_label(self, node_index: int) -> int:
-        return self.nodes[node_index]
-
-    def node_label_to_index(self, node: int) -> int:
-        return self.nodes.index(node)
+class Cascade:
+    """
+    Cascata de usinas, na qual cada usina possui no máximo uma usina
+    a jusante, identificada pelo código `0` quando deságua no mar.
+
+    As usinas a montante de cada usina são armazenadas em formato CSR
+    e a ordem topológica, do mar para as usinas mais a montante, é
+    obtida uma única vez, agrupada em níveis de mesma distância ao mar.
+    Usinas cuja usina a jusante não pertence à cascata, e as usinas a
+    montante destas, não são alcançadas a partir do mar.
+    """
+
+    def __init__(self, codes: np.ndarray, downstream_codes: np.ndarray):
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self._sorter = np.argsort(self.codes, kind="stable")
+        downstream_codes = np.asarray(downstream_codes, dtype=np.int64)
+        # Índice da usina a jusante de cada usina, ou -1 caso a
+        # usina a jusante seja o mar ou não pertença à cascata
+        self.downstream = self.index_of(downstream_codes)
+        self.roots = np.flatnonzero(downstream_codes == 0)
+        self.upstream_indptr, self.upstream_indices = self._upstream_csr()
+        self.levels = self._topological_levels()
 
     @property
     def num_nodes(self) -> int:
-        return len(self.nodes)
+        return len(self.codes)
 
-    @property
-    def num_edges(self) -> int:
-        return len(self.edgelist)
-
-    def bfs(self, root_node: int) -> List[int]:
-        visited = [False] * self.num_nodes
-        start_node = self.node_label_to_index(root_node)
-        queue = [start_node]
-        visited[start_node] = True
-        bfs_order = []
-        while queue:
-            node = queue.pop(0)
-            bfs_order.append(self.node_index_to_label(node))
-            for i in range(self.num_nodes):
-                if self.adjacency_matrix[node, i] == 1 and not visited[i]:
-                    queue.append(i)
-                    visited[i] = True
-        return bfs_order
+    def index_of(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Obtém o índice na cascata de cada código de usina, ou -1 para
+        os códigos que não pertencem à cascata.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if self.num_nodes == 0:
+            return np.full(codes.shape, -1, dtype=np.int64)
+        positions = np.searchsorted(self.codes, codes, sorter=self._sorter)
+        positions = np.minimum(positions, self.num_nodes - 1)
+        index = self._sorter[positions]
+        return np.where(self.codes[index] == codes, index, -1)
+
+    def _upstream_csr(self):
+        """
+        Constrói o mapa das usinas a montante de cada usina, em
+        formato CSR (ponteiros e índices).
+        """
+        connected = self.downstream >= 0
+        counts = np.bincount(
+            self.downstream[connected], minlength=self.num_nodes
+        )
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        order = np.argsort(self.downstream, kind="stable")
+        indices = order[np.count_nonzero(~connected) :]
+        return indptr, indices
+
+    def _topological_levels(self) -> List[np.ndarray]:
+        """
+        Percorre a cascata a partir do mar, obtendo as usinas de cada
+        nível de distância ao mar.
+        """
+        levels: List[np.ndarray] = []
+        current = self.roots
+        while len(current) > 0:
+            levels.append(current)
+            starts = self.upstream_indptr[current]
+            counts = self.upstream_indptr[current + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            current = self.upstream_indices[
+                offsets + np.arange(counts.sum(), dtype=np.int64)
+            ]
+        return levels
+
+    def restrict(self, codes: np.ndarray) -> "Cascade":
+        """
+        Obtém a cascata formada somente pelas usinas fornecidas.
+        """
+        index = self.index_of(codes)
+        index = np.unique(index[index >= 0])
+        downstream = self.downstream[index]
+        downstream_codes = np.where(downstream >= 0, self.codes[downstream], -1)
+        downstream_codes[np.isin(index, self.roots)] = 0
+        return Cascade(self.codes[index], downstream_codes)
+
+    def accumulate(self, values: np.ndarray) -> np.ndarray:
+        """
+        Acumula valores ao longo da cascata, somando ao valor de cada
+        usina o valor acumulado da usina a jusante. O primeiro eixo de
+        `values` corresponde às usinas, na ordem da cascata, e os demais
+        são acumulados de uma única vez.
+        """
+        accumulated = np.array(values, dtype=np.float64)
+        for level in self.levels[1:]:
+            accumulated[level] += accumulated[self.downstream[level]]
+        return accumulated
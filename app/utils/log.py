@@ -54,9 +54,10 @@ class Log(metaclass=Singleton):
         variable: str,
         member: int,
     ) -> logging.Logger:
-        h = logging.handlers.QueueHandler(q)
         logger = logging.getLogger(f"worker-{variable}-{member}")
-        logger.addHandler(h)
+        # Processos persistentes podem reconfigurar o mesmo logger
+        if not logger.handlers:
+            logger.addHandler(logging.handlers.QueueHandler(q))
         logger.setLevel(logging.INFO)
         return logger
 
@@ -1,14 +1,29 @@
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 from app.internal.constants import (
     PANDAS_GROUPING_ENGINE,
+    QUANTILE_ERROR_COL,
     QUANTILES_FOR_STATISTICS,
     SCENARIO_COL,
     VALUE_COL,
 )
+from app.utils.sketch import QuantileSketch
+
+# Colunas de identificação dos grupos e resumo dos seus valores, para o
+# cálculo das estatísticas aproximadas
+StatisticsSketch = Tuple[pd.DataFrame, QuantileSketch]
+
+# Versões da pandas cujos agrupamentos são reproduzidos pelos kernels,
+# validadas pelos testes de paridade. Em outras versões, os agrupamentos
+# da própria pandas são utilizados.
+KERNELS_PANDAS_VERSIONS = ["3.0"]
+USE_GROUPING_KERNELS = (
+    PANDAS_GROUPING_ENGINE == "numba"
+    and ".".join(pd.__version__.split(".")[:2]) in KERNELS_PANDAS_VERSIONS
+)
 
 
 def fast_group_df(
@@ -30,10 +45,19 @@ def fast_group_df(
         "sum": grouped_df.sum,
     }
 
-    try:
-        grouped_df = operation_map[operation](engine=PANDAS_GROUPING_ENGINE)
-    except ZeroDivisionError:
-        grouped_df = operation_map[operation](engine="cython")
+    # A engine numba não suporta divisões por zero, que ocorrem nas
+    # médias e desvios padrão de grupos somente com valores nulos.
+    # Estes grupos são identificados antes do agrupamento, evitando
+    # que a operação seja realizada duas vezes.
+    engine = PANDAS_GROUPING_ENGINE
+    if (
+        engine == "numba"
+        and operation != "sum"
+        and df[extract_columns].isna().to_numpy().any()
+        and (grouped_df.count() == 0).to_numpy().any()
+    ):
+        engine = "cython"
+    grouped_df = operation_map[operation](engine=engine)
 
     if reset_index:
         grouped_df = grouped_df.reset_index()
@@ -107,6 +131,383 @@ def _calc_mean_std(df: pd.DataFrame) -> pd.DataFrame:
     return pd.concat([df_mean, df_std], ignore_index=True)
 
 
+def _stats_kernel(
+    values: np.ndarray, sorted_values: np.ndarray, quantiles: np.ndarray
+) -> np.ndarray:
+    """
+    Calcula os quantis, a média e o desvio padrão de cada linha de uma
+    matriz (grupos, cenários), ignorando os valores nulos. Os quantis
+    são obtidos da matriz com as linhas ordenadas, com os valores nulos
+    ao final. As operações reproduzem as realizadas pela pandas nos
+    agrupamentos, com a soma compensada da média e do desvio padrão da
+    engine numba e a interpolação linear dos quantis, garantindo os
+    mesmos resultados.
+    """
+    num_groups, num_scenarios = values.shape
+    num_quantiles = quantiles.shape[0]
+    out = np.empty((num_groups, num_quantiles + 2), dtype=np.float64)
+    for g in range(num_groups):
+        nobs = 0
+        sum_x = 0.0
+        sum_comp = 0.0
+        mean_x = 0.0
+        ssqdm_x = 0.0
+        var_comp = 0.0
+        consecutive = 0
+        prev_value = 0.0
+        for j in range(num_scenarios):
+            val = values[g, j]
+            if np.isnan(val):
+                continue
+            if val == prev_value:
+                consecutive += 1
+            else:
+                consecutive = 1
+            prev_value = val
+            nobs += 1
+            if not np.isnan(sum_x):
+                y = val - sum_comp
+                t = sum_x + y
+                sum_comp = t - sum_x - y
+                sum_x = t
+            if not np.isnan(ssqdm_x):
+                prev_mean = mean_x - var_comp
+                y = val - var_comp
+                t = y - mean_x
+                var_comp = t + mean_x - y
+                mean_x += t / nobs
+                ssqdm_x += (val - prev_mean) * (val - mean_x)
+        # Quantis
+        if nobs == 0:
+            for k in range(num_quantiles):
+                out[g, k] = np.nan
+        else:
+            for k in range(num_quantiles):
+                q_idx = quantiles[k] * (nobs - 1)
+                idx = int(q_idx)
+                frac = q_idx % 1
+                val = sorted_values[g, idx]
+                if frac != 0.0:
+                    val = val + (sorted_values[g, idx + 1] - val) * frac
+                out[g, k] = val
+        # Média
+        if nobs == 0:
+            out[g, num_quantiles] = np.nan
+        elif consecutive >= nobs:
+            out[g, num_quantiles] = prev_value * nobs / nobs
+        else:
+            out[g, num_quantiles] = sum_x / nobs
+        # Desvio padrão
+        if nobs <= 1:
+            out[g, num_quantiles + 1] = np.nan
+        elif consecutive >= nobs:
+            out[g, num_quantiles + 1] = 0.0
+        else:
+            out[g, num_quantiles + 1] = np.sqrt(ssqdm_x / (nobs - 1))
+    return out
+
+
+def _sum_kernel(
+    values: np.ndarray,
+    labels: np.ndarray,
+    num_groups: int,
+    numba_rules: bool,
+) -> np.ndarray:
+    """
+    Soma as linhas de uma matriz (valores, colunas) de acordo com o
+    índice do grupo de cada linha, ignorando os valores nulos e as
+    linhas de índice negativo. As operações reproduzem a soma compensada
+    realizada pela pandas nos agrupamentos, com as regras da engine
+    numba ou da engine cython, de acordo com `numba_rules`.
+    """
+    num_values, num_columns = values.shape
+    out = np.zeros((num_groups, num_columns), dtype=np.float64)
+    comp = np.zeros((num_groups, num_columns), dtype=np.float64)
+    nobs = np.zeros((num_groups, num_columns), dtype=np.int64)
+    consecutive = np.zeros((num_groups, num_columns), dtype=np.int64)
+    prev_value = np.zeros((num_groups, num_columns), dtype=np.float64)
+    for i in range(num_values):
+        lab = labels[i]
+        if lab < 0:
+            continue
+        for j in range(num_columns):
+            val = values[i, j]
+            if numba_rules and np.isnan(out[lab, j]):
+                continue
+            if np.isnan(val):
+                continue
+            nobs[lab, j] += 1
+            y = val - comp[lab, j]
+            t = out[lab, j] + y
+            comp[lab, j] = t - out[lab, j] - y
+            if not numba_rules and comp[lab, j] != comp[lab, j]:
+                comp[lab, j] = 0.0
+            out[lab, j] = t
+            if numba_rules:
+                if val == prev_value[lab, j]:
+                    consecutive[lab, j] += 1
+                else:
+                    consecutive[lab, j] = 1
+                prev_value[lab, j] = val
+    if numba_rules:
+        for g in range(num_groups):
+            for j in range(num_columns):
+                if consecutive[g, j] >= nobs[g, j]:
+                    out[g, j] = prev_value[g, j] * nobs[g, j]
+    return out
+
+
+if USE_GROUPING_KERNELS:
+    from numba import njit  # type: ignore
+
+    _stats_kernel = njit(nogil=True, cache=True)(_stats_kernel)
+    _sum_kernel = njit(nogil=True, cache=True)(_sum_kernel)
+
+
+def sum_by_labels(
+    values: np.ndarray, labels: np.ndarray, num_groups: int, engine: str
+) -> np.ndarray:
+    """
+    Soma as linhas de uma matriz (valores, colunas) de acordo com o
+    índice do grupo de cada linha, com o mesmo resultado de uma soma
+    agrupada da pandas com a engine fornecida. Linhas com índice
+    negativo são desconsideradas.
+    """
+    if USE_GROUPING_KERNELS:
+        return _sum_kernel(
+            np.ascontiguousarray(values, dtype=np.float64),
+            labels,
+            num_groups,
+            engine == "numba",
+        )
+    valid = labels >= 0
+    return (
+        pd.DataFrame(values[valid])
+        .groupby(labels[valid], sort=True)
+        .sum(engine=engine)
+        .reindex(np.arange(num_groups), fill_value=0.0)
+        .to_numpy(dtype=np.float64)
+    )
+
+
+def group_labels(
+    df: pd.DataFrame,
+    grouping_columns: List[str],
+    sort: bool = False,
+    keys: Optional[np.ndarray] = None,
+    num_keys: int = 1,
+) -> np.ndarray:
+    """
+    Obtém o índice do grupo de cada linha, como em
+    `groupby(..., sort=sort).ngroup()`. Os códigos de cada coluna são
+    combinados em uma única chave inteira, evitando o hash de múltiplas
+    colunas. Linhas com valores nulos nas colunas de agrupamento recebem
+    o índice -1.
+
+    Opcionalmente, é fornecido um código inicial `keys` para cada linha,
+    entre `0` e `num_keys - 1`, que precede as colunas de agrupamento.
+    Códigos negativos indicam linhas a serem desconsideradas.
+    """
+    if keys is None:
+        keys = np.zeros(df.shape[0], dtype=np.int64)
+    valid = keys >= 0
+    for col in grouping_columns:
+        codes, uniques = pd.factorize(df[col], sort=sort)
+        num_keys *= len(uniques) + 1
+        if num_keys >= 2**62:
+            raise OverflowError("Número de chaves de agrupamento excedido")
+        valid &= codes >= 0
+        keys = keys * (len(uniques) + 1) + codes
+    labels = np.full(df.shape[0], -1, dtype=np.int64)
+    labels[valid] = pd.factorize(keys[valid], sort=sort)[0]
+    return labels
+
+
+def _group_labels(df: pd.DataFrame, grouping_columns: List[str]) -> np.ndarray:
+    """
+    Obtém o índice do grupo de cada linha, na ordem de aparição dos
+    grupos, como em `groupby(..., sort=False).ngroup()`.
+    """
+    try:
+        return group_labels(df, grouping_columns)
+    except OverflowError:
+        return df.groupby(grouping_columns, sort=False).ngroup().to_numpy()
+
+
+def _labels_matrix(
+    labels: np.ndarray, values: np.ndarray, num_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Organiza valores em uma matriz (grupos, valores) a partir do índice
+    do grupo de cada valor, mantendo a ordem dos valores em cada grupo.
+    Grupos com menos valores são completados com valores nulos. Também
+    retorna a posição do primeiro valor de cada grupo.
+    """
+    order = np.argsort(labels, kind="stable")
+    counts = np.bincount(labels, minlength=num_groups)
+    starts = np.cumsum(counts) - counts
+    positions = np.arange(len(order)) - np.repeat(starts, counts)
+    matrix = np.full(
+        (num_groups, max(counts.max(initial=0), 1)), np.nan, dtype=np.float64
+    )
+    matrix[np.repeat(np.arange(num_groups), counts), positions] = values[order]
+    return matrix, order[np.minimum(starts, max(len(order) - 1, 0))]
+
+
+def _group_matrix(
+    df: pd.DataFrame, grouping_columns: List[str]
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Organiza os valores de um DataFrame em uma matriz (grupos, cenários),
+    mantendo a ordem de aparição dos grupos e dos valores em cada grupo.
+    Grupos com menos valores são completados com valores nulos.
+    """
+    labels = _group_labels(df, grouping_columns)
+    rows = np.flatnonzero(labels >= 0)
+    labels = labels[rows]
+    num_groups = int(labels.max(initial=-1)) + 1
+    matrix, first = _labels_matrix(
+        labels,
+        df[VALUE_COL].to_numpy(dtype=np.float64)[rows],
+        num_groups,
+    )
+    keys_df = df[grouping_columns].iloc[rows[first]].reset_index(drop=True)
+    return keys_df, matrix
+
+
+def _format_statistics(
+    keys_df: pd.DataFrame,
+    quantiles: np.ndarray,
+    quantile_values: np.ndarray,
+    mean: np.ndarray,
+    std: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Organiza as estatísticas de cada grupo no formato de saída, com os
+    quantis de todos os grupos seguidos das médias e dos desvios padrão.
+    """
+    num_groups, num_quantiles = keys_df.shape[0], len(quantiles)
+    groups = np.concatenate(
+        [
+            np.repeat(np.arange(num_groups), num_quantiles),
+            np.arange(num_groups),
+            np.arange(num_groups),
+        ]
+    )
+    labels = np.concatenate(
+        [
+            np.tile(
+                np.array([quantile_scenario_labels(q) for q in quantiles]),
+                num_groups,
+            ),
+            np.repeat(np.array(["mean", "std"]), num_groups),
+        ]
+    )
+    stats_df = keys_df.iloc[groups].reset_index(drop=True)
+    stats_df[SCENARIO_COL] = labels
+    stats_df[VALUE_COL] = np.concatenate([quantile_values.ravel(), mean, std])
+    return stats_df
+
+
+def _calc_statistics_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula as estatísticas de uma variável com uma única passagem pelos
+    valores de cada grupo, organizados em uma matriz (grupos, cenários).
+    O resultado é idêntico ao obtido com os agrupamentos da pandas.
+    """
+    value_columns = [SCENARIO_COL, VALUE_COL]
+    grouping_columns = [c for c in df.columns if c not in value_columns]
+    keys_df, matrix = _group_matrix(df, grouping_columns)
+    quantiles = np.array(QUANTILES_FOR_STATISTICS, dtype=np.float64)
+    # A ordenação completa das linhas é mais rápida do que a seleção
+    # parcial (np.partition) das posições dos 21 quantis, que exige
+    # uma seleção para cada posição
+    stats = _stats_kernel(matrix, np.sort(matrix, axis=1), quantiles)
+    num_quantiles = len(quantiles)
+    return _format_statistics(
+        keys_df,
+        quantiles,
+        stats[:, :num_quantiles],
+        stats[:, num_quantiles],
+        stats[:, num_quantiles + 1],
+    )
+
+
+def calc_statistics_sketch(df: pd.DataFrame, size: int) -> StatisticsSketch:
+    """
+    Resume os valores de cada grupo de uma variável em um
+    `QuantileSketch` de no máximo `size` pontos, processando os cenários
+    em blocos de `size` cenários, de modo que a memória utilizada no
+    resumo não depende do número de cenários. Retorna as colunas de
+    identificação dos grupos e o resumo, que pode ser combinado com os
+    de outras partes dos dados por `merge_statistics_sketches`.
+    """
+    value_columns = [SCENARIO_COL, VALUE_COL]
+    grouping_columns = [c for c in df.columns if c not in value_columns]
+    labels = _group_labels(df, grouping_columns)
+    rows = np.flatnonzero(labels >= 0)
+    labels = labels[rows]
+    num_groups = int(labels.max(initial=-1)) + 1
+    values = df[VALUE_COL].to_numpy(dtype=np.float64)[rows]
+    blocks = pd.factorize(df[SCENARIO_COL].to_numpy()[rows])[0] // size
+    block_order = np.argsort(blocks, kind="stable")
+    bounds = np.searchsorted(
+        blocks[block_order], np.arange(blocks.max(initial=0) + 2)
+    )
+    sketches: List[QuantileSketch] = []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        block_rows = block_order[first:last]
+        matrix, _ = _labels_matrix(
+            labels[block_rows], values[block_rows], num_groups
+        )
+        sketches.append(QuantileSketch.from_matrix(matrix, size))
+    _, first_rows = _labels_matrix(labels, values, num_groups)
+    keys_df = df[grouping_columns].iloc[rows[first_rows]]
+    return keys_df.reset_index(drop=True), QuantileSketch.merge(sketches)
+
+
+def merge_statistics_sketches(parts: List[StatisticsSketch]) -> pd.DataFrame:
+    """
+    Combina os resumos de partes distintas dos dados de uma variável,
+    como os construídos em cada processo, e calcula as estatísticas
+    aproximadas de cada grupo. Os resumos de um grupo presente em mais
+    de uma parte são combinados. Os quantis são acompanhados do limite
+    do erro de posição, na coluna `erro_quantil`.
+    """
+    keys_df = pd.concat([k for k, _ in parts], ignore_index=True)
+    sketch = QuantileSketch.concat([s for _, s in parts])
+    labels = _group_labels(keys_df, list(keys_df.columns))
+    occurrence = pd.Series(labels).groupby(labels).cumcount().to_numpy()
+    first_rows = np.flatnonzero(occurrence == 0)
+    merged = sketch.take(first_rows)
+    for k in range(1, int(occurrence.max(initial=0)) + 1):
+        rows = np.flatnonzero(occurrence == k)
+        groups = labels[rows]
+        others = np.setdiff1d(np.arange(len(first_rows)), groups)
+        combined = QuantileSketch.merge(
+            [merged.take(groups), sketch.take(rows)]
+        )
+        merged = QuantileSketch.concat([merged.take(others), combined]).take(
+            np.argsort(np.concatenate([others, groups]))
+        )
+    keys_df = keys_df.iloc[first_rows].reset_index(drop=True)
+    quantiles = np.array(QUANTILES_FOR_STATISTICS, dtype=np.float64)
+    stats_df = _format_statistics(
+        keys_df,
+        quantiles,
+        merged.quantiles(quantiles),
+        np.where(merged.count > 0, merged.mean, np.nan),
+        merged.std(),
+    )
+    stats_df[QUANTILE_ERROR_COL] = np.concatenate(
+        [
+            np.repeat(merged.rank_error(), len(quantiles)),
+            np.zeros(2 * keys_df.shape[0]),
+        ]
+    )
+    return stats_df
+
+
 def calc_statistics(df: pd.DataFrame) -> pd.DataFrame:
     """
     Realiza o pós-processamento de um DataFrame com dados da
@@ -114,6 +515,8 @@ def calc_statistics(df: pd.DataFrame) -> pd.DataFrame:
     estatísticas como quantis e média para cada variável, em cada
     estágio e patamar.
     """
+    if USE_GROUPING_KERNELS and not df.empty:
+        return _calc_statistics_sorted(df)
     df_q = _calc_quantiles(df, QUANTILES_FOR_STATISTICS)
     df_m = _calc_mean_std(df)
     df_stats = pd.concat([df_q, df_m], ignore_index=True)
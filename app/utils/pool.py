@@ -0,0 +1,128 @@
+import math
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from multiprocessing.pool import Pool as ProcessPool
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from app.model.settings import Settings
+
+K = TypeVar("K", bound=Hashable)
+
+
+class WorkerPool:
+    """
+    Pool de processos persistente, criado uma única vez e reaproveitado
+    por todas as tarefas de uma síntese. Os processos são mantidos vivos
+    entre as tarefas, preservando as caches de dados do deck já
+    construídas em cada processo.
+    """
+
+    pool: Optional[ProcessPool] = None
+    processes: int = 1
+
+    # Número de lotes de tarefas que são enviados para cada processo,
+    # equilibrando a sobrecarga de comunicação com o balanceamento
+    # da carga entre os processos.
+    CHUNKS_PER_PROCESS = 4
+
+    # Tempo máximo de espera, em segundos, por lote de tarefas
+    TIMEOUT = 3600
+
+    # Número máximo de tarefas enviadas e ainda não consumidas, por
+    # processo, nas execuções com resultados fornecidos sob demanda
+    PENDING_TASKS_PER_PROCESS = 2
+
+    @classmethod
+    @contextmanager
+    def start(cls, processes: Optional[int] = None) -> Iterator[ProcessPool]:
+        """
+        Inicia o pool de processos, caso não exista um pool ativo,
+        e o encerra ao final do contexto. Chamadas aninhadas reaproveitam
+        o pool já existente.
+        """
+        if cls.pool is not None:
+            yield cls.pool
+            return
+        if processes is None:
+            processes = int(Settings().processors)
+        cls.processes = max(1, processes)
+        cls.pool = Pool(processes=cls.processes)
+        try:
+            yield cls.pool
+            cls.pool.close()
+        except Exception:
+            cls.pool.terminate()
+            raise
+        finally:
+            cls.pool.join()
+            cls.pool = None
+            cls.processes = 1
+
+    @classmethod
+    def _chunksize(cls, num_tasks: int) -> int:
+        return max(
+            1, math.ceil(num_tasks / (cls.processes * cls.CHUNKS_PER_PROCESS))
+        )
+
+    @classmethod
+    def map(
+        cls, func: Callable, tasks: Dict[K, Tuple[Any, ...]]
+    ) -> Dict[K, Any]:
+        """
+        Executa uma função para cada conjunto de argumentos fornecido,
+        distribuindo as tarefas em lotes entre os processos do pool.
+        Os resultados são retornados com as mesmas chaves das tarefas.
+        """
+        if cls.pool is None:
+            with cls.start():
+                return cls.map(func, tasks)
+        keys = list(tasks.keys())
+        if len(keys) == 0:
+            return {}
+        chunksize = cls._chunksize(len(keys))
+        async_res = cls.pool.starmap_async(
+            func, [tasks[k] for k in keys], chunksize=chunksize
+        )
+        num_rounds = math.ceil(len(keys) / (cls.processes * chunksize))
+        results = async_res.get(timeout=cls.TIMEOUT * num_rounds)
+        return dict(zip(keys, results))
+
+    @classmethod
+    def imap(
+        cls, func: Callable, tasks: Dict[K, Tuple[Any, ...]]
+    ) -> Iterator[Tuple[K, Any]]:
+        """
+        Executa uma função para cada conjunto de argumentos fornecido,
+        fornecendo os resultados na ordem das tarefas à medida que
+        são concluídos, sem aguardar o término de todas as tarefas.
+
+        Somente um número limitado de tarefas é enviado aos processos
+        antes que os resultados sejam consumidos, limitando a memória
+        ocupada pelos resultados aguardando o consumo.
+        """
+        if cls.pool is None:
+            with cls.start():
+                yield from cls.imap(func, tasks)
+            return
+        max_pending = cls.processes * cls.PENDING_TASKS_PER_PROCESS
+        pending: Deque[Tuple[K, AsyncResult]] = deque()
+        for k, args in tasks.items():
+            pending.append((k, cls.pool.apply_async(func, args)))
+            if len(pending) >= max_pending:
+                key, result = pending.popleft()
+                yield key, result.get(timeout=cls.TIMEOUT)
+        while pending:
+            key, result = pending.popleft()
+            yield key, result.get(timeout=cls.TIMEOUT)
@@ -0,0 +1,45 @@
+from typing import List, Optional
+
+# Palavras-chave aceitas para selecionar os últimos elementos
+LAST_KEYWORD = "ultima"
+LAST_N_KEYWORD = "ultimas"
+
+
+def parse_selection(
+    spec: str, last: Optional[int] = None
+) -> Optional[List[int]]:
+    """
+    Interpreta uma seleção de índices fornecida como texto, composta
+    por itens separados por vírgula. Cada item pode ser um índice (`3`),
+    um intervalo fechado (`1-12`), o último índice (`ultima`) ou os
+    N últimos índices (`ultimas:5`). As palavras-chave dependem do
+    último índice existente, fornecido em `last`.
+
+    Retorna None quando a seleção é vazia, indicando que todos os
+    índices devem ser considerados.
+    """
+    if spec is None or len(spec.strip()) == 0:
+        return None
+    indices: List[int] = []
+    for item in spec.split(","):
+        item = item.strip().lower()
+        if item.startswith(LAST_KEYWORD):
+            if last is None:
+                raise ValueError(f"Seleção '{item}' exige o último índice")
+            if item == LAST_KEYWORD:
+                indices.append(last)
+                continue
+            keyword, _, count = item.partition(":")
+            if keyword != LAST_N_KEYWORD or not count.isdigit():
+                raise ValueError(f"Seleção inválida: '{item}'")
+            indices += list(range(max(last - int(count) + 1, 1), last + 1))
+        elif "-" in item:
+            first, _, end = item.partition("-")
+            if not (first.strip().isdigit() and end.strip().isdigit()):
+                raise ValueError(f"Seleção inválida: '{item}'")
+            indices += list(range(int(first), int(end) + 1))
+        elif item.isdigit():
+            indices.append(int(item))
+        else:
+            raise ValueError(f"Seleção inválida: '{item}'")
+    return sorted(set(indices))
@@ -0,0 +1,339 @@
+from typing import List, Optional
+
+import numpy as np  # type: ignore
+
+
+class QuantileSketch:
+    """
+    Resumo aproximado e combinável da distribuição dos valores de um
+    conjunto de grupos, com no máximo `size` pontos ponderados por grupo.
+    Enquanto o número de valores de um grupo não excede o tamanho do
+    resumo, os valores são mantidos integralmente e os quantis são
+    exatos. Ao exceder, os pontos são compactados em `size` pontos de
+    mesmo peso, e o erro máximo da posição dos pontos é acumulado.
+
+    A média e o desvio padrão são obtidos dos momentos combinados,
+    independentemente da compactação.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        weights: np.ndarray,
+        count: np.ndarray,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+        error: np.ndarray,
+        size: int,
+    ):
+        self.values = values
+        self.weights = weights
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+        self.error = error
+        self.size = size
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray, size: int) -> "QuantileSketch":
+        """
+        Constrói o resumo a partir de uma matriz (grupos, valores), com
+        os valores ausentes nulos.
+        """
+        sorted_values = np.sort(matrix, axis=1)
+        weights = (~np.isnan(sorted_values)).astype(np.float64)
+        count = weights.sum(axis=1)
+        nonempty = count > 0
+        safe_count = np.where(nonempty, count, 1.0)
+        mean = np.where(
+            nonempty,
+            np.where(weights > 0, sorted_values, 0.0).sum(axis=1) / safe_count,
+            np.nan,
+        )
+        m2 = np.where(
+            weights > 0, (sorted_values - mean[:, None]) ** 2, 0.0
+        ).sum(axis=1)
+        last = np.maximum(count.astype(np.int64) - 1, 0)
+        minimum = sorted_values[:, 0]
+        maximum = sorted_values[np.arange(len(count)), last]
+        sketch = cls(
+            sorted_values,
+            weights,
+            count,
+            mean,
+            m2,
+            minimum,
+            maximum,
+            np.zeros(len(count), dtype=np.float64),
+            size,
+        )
+        sketch._compress()
+        return sketch
+
+    @classmethod
+    def merge(cls, sketches: List["QuantileSketch"]) -> "QuantileSketch":
+        """
+        Combina resumos dos mesmos grupos, construídos a partir de
+        conjuntos de valores distintos. Os resumos são combinados aos
+        pares, em níveis, de modo que o erro acumulado cresça somente
+        com o logaritmo do número de resumos.
+        """
+        levels: List[Optional[QuantileSketch]] = []
+        for sketch in sketches:
+            level = 0
+            while level < len(levels) and levels[level] is not None:
+                sketch = levels[level]._combine(sketch)  # type: ignore
+                levels[level] = None
+                level += 1
+            if level == len(levels):
+                levels.append(None)
+            levels[level] = sketch
+        remaining = [s for s in levels if s is not None]
+        if len(remaining) == 0:
+            raise ValueError("Nenhum resumo fornecido para combinação")
+        merged = remaining[0]
+        for sketch in remaining[1:]:
+            merged = merged._combine(sketch)
+        return merged
+
+    @classmethod
+    def concat(cls, sketches: List["QuantileSketch"]) -> "QuantileSketch":
+        """
+        Reúne os grupos de resumos construídos para grupos distintos,
+        mantendo a ordem dos resumos fornecidos.
+        """
+        if len(sketches) == 0:
+            raise ValueError("Nenhum resumo fornecido para concatenação")
+        num_points = max([s.values.shape[1] for s in sketches])
+        padded = [s._padded(num_points) for s in sketches]
+        return cls(
+            np.concatenate([s.values for s in padded]),
+            np.concatenate([s.weights for s in padded]),
+            np.concatenate([s.count for s in sketches]),
+            np.concatenate([s.mean for s in sketches]),
+            np.concatenate([s.m2 for s in sketches]),
+            np.concatenate([s.minimum for s in sketches]),
+            np.concatenate([s.maximum for s in sketches]),
+            np.concatenate([s.error for s in sketches]),
+            sketches[0].size,
+        )
+
+    def take(self, groups: np.ndarray) -> "QuantileSketch":
+        """
+        Obtém o resumo de um subconjunto dos grupos, na ordem fornecida.
+        """
+        return QuantileSketch(
+            self.values[groups],
+            self.weights[groups],
+            self.count[groups],
+            self.mean[groups],
+            self.m2[groups],
+            self.minimum[groups],
+            self.maximum[groups],
+            self.error[groups],
+            self.size,
+        )
+
+    def _padded(self, num_points: int) -> "QuantileSketch":
+        """
+        Completa os pontos de todos os grupos com pontos nulos de peso
+        zero até o número de pontos fornecido.
+        """
+        missing = num_points - self.values.shape[1]
+        if missing <= 0:
+            return self
+        num_groups = self.values.shape[0]
+        return QuantileSketch(
+            np.concatenate(
+                [self.values, np.full((num_groups, missing), np.nan)], axis=1
+            ),
+            np.concatenate(
+                [self.weights, np.zeros((num_groups, missing))], axis=1
+            ),
+            self.count,
+            self.mean,
+            self.m2,
+            self.minimum,
+            self.maximum,
+            self.error,
+            self.size,
+        )
+
+    def _combine(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Combina dois resumos dos mesmos grupos, compactando os pontos
+        resultantes quando necessário.
+        """
+        if self.values.shape[0] != other.values.shape[0]:
+            raise ValueError("Resumos com números de grupos distintos")
+        values = np.concatenate([self.values, other.values], axis=1)
+        weights = np.concatenate([self.weights, other.weights], axis=1)
+        order = np.argsort(values, axis=1, kind="stable")
+        values = np.take_along_axis(values, order, axis=1)
+        weights = np.take_along_axis(weights, order, axis=1)
+        count = self.count + other.count
+        safe_count = np.where(count > 0, count, 1.0)
+        delta = np.nan_to_num(other.mean - self.mean)
+        mean = np.where(
+            other.count == 0,
+            self.mean,
+            np.where(
+                self.count == 0,
+                other.mean,
+                self.mean + delta * other.count / safe_count,
+            ),
+        )
+        m2 = (
+            self.m2
+            + other.m2
+            + delta**2 * self.count * other.count / safe_count
+        )
+        # A posição de um ponto no conjunto combinado depende da
+        # quantidade de valores do outro resumo que o antecedem,
+        # conhecida somente com a resolução dos pontos deste resumo
+        max_weight = np.maximum(
+            self.weights.max(axis=1, initial=0.0),
+            other.weights.max(axis=1, initial=0.0),
+        )
+        error = self.error + other.error
+        error = np.where(
+            (self.count > 0) & (other.count > 0), error + max_weight, error
+        )
+        sketch = QuantileSketch(
+            values,
+            weights,
+            count,
+            mean,
+            m2,
+            np.fmin(self.minimum, other.minimum),
+            np.fmax(self.maximum, other.maximum),
+            error,
+            self.size,
+        )
+        sketch._compress()
+        return sketch
+
+    def _compress(self):
+        """
+        Compacta os pontos dos grupos com mais pontos do que o tamanho
+        do resumo em `size` pontos de mesmo peso, escolhidos nas
+        posições centrais de intervalos de mesma quantidade de valores.
+        """
+        num_groups, num_points = self.values.shape
+        points = (self.weights > 0).sum(axis=1)
+        if num_points <= self.size:
+            return
+        if not (points > self.size).any():
+            self.values = self.values[:, : self.size]
+            self.weights = self.weights[:, : self.size]
+            return
+        compressed = points > self.size
+        cumulative = np.cumsum(self.weights, axis=1)
+        total = cumulative[:, -1]
+        safe_total = np.where(total > 0, total, 1.0)
+        offsets = 2.0 * np.arange(num_groups)
+        targets = (np.arange(self.size) + 0.5) / self.size
+        positions = (
+            np.searchsorted(
+                (cumulative / safe_total[:, None] + offsets[:, None]).ravel(),
+                (targets[None, :] + offsets[:, None]).ravel(),
+                side="left",
+            ).reshape(num_groups, self.size)
+            - (num_points * np.arange(num_groups))[:, None]
+        )
+        positions = np.minimum(positions, num_points - 1)
+        max_weight = self.weights.max(axis=1)
+        values = np.where(
+            compressed[:, None],
+            np.take_along_axis(self.values, positions, axis=1),
+            self.values[:, : self.size],
+        )
+        weights = np.where(
+            compressed[:, None],
+            (total / self.size)[:, None],
+            self.weights[:, : self.size],
+        )
+        self.error = np.where(
+            compressed, self.error + max_weight / 2, self.error
+        )
+        self.values = values
+        self.weights = weights
+
+    def quantiles(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Estima os quantis de cada grupo por interpolação linear entre as
+        posições centrais dos pontos, retornando uma matriz
+        (grupos, quantis). Os quantis 0 e 1 são sempre exatos.
+        """
+        num_groups, num_points = self.values.shape
+        cumulative = np.cumsum(self.weights, axis=1)
+        centers = cumulative - self.weights / 2
+        points = (self.weights > 0).sum(axis=1)
+        count = self.count
+        safe_count = np.where(count > 0, count, 1.0)
+        targets = quantiles[None, :] * (count[:, None] - 1) + 0.5
+        # Os grupos são deslocados para que as posições de todos
+        # os grupos sejam buscadas de uma única vez
+        offsets = 2.0 * np.arange(num_groups)
+        normalized = np.where(
+            self.weights > 0, centers / safe_count[:, None], 1.0
+        )
+        positions = (
+            np.searchsorted(
+                (normalized + offsets[:, None]).ravel(),
+                (targets / safe_count[:, None] + offsets[:, None]).ravel(),
+                side="right",
+            ).reshape(num_groups, len(quantiles))
+            - 1
+        )
+        positions -= (num_points * np.arange(num_groups))[:, None]
+        last = np.maximum(points - 2, 0)[:, None]
+        positions = np.clip(positions, 0, last)
+        following = np.minimum(positions + 1, num_points - 1)
+        value = np.take_along_axis(self.values, positions, axis=1)
+        next_value = np.take_along_axis(self.values, following, axis=1)
+        center = np.take_along_axis(centers, positions, axis=1)
+        next_center = np.take_along_axis(centers, following, axis=1)
+        span = next_center - center
+        frac = np.clip(
+            np.divide(
+                targets - center,
+                span,
+                out=np.zeros_like(targets),
+                where=span > 0,
+            ),
+            0.0,
+            1.0,
+        )
+        result = np.where(
+            (points > 1)[:, None], value + (next_value - value) * frac, value
+        )
+        result = np.where(
+            quantiles[None, :] == 0, self.minimum[:, None], result
+        )
+        result = np.where(
+            quantiles[None, :] == 1, self.maximum[:, None], result
+        )
+        result[count == 0] = np.nan
+        return result
+
+    def std(self) -> np.ndarray:
+        """
+        Desvio padrão amostral de cada grupo.
+        """
+        safe_dof = np.where(self.count > 1, self.count - 1, 1.0)
+        return np.where(self.count > 1, np.sqrt(self.m2 / safe_dof), np.nan)
+
+    def rank_error(self) -> np.ndarray:
+        """
+        Limite do erro da posição dos quantis estimados de cada grupo,
+        como fração do número de valores do grupo. A interpolação entre
+        pontos compactados acrescenta até a metade do peso de um ponto.
+        """
+        safe_count = np.where(self.count > 0, self.count, 1.0)
+        interpolation = np.where(self.error > 0, self.count / self.size, 0.0)
+        return np.minimum((self.error + interpolation / 2) / safe_count, 1.0)
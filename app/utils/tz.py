@@ -2,6 +2,12 @@ import pandas as pd  # type: ignore
 
 
 def enforce_utc(df: pd.DataFrame) -> pd.DataFrame:
-    for col in df.select_dtypes(include=["datetime64[ns]"]).columns:
+    cols = df.select_dtypes(include=["datetime64[ns]"]).columns
+    if len(cols) == 0:
+        return df
+    # A conversão é feita em uma cópia, pois os dados podem estar sendo
+    # lidos por outras threads durante a exportação
+    df = df.copy(deep=False)
+    for col in cols:
         df[col] = df[col].dt.tz_localize(tz="UTC")
     return df
@@ -0,0 +1,219 @@
+import logging
+from contextlib import contextmanager
+from logging import ERROR
+from queue import Queue
+from threading import Condition, Thread
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+import pandas as pd  # type: ignore
+
+from app.model.settings import Settings
+
+T = TypeVar("T")
+
+
+class ExportWriter:
+    """
+    Escritor de sínteses em segundo plano, que permite que a resolução
+    das próximas variáveis seja realizada enquanto os dados já
+    resolvidos são codificados e escritos. As escritas são realizadas
+    por threads, visto que a pyarrow libera o GIL durante a codificação
+    e a compressão dos arquivos.
+
+    Cada execução de síntese possui o seu próprio escritor, de modo que
+    sínteses executadas em paralelo não compartilham as threads, a
+    memória disponível nem os erros das escritas.
+    """
+
+    def __init__(
+        self, threads: Optional[int] = None, budget: Optional[int] = None
+    ):
+        if threads is None:
+            threads = int(Settings().export_threads)
+        if budget is None:
+            budget = int(Settings().export_memory_budget) * 1024 * 1024
+        self.num_threads = threads
+        self.queue: Optional[Queue] = None
+        self.threads: List[Thread] = []
+
+        # Memória máxima, em bytes, ocupada pelos dados aguardando
+        # escrita. Ao ser atingida, o envio de novos dados é bloqueado
+        # até que as escritas pendentes sejam concluídas.
+        self.budget = budget
+        self.pending_bytes = 0
+        self.condition = Condition()
+
+        # Erros das escritas que falharam, por chave da síntese
+        self.errors: Dict[str, Exception] = {}
+
+        # Escritas pendentes e ações a serem executadas quando todas
+        # as escritas de uma síntese forem concluídas, por chave
+        self.pending_writes: Dict[str, int] = {}
+        self.callbacks: Dict[str, Callable[[], None]] = {}
+
+    @contextmanager
+    def start(self) -> Iterator["ExportWriter"]:
+        """
+        Inicia as threads de escrita, caso o escritor não esteja ativo,
+        e as encerra ao final do contexto, após a conclusão das escritas
+        pendentes. Sem threads de escrita, as escritas são síncronas.
+        """
+        if self.queue is not None or self.num_threads <= 0:
+            yield self
+            return
+        self.errors.clear()
+        queue: Queue = Queue()
+        self.queue = queue
+        self.threads = [
+            Thread(target=self._drain, args=(queue,), daemon=True)
+            for _ in range(self.num_threads)
+        ]
+        for t in self.threads:
+            t.start()
+        try:
+            yield self
+        finally:
+            for _ in self.threads:
+                queue.put(None)
+            for t in self.threads:
+                t.join()
+            self.queue = None
+            self.threads = []
+            self.pending_bytes = 0
+            self.pending_writes.clear()
+            self.callbacks.clear()
+
+    def _drain(self, queue: Queue):
+        """
+        Executa as escritas enviadas para a fila até receber o
+        sinal de encerramento.
+        """
+        while True:
+            task = queue.get()
+            if task is None:
+                queue.task_done()
+                return
+            key, func, args, size = task
+            try:
+                func(*args)
+            except Exception as e:
+                with self.condition:
+                    self.errors[key] = e
+            finally:
+                with self.condition:
+                    self.pending_bytes -= size
+                    callback = self._complete(key)
+                    self.condition.notify_all()
+                if callback is not None:
+                    self._run_callback(key, callback)
+                queue.task_done()
+
+    def _complete(self, key: str) -> Optional[Callable[[], None]]:
+        """
+        Contabiliza a conclusão de uma escrita de uma síntese, retornando
+        a ação associada à síntese caso todas as suas escritas tenham
+        sido concluídas sem erros.
+        """
+        self.pending_writes[key] -= 1
+        if self.pending_writes[key] > 0:
+            return None
+        self.pending_writes.pop(key)
+        callback = self.callbacks.pop(key, None)
+        if key in self.errors:
+            return None
+        return callback
+
+    def _run_callback(self, key: str, callback: Callable[[], None]):
+        """
+        Executa a ação associada a uma síntese, registrando o seu erro
+        como um erro da exportação da síntese.
+        """
+        try:
+            callback()
+        except Exception as e:
+            with self.condition:
+                self.errors[key] = e
+
+    @staticmethod
+    def _size(args: tuple) -> int:
+        return sum(
+            int(a.memory_usage(index=True, deep=False).sum())
+            for a in args
+            if isinstance(a, pd.DataFrame)
+        )
+
+    def submit(self, key: str, func: Callable, *args: Any):
+        """
+        Envia uma escrita para as threads de escrita, bloqueando enquanto
+        os dados pendentes excederem a memória disponível. Sem um escritor
+        ativo, a escrita é realizada imediatamente e seus erros são
+        propagados.
+        """
+        queue = self.queue
+        if queue is None:
+            func(*args)
+            return
+        size = self._size(args)
+        with self.condition:
+            # Uma escrita maior do que a memória disponível é aceita
+            # somente quando não existem outras pendentes
+            while (
+                self.pending_bytes > 0
+                and self.pending_bytes + size > self.budget
+            ):
+                self.condition.wait()
+            self.pending_bytes += size
+            self.pending_writes[key] = self.pending_writes.get(key, 0) + 1
+        queue.put((key, func, args, size))
+
+    def on_complete(self, key: str, callback: Callable[[], None]):
+        """
+        Executa uma ação assim que todas as escritas já enviadas para uma
+        síntese forem concluídas, sem aguardar as escritas das demais.
+        A ação não é executada caso alguma das escritas tenha falhado.
+        """
+        with self.condition:
+            if self.pending_writes.get(key, 0) > 0:
+                self.callbacks[key] = callback
+                return
+            if key in self.errors:
+                return
+        self._run_callback(key, callback)
+
+    def wait(self) -> Dict[str, Exception]:
+        """
+        Aguarda a conclusão das escritas pendentes, retornando os erros
+        das escritas que falharam desde a última espera.
+        """
+        if self.queue is not None:
+            self.queue.join()
+        with self.condition:
+            errors = dict(self.errors)
+            self.errors.clear()
+        return errors
+
+    def wait_export(
+        self,
+        success_synthesis: List[T],
+        logger: Optional[logging.Logger] = None,
+    ) -> List[T]:
+        """
+        Aguarda a conclusão das escritas pendentes, descartando as
+        sínteses cuja exportação falhou.
+        """
+        failed = self.wait()
+        if logger is not None:
+            for s, e in failed.items():
+                logger.log(ERROR, str(e))
+                logger.log(
+                    ERROR, f"Nao foi possível exportar a sintese de: {s}"
+                )
+        return [s for s in success_synthesis if str(s) not in failed]
@@ -1,8 +1,11 @@
 from unittest.mock import patch
 
 import pandas as pd
+import pyarrow.parquet as pq
+import pytest
 
 from app.adapters.repository.export import factory
+from app.model.settings import Settings
 from tests.conftest import DECK_TEST_DIR
 
 
@@ -16,3 +19,168 @@ def test_export_parquet(test_settings):
     repo = factory("PARQUET", DECK_TEST_DIR)
     with patch("pandas.DataFrame.to_parquet"):
         repo.synthetize_df(pd.DataFrame(), "CMO_SBM_EST")
+
+
+def test_export_parquet_partes(tmp_path):
+    repo = factory("PARQUET", str(tmp_path))
+    dfs = [
+        pd.DataFrame({"codigo_usina": [1, 1], "valor": [1.0, 2.0]}),
+        pd.DataFrame({"codigo_usina": [2, 2], "valor": [3.0, 4.0]}),
+    ]
+    assert repo.synthetize_dfs(iter(dfs), "QTUR_UHE")
+    pd.testing.assert_frame_equal(
+        repo.read_df("QTUR_UHE"), pd.concat(dfs, ignore_index=True)
+    )
+    assert not repo.synthetize_dfs(iter([]), "VTUR_UHE")
+    assert repo.read_df("VTUR_UHE") is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["QTUR_UHE.parquet"]
+
+
+def test_export_parquet_leiaute(tmp_path):
+    settings = Settings()
+    original = (
+        settings.parquet_compression,
+        settings.parquet_compression_level,
+        settings.parquet_row_group_size,
+        settings.parquet_statistics,
+        settings.parquet_page_index,
+        settings.parquet_dictionary,
+    )
+    try:
+        settings.parquet_compression = "ZSTD"
+        settings.parquet_compression_level = "3"
+        settings.parquet_row_group_size = "2"
+        settings.parquet_statistics = True
+        settings.parquet_page_index = True
+        settings.parquet_dictionary = "CODIGOS"
+        repo = factory("PARQUET", str(tmp_path))
+        df = pd.DataFrame(
+            {
+                "codigo_usina": [1, 1, 2, 2, 3],
+                "cenario": [1, 2, 1, 2, 1],
+                "valor": [1.0, 2.0, 3.0, 4.0, 5.0],
+            }
+        )
+        assert repo.synthetize_df(df, "QTUR_UHE")
+        metadata = pq.ParquetFile(tmp_path / "QTUR_UHE.parquet").metadata
+        assert metadata.num_row_groups == 3
+        columns = metadata.row_group(0)
+        assert columns.column(0).compression == "ZSTD"
+        assert columns.column(0).statistics.has_min_max
+        assert columns.column(0).statistics.max == 1
+        assert "RLE_DICTIONARY" in columns.column(0).encodings
+        assert "RLE_DICTIONARY" in columns.column(1).encodings
+        assert "RLE_DICTIONARY" not in columns.column(2).encodings
+        pd.testing.assert_frame_equal(repo.read_df("QTUR_UHE"), df)
+    finally:
+        (
+            settings.parquet_compression,
+            settings.parquet_compression_level,
+            settings.parquet_row_group_size,
+            settings.parquet_statistics,
+            settings.parquet_page_index,
+            settings.parquet_dictionary,
+        ) = original
+
+
+def test_export_parquet_nivel_compressao(tmp_path):
+    settings = Settings()
+    original = (
+        settings.parquet_compression,
+        settings.parquet_compression_level,
+    )
+    df = pd.DataFrame({"codigo_usina": [1, 2], "valor": [1.0, 2.0]})
+    try:
+        settings.parquet_compression = "GZIP"
+        settings.parquet_compression_level = "5"
+        repo = factory("PARQUET", str(tmp_path))
+        assert repo.synthetize_df(df, "QTUR_UHE")
+        metadata = pq.ParquetFile(tmp_path / "QTUR_UHE.parquet").metadata
+        assert metadata.row_group(0).column(0).compression == "GZIP"
+        settings.parquet_compression = "SNAPPY"
+        settings.parquet_compression_level = ""
+        repo = factory("PARQUET", str(tmp_path))
+        assert repo.synthetize_df(df, "QTUR_UHE")
+        settings.parquet_compression_level = "3"
+        with pytest.raises(ValueError):
+            factory("PARQUET", str(tmp_path))
+    finally:
+        (
+            settings.parquet_compression,
+            settings.parquet_compression_level,
+        ) = original
+
+
+def test_export_parquet_particionado(tmp_path):
+    settings = Settings()
+    original = settings.parquet_stage_block
+    try:
+        settings.parquet_stage_block = "2"
+        repo = factory("PARQUET_PARTICIONADO", str(tmp_path))
+        df = pd.DataFrame(
+            {
+                "codigo_usina": [1, 1, 1, 2, 2, 2],
+                "estagio": [1, 2, 3, 1, 2, 3],
+                "valor": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            }
+        )
+        assert repo.synthetize_dfs(iter([df[:3], df[3:]]), "VARMF_UHE")
+        assert repo.synthetize_df(df, "QINC_UHE_FOR")
+        assert repo.synthetize_df(df, "ESTATISTICAS_OPERACAO_UHE")
+        root = tmp_path / "operacao" / "variavel=VARMF" / "agregacao=UHE"
+        assert sorted(p.name for p in root.iterdir()) == [
+            "_common_metadata",
+            "_metadata",
+            "estagio_bloco=1",
+            "estagio_bloco=2",
+        ]
+        assert pq.read_metadata(root / "_metadata").num_rows == 6
+        assert (
+            tmp_path
+            / "cenarios"
+            / "variavel=QINC"
+            / "agregacao=UHE"
+            / "etapa=FOR"
+            / "_metadata"
+        ).is_file()
+        assert (tmp_path / "ESTATISTICAS_OPERACAO_UHE.parquet").is_file()
+        pd.testing.assert_frame_equal(
+            repo.read_df("VARMF_UHE")
+            .sort_values(["codigo_usina", "estagio"])
+            .reset_index(drop=True),
+            df,
+        )
+        assert repo.read_df("VTUR_UHE") is None
+    finally:
+        settings.parquet_stage_block = original
+
+
+@pytest.mark.parametrize("formato", ["PARQUET", "CSV"])
+def test_export_fragmentos(tmp_path, formato):
+    repo = factory(formato, str(tmp_path))
+    repo.synthetize_df(
+        pd.DataFrame({"variavel": ["A", "B"], "valor": [1.0, 2.0]}),
+        "ESTATISTICAS_OPERACAO_UHE",
+    )
+    assert repo.read_keys("ESTATISTICAS_OPERACAO_UHE", "variavel") == [
+        "A",
+        "B",
+    ]
+    assert repo.upsert_df(
+        pd.DataFrame({"variavel": ["C", "B", "B"], "valor": [5.0, 3.0, 4.0]}),
+        "ESTATISTICAS_OPERACAO_UHE",
+        "variavel",
+    )
+    assert repo.read_keys("ESTATISTICAS_OPERACAO_UHE", "variavel") == [
+        "A",
+        "B",
+        "C",
+    ]
+    assert repo.compact("ESTATISTICAS_OPERACAO_UHE")
+    pd.testing.assert_frame_equal(
+        repo.read_df("ESTATISTICAS_OPERACAO_UHE"),
+        pd.DataFrame(
+            {"variavel": ["A", "B", "B", "C"], "valor": [1.0, 3.0, 4.0, 5.0]}
+        ),
+    )
+    assert not repo.compact("METADADOS_OPERACAO")
@@ -1,10 +1,27 @@
+from os.path import join
+from unittest.mock import PropertyMock, patch
+
+import numpy as np
 import pandas as pd
+from inewave.newave import (
+    Enavazb,
+    Enavazf,
+    Energiab,
+    Energiaf,
+    Energias,
+    Vazaob,
+    Vazaof,
+)
+from inewave.newave.modelos.energias import SecaoDadosEnergias
+from inewave.nwlistop import Ghidr, Gtert, Pivarm
 
 from app.adapters.repository.files import factory
 from app.model.operation import (
     spatialresolution as operationspatialresolution,
 )
 from app.model.operation import variable as operationvariable
+from app.model.scenario.scenariofile import ScenarioFile
+from app.model.settings import Settings
 from tests.conftest import DECK_TEST_DIR
 
 
@@ -860,3 +877,239 @@ def test_get_nwlistop(test_settings):
         ),
         pd.DataFrame,
     )
+
+
+def test_get_nwlistop_files(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    files = repo.get_nwlistop_files(
+        operationvariable.Variable.CUSTO_MARGINAL_OPERACAO,
+        operationspatialresolution.SpatialResolution.SUBMERCADO,
+    )
+    assert join(DECK_TEST_DIR, "cmarg001.out") in files
+    assert join(DECK_TEST_DIR, "cmarg001-med.out") in files
+
+
+def test_get_deck_files(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    files = repo.get_deck_files()
+    assert join(DECK_TEST_DIR, "caso.dat") in files
+    assert join(DECK_TEST_DIR, "dger.dat") in files
+
+
+def test_get_deck_files_nomes_vazios(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    with patch(
+        "inewave.newave.arquivos.Arquivos.arquivos",
+        new_callable=PropertyMock,
+        return_value=pd.Series(["dger.dat", np.nan, None]),
+    ):
+        files = repo.get_deck_files()
+    assert join(DECK_TEST_DIR, "dger.dat") in files
+    assert all(isinstance(f, str) for f in files)
+
+
+def test_get_nwlistop_inventory(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    inventory = repo.get_nwlistop_inventory(
+        operationvariable.Variable.CUSTO_MARGINAL_OPERACAO,
+        operationspatialresolution.SpatialResolution.SUBMERCADO,
+    )
+    assert list(inventory.keys()) == [(1,), (2,), (3,), (4,)]
+    assert [f.path for f in inventory[(1,)]] == [
+        join(DECK_TEST_DIR, "cmarg001-med.out"),
+        join(DECK_TEST_DIR, "cmarg001.out"),
+    ]
+    inventory = repo.get_nwlistop_inventory(
+        operationvariable.Variable.INTERCAMBIO,
+        operationspatialresolution.SpatialResolution.PAR_SUBMERCADOS,
+    )
+    assert (1, 2) in inventory
+    inventory = repo.get_nwlistop_inventory(
+        operationvariable.Variable.CUSTO_OPERACAO,
+        operationspatialresolution.SpatialResolution.SISTEMA_INTERLIGADO,
+    )
+    assert list(inventory.keys()) == [()]
+    inventory = repo.get_nwlistop_inventory(
+        operationvariable.Variable.GERACAO_EOLICA,
+        operationspatialresolution.SpatialResolution.PARQUE_EOLICO_EQUIVALENTE,
+    )
+    assert inventory == {}
+
+
+def test_get_nwlistop_inventario_regras(test_settings):
+    # Os padrões dos nomes dos arquivos devem corresponder aos arquivos
+    # lidos pelas regras de leitura de cada entidade
+    repo = factory("FS", DECK_TEST_DIR)
+    regras = repo._RawFilesRepository__regras
+    for (v, s), regra in regras.items():
+        inventory = repo.get_nwlistop_inventory(v, s)
+        assert inventory is not None
+        for entity, files in inventory.items():
+            paths = []
+            args = (entity,) if len(entity) > 1 else entity
+            try:
+                regra(
+                    lambda reader, path: paths.append(path),
+                    DECK_TEST_DIR,
+                    *(args if args else ("",)),
+                )
+            except Exception:
+                pass
+            assert sorted(paths) == sorted([f.path for f in files])
+
+
+def test_get_nwlistop_leitor_vetorizado(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    settings = Settings()
+    parser = settings.nwlistop_parser
+    try:
+        for v in operationvariable.Variable:
+            for s in operationspatialresolution.SpatialResolution:
+                inventory = repo.get_nwlistop_inventory(v, s)
+                if not inventory:
+                    continue
+                for entity in list(inventory.keys())[:1]:
+                    args = entity if entity else ("",)
+                    settings.nwlistop_parser = "INEWAVE"
+                    df_inewave = repo.get_nwlistop(v, s, *args)
+                    settings.nwlistop_parser = "VETORIZADO"
+                    df_vetorizado = repo.get_nwlistop(v, s, *args)
+                    if df_inewave is None:
+                        assert df_vetorizado is None
+                    else:
+                        pd.testing.assert_frame_equal(
+                            df_inewave, df_vetorizado
+                        )
+        # Os arquivos com leiaute reconhecido não são lidos pela inewave
+        with patch.object(Pivarm, "read", side_effect=RuntimeError):
+            df = repo.get_nwlistop(
+                operationvariable.Variable.VALOR_AGUA,
+                operationspatialresolution.SpatialResolution.USINA_HIDROELETRICA,
+                1,
+            )
+        assert isinstance(df, pd.DataFrame)
+        assert df.shape[0] > 0
+        # Patamares não numéricos, como o TOTAL, também são reconhecidos
+        with patch.object(Ghidr, "read", side_effect=RuntimeError):
+            df = repo.get_nwlistop(
+                operationvariable.Variable.GERACAO_HIDRAULICA_RESERVATORIO,
+                operationspatialresolution.SpatialResolution.RESERVATORIO_EQUIVALENTE,
+                1,
+            )
+        assert isinstance(df, pd.DataFrame)
+        assert 0 in df["patamar"].unique()
+        # Tabelas com outras colunas no cabeçalho são lidas pela inewave
+        with patch.object(Gtert, "read", side_effect=RuntimeError):
+            df = repo.get_nwlistop(
+                operationvariable.Variable.GERACAO_TERMICA,
+                operationspatialresolution.SpatialResolution.USINA_TERMELETRICA,
+                1,
+            )
+        assert df is None
+    finally:
+        settings.nwlistop_parser = parser
+
+
+def test_get_nwlistop_cache_nwlistop(test_settings, tmp_path):
+    repo = factory("FS", DECK_TEST_DIR)
+    settings = Settings()
+    cache, synthesis_dir = settings.nwlistop_cache, settings.synthesis_dir
+    settings.nwlistop_cache = True
+    settings.synthesis_dir = str(tmp_path)
+    try:
+        df = repo.get_nwlistop(
+            operationvariable.Variable.VALOR_AGUA,
+            operationspatialresolution.SpatialResolution.USINA_HIDROELETRICA,
+            1,
+        )
+        assert len(list((tmp_path / "cache_nwlistop").glob("*.arrow"))) == 1
+        # A tabela armazenada é lida sem a leitura do arquivo de texto
+        with patch.object(Pivarm, "read", side_effect=RuntimeError):
+            df_cache = repo.get_nwlistop(
+                operationvariable.Variable.VALOR_AGUA,
+                operationspatialresolution.SpatialResolution.USINA_HIDROELETRICA,
+                1,
+            )
+        pd.testing.assert_frame_equal(df, df_cache)
+    finally:
+        settings.nwlistop_cache = cache
+        settings.synthesis_dir = synthesis_dir
+
+
+def test_get_cenarios_mapeados(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    leitores = {
+        "energiaf": (repo.get_energiaf, Energiaf),
+        "enavazf": (repo.get_enavazf, Enavazf),
+        "vazaof": (repo.get_vazaof, Vazaof),
+        "energiab": (repo.get_energiab, Energiab),
+        "enavazb": (repo.get_enavazb, Enavazb),
+        "vazaob": (repo.get_vazaob, Vazaob),
+    }
+    for nome, (get, leitor) in leitores.items():
+        arq = get(1)
+        num_estagios, num_entidades, num_series = arq.values.shape[:3]
+        num_estagios_th = 1 - arq.first_stage
+        caminho = join(DECK_TEST_DIR, f"{nome}.dat")
+        if arq.values.ndim == 4:
+            df_inewave = leitor.read(
+                caminho,
+                num_series,
+                arq.values.shape[3],
+                num_entidades,
+                num_estagios,
+            ).series
+        else:
+            df_inewave = leitor.read(
+                caminho,
+                num_series,
+                num_entidades,
+                num_estagios - num_estagios_th,
+                num_estagios_th,
+            ).series
+        pd.testing.assert_frame_equal(
+            arq.series, df_inewave, check_dtype=False
+        )
+        # A conversão de um intervalo de estágios equivale ao filtro
+        # da tabela completa
+        df_intervalo = arq.to_dataframe(2, 3)
+        pd.testing.assert_frame_equal(
+            df_intervalo,
+            df_inewave.loc[df_inewave["estagio"].between(2, 3)].reset_index(
+                drop=True
+            ),
+            check_dtype=False,
+        )
+
+
+def test_cenarios_simulacao_final_mapeados(tmp_path):
+    num_series, num_rees, num_estagios, num_estagios_th = 3, 2, 4, 2
+    tamanho_estagio = num_series * num_rees
+    tamanho_registro = SecaoDadosEnergias.TAMANHO_REGISTRO
+    valores = np.random.default_rng(0).random(
+        (num_estagios + num_estagios_th, tamanho_registro)
+    )
+    caminho = str(tmp_path / "energias.dat")
+    valores.tofile(caminho)
+    arq = ScenarioFile(
+        caminho,
+        "ree",
+        num_estagios,
+        num_estagios_th,
+        num_rees,
+        num_series,
+        record_size=tamanho_registro,
+    )
+    df_inewave = Energias.read(
+        caminho, num_series, num_rees, num_estagios, num_estagios_th
+    ).series
+    pd.testing.assert_frame_equal(arq.series, df_inewave, check_dtype=False)
+    assert arq.values.shape == (
+        num_estagios + num_estagios_th,
+        num_rees,
+        num_series,
+    )
+    np.testing.assert_array_equal(
+        arq.values.reshape(num_estagios + num_estagios_th, -1),
+        valores[:, :tamanho_estagio],
+    )
@@ -1,16 +1,25 @@
 from datetime import datetime
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from app.internal.constants import (
+    EER_CODE_COL,
+    FOLLOWING_HYDRO_COL,
+    HYDRO_CODE_COL,
     LOWER_BOUND_COL,
+    PANDAS_GROUPING_ENGINE,
     START_DATE_COL,
+    SUBMARKET_CODE_COL,
     UPPER_BOUND_COL,
     VALUE_COL,
 )
+from app.model.settings import Settings
+from app.services.deck.aggregation import SpatialAggregation
 from app.services.deck.deck import Deck
-from app.services.unitofwork import factory
+from app.services.unitofwork import FSUnitOfWork, factory
 from tests.conftest import DECK_TEST_DIR, q
 
 uow = factory("FS", DECK_TEST_DIR, q)
@@ -430,3 +439,128 @@ def test_eer_submarket_map(test_settings):
 def test_thermal_submarket_map(test_settings):
     val = deck.thermal_submarket_map(uow)
     assert val.shape == (126, 3)
+
+
+def test_deck_data_persistent_cache(test_settings, tmp_path):
+    settings = Settings()
+    deck_data_cache = settings.deck_data_cache
+    settings.deck_data_cache = True
+    try:
+        with patch.object(
+            FSUnitOfWork,
+            "cache_dir",
+            new_callable=PropertyMock,
+            return_value=str(tmp_path),
+        ):
+            Deck.clear_cache()
+            hidr = Deck.hidr(uow)
+            assert len(list(tmp_path.glob("hidr.*.pkl"))) == 1
+            Deck.clear_cache()
+            m = MagicMock()
+            with patch.object(Deck, "_get_hidr", new=m):
+                cached_hidr = Deck.hidr(uow)
+            m.assert_not_called()
+            pd.testing.assert_frame_equal(hidr, cached_hidr)
+    finally:
+        settings.deck_data_cache = deck_data_cache
+        Deck.clear_cache()
+
+
+def test_prewarm(test_settings):
+    Deck.clear_cache()
+
+    def _falha(uow):
+        raise ValueError()
+
+    num_prewarmed = Deck.prewarm(
+        [Deck.block_lengths, Deck.num_blocks, _falha], uow
+    )
+    assert num_prewarmed == 2
+    assert "block_lengths" in Deck.DECK_DATA_CACHING
+    assert "num_blocks" in Deck.DECK_DATA_CACHING
+
+
+def test_scenario_iterations(test_settings):
+    settings = Settings()
+    scenario_iterations = settings.scenario_iterations
+    num_iterations = Deck.num_iterations(uow)
+    try:
+        settings.scenario_iterations = ""
+        assert Deck.scenario_iterations(uow) == list(
+            range(1, num_iterations + 1)
+        )
+        settings.scenario_iterations = "ultima"
+        assert Deck.scenario_iterations(uow) == [num_iterations]
+        settings.scenario_iterations = "ultimas:2"
+        assert Deck.scenario_iterations(uow) == [
+            num_iterations - 1,
+            num_iterations,
+        ]
+        # Iterações inexistentes são descartadas
+        settings.scenario_iterations = f"1,{num_iterations + 1}"
+        assert Deck.scenario_iterations(uow) == [1]
+    finally:
+        settings.scenario_iterations = scenario_iterations
+
+
+def test_spatial_aggregation(test_settings):
+    hydros_df = Deck.hydro_eer_submarket_map(uow).reset_index()
+    rng = np.random.default_rng(0)
+    df = hydros_df.merge(
+        pd.DataFrame({"estagio": [1, 2, 3]}), how="cross"
+    ).merge(pd.DataFrame({"cenario": [1, 2, 3, 4]}), how="cross")
+    df = df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+    df[VALUE_COL] = rng.normal(size=df.shape[0])
+    df.loc[df.index % 7 == 0, VALUE_COL] = np.nan
+    entity_columns = [
+        [EER_CODE_COL, SUBMARKET_CODE_COL],
+        [SUBMARKET_CODE_COL],
+        [],
+    ]
+    for columns in entity_columns:
+        for engine, sort in [(PANDAS_GROUPING_ENGINE, False), ("cython", True)]:
+            grouped_df = SpatialAggregation.aggregate(
+                df,
+                [HYDRO_CODE_COL, EER_CODE_COL, SUBMARKET_CODE_COL],
+                columns,
+                ["estagio", "cenario"],
+                [VALUE_COL],
+                uow,
+                engine=engine,
+                sort=sort,
+            )
+            expected_df = (
+                df.groupby(columns + ["estagio", "cenario"], sort=sort)[
+                    [VALUE_COL]
+                ]
+                .sum(engine=engine)
+                .reset_index()
+            )
+            pd.testing.assert_frame_equal(
+                grouped_df, expected_df, check_exact=True
+            )
+    with pytest.raises(ValueError):
+        SpatialAggregation.aggregate(
+            df,
+            [EER_CODE_COL, SUBMARKET_CODE_COL],
+            [SUBMARKET_CODE_COL],
+            ["estagio", "cenario"],
+            [VALUE_COL],
+            uow,
+            engine=PANDAS_GROUPING_ENGINE,
+        )
+
+
+def test_hydro_cascade(test_settings):
+    hydros = Deck.hydros(uow)
+    cascade = Deck.hydro_cascade(uow)
+    productivity = np.arange(1.0, 2 * cascade.num_nodes + 1).reshape(-1, 2)
+    accumulated = cascade.accumulate(productivity)
+    for i, code in enumerate(cascade.codes):
+        expected = productivity[i].copy()
+        downstream = hydros.at[code, FOLLOWING_HYDRO_COL]
+        while downstream != 0:
+            j = cascade.index_of(np.array([downstream]))[0]
+            expected += productivity[j]
+            downstream = hydros.at[downstream, FOLLOWING_HYDRO_COL]
+        assert np.array_equal(accumulated[i], expected)
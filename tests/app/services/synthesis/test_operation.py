@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pandas as pd
+import pytest
 from inewave.newave import Confhd, Patamar, Ree
 from inewave.nwlistop import (
     Cdef,
@@ -100,12 +101,26 @@ from inewave.nwlistop import (
 
 from app.internal.constants import (
     HM3_M3S_MONTHLY_FACTOR,
+    OPERATION_SYNTHESIS_MANIFEST_OUTPUT,
     OPERATION_SYNTHESIS_METADATA_OUTPUT,
+    QUANTILES_FOR_STATISTICS,
 )
 from app.model.operation.operationsynthesis import UNITS, OperationSynthesis
+from app.model.operation.spatialresolution import SpatialResolution
+from app.model.operation.synthesistensor import SynthesisTensor
+from app.model.settings import Settings
 from app.services.deck.bounds import OperationVariableBounds
 from app.services.synthesis.operation import OperationSynthetizer
 from app.services.unitofwork import factory
+from app.utils.graph import Cascade
+from app.utils.operations import (
+    KERNELS_PANDAS_VERSIONS,
+    USE_GROUPING_KERNELS,
+    _calc_mean_std,
+    _calc_quantiles,
+    calc_statistics,
+    sum_by_labels,
+)
 from tests.conftest import DECK_TEST_DIR, q
 
 uow = factory("FS", DECK_TEST_DIR, q)
@@ -466,6 +481,68 @@ def test_sintese_earmf_uhe(test_settings):
     __valida_metadata(synthesis_str, df_meta, True)
 
 
+def test_sintese_earmf_uhe_cascata(test_settings):
+    # Encadeia todas as UHEs do caso, de modo que cada UHE possua
+    # como usina a jusante a UHE seguinte da lista
+    uhes = [1, 6, 47, 49, 57, 66, 73, 74, 76, 83, 86, 88, 131, 156, 169]
+    uhes += [172, 204, 229, 249, 251, 257, 272, 275, 276, 277, 285, 287]
+    uhes += [288, 309, 310, 314]
+    cascata = Cascade(np.array(uhes), np.array(uhes[1:] + [0]))
+    m = MagicMock(lambda df, filename: df)
+    with (
+        patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ),
+        patch(
+            "app.services.deck.deck.Deck.hydro_cascade",
+            new=MagicMock(return_value=cascata),
+        ),
+    ):
+        OperationSynthetizer.synthetize(
+            ["EARMF_UHE", "VARMF_UHE", "HLIQ_UHE"], uow
+        )
+        OperationSynthetizer.clear_cache()
+    df = __obtem_dados_sintese_mock("EARMF_UHE", m)
+    df_varm = __obtem_dados_sintese_mock("VARMF_UHE", m)
+    df_hliq = __obtem_dados_sintese_mock("HLIQ_UHE", m)
+    assert sorted(df_hliq["codigo_usina"].unique()) == uhes
+
+    with uow:
+        df_hidr = uow.files.get_hidr().cadastro
+    # Produtividade de cada UHE e a acumulada a partir do mar
+    colunas = ["codigo_usina", "estagio", "cenario", "patamar"]
+    df_prodt = df_hliq.pivot_table(
+        index="codigo_usina", columns=colunas[1:], values="valor"
+    ).loc[uhes]
+    df_prodt = df_prodt.mul(
+        df_hidr.loc[uhes, "produtibilidade_especifica"].to_numpy()
+        * HM3_M3S_MONTHLY_FACTOR,
+        axis=0,
+    )
+    df_prodt_acum = df_prodt.iloc[::-1].cumsum().iloc[::-1]
+    df_prodt = pd.concat(
+        [
+            df_prodt.stack(colunas[1:]).rename("prodt"),
+            df_prodt_acum.stack(colunas[1:]).rename("prodt_acum"),
+        ],
+        axis=1,
+    ).reset_index()
+
+    df_comparado = df.merge(df_varm, on=colunas, suffixes=("", "_varm"))
+    df_comparado = df_comparado.merge(df_prodt, on=colunas)
+    assert df_comparado.shape[0] == df.shape[0]
+    volume_util = (
+        df_comparado["valor_varm"] - df_comparado["limite_inferior_varm"]
+    )
+    assert np.allclose(
+        df_comparado["valor"], volume_util * df_comparado["prodt_acum"]
+    )
+    assert not np.allclose(
+        df_comparado["valor"], volume_util * df_comparado["prodt"]
+    )
+
+
 # VFPHA, VRET, VDES, QRET, QDES para REE, SBM e SIN (soma valores das UHEs)
 
 
@@ -3086,3 +3163,340 @@ def test_sintese_wildcard_Nmatches(test_settings):
     __valida_metadata("GTER_SBM", df_meta, False)
     __valida_metadata("GTER_SIN", df_meta, False)
     assert df_meta.shape[0] == 3
+
+
+def test_grafo_dependencias_sinteses(test_settings):
+    synthesis = OperationSynthetizer._add_synthesis_dependencies(
+        [OperationSynthesis.factory("CTO_SIN")]
+    )
+    dependencies = OperationSynthetizer._synthesis_dependency_graph(synthesis)
+    assert synthesis[-1] == OperationSynthesis.factory("CTO_SIN")
+    assert dependencies[synthesis[-1]] == [
+        OperationSynthesis.factory("COP_SIN"),
+        OperationSynthesis.factory("CFU_SIN"),
+    ]
+    assert dependencies[OperationSynthesis.factory("COP_SIN")] == []
+
+
+def test_sintese_dependencias_libera_cache(test_settings):
+    m = MagicMock(lambda df, filename: df)
+    with patch(
+        "app.adapters.repository.export.TestExportRepository.synthetize_df",
+        new=m,
+    ):
+        OperationSynthetizer.synthetize(["CTO_SIN", "CMO_SBM"], uow)
+    assert len(OperationSynthetizer.CACHED_SYNTHESIS) == 0
+    df_meta = __obtem_dados_sintese_mock(OPERATION_SYNTHESIS_METADATA_OUTPUT, m)
+    OperationSynthetizer.clear_cache()
+    assert df_meta is not None
+    assert df_meta["chave"].tolist() == [
+        "COP_SIN",
+        "CFU_SIN",
+        "CTO_SIN",
+        "CMO_SBM",
+    ]
+
+
+def test_sintese_incremental(test_settings):
+    settings = Settings()
+    incremental = settings.incremental_synthesis
+    settings.incremental_synthesis = True
+    try:
+        m_json = MagicMock(return_value=True)
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.write_json",
+            new=m_json,
+        ), patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["CMO_SBM"], uow)
+        manifest, filename = m_json.call_args.args
+        manifest = dict(manifest)
+        OperationSynthetizer.clear_cache()
+        assert filename == OPERATION_SYNTHESIS_MANIFEST_OUTPUT
+        assert "CMO_SBM" in manifest
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.read_json",
+            new=MagicMock(return_value=manifest),
+        ), patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["CMO_SBM"], uow)
+        OperationSynthetizer.clear_cache()
+        assert "CMO_SBM" not in [c.args[1] for c in m.call_args_list]
+        df_meta = __obtem_dados_sintese_mock(
+            OPERATION_SYNTHESIS_METADATA_OUTPUT, m
+        )
+        assert df_meta is not None
+        assert df_meta["chave"].tolist() == ["CMO_SBM"]
+    finally:
+        settings.incremental_synthesis = incremental
+
+
+@pytest.mark.parametrize("escritores", ["0", "2"])
+def test_sintese_incremental_manifesto_por_sintese(test_settings, escritores):
+    settings = Settings()
+    incremental = settings.incremental_synthesis
+    threads = settings.export_threads
+    settings.incremental_synthesis = True
+    settings.export_threads = escritores
+    manifestos = []
+    manifesto_antes_cto = []
+
+    def _escreve_manifesto(manifest, filename):
+        manifestos.append(dict(manifest))
+        return True
+
+    def _sintetiza(df, filename):
+        if filename == "CTO_SIN":
+            manifesto_antes_cto.extend(manifestos[-1:])
+            raise RuntimeError("Falha na escrita")
+        return df
+
+    try:
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.write_json",
+            new=MagicMock(side_effect=_escreve_manifesto),
+        ), patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=MagicMock(side_effect=_sintetiza),
+        ):
+            OperationSynthetizer.synthetize(["CTO_SIN", "CMO_SBM"], uow)
+        OperationSynthetizer.clear_cache()
+    finally:
+        settings.incremental_synthesis = incremental
+        settings.export_threads = threads
+    # Cada síntese é registrada assim que a sua escrita é concluída,
+    # exceto aquelas cuja escrita falhou
+    assert [len(m) for m in manifestos] == list(range(1, len(manifestos) + 1))
+    assert sorted(manifestos[-1].keys()) == ["CFU_SIN", "CMO_SBM", "COP_SIN"]
+    if escritores == "0":
+        # Com a escrita síncrona, as dependências já foram registradas
+        # antes da escrita da síntese dependente
+        assert "COP_SIN" in manifesto_antes_cto[0]
+        assert "CFU_SIN" in manifesto_antes_cto[0]
+
+
+def test_sintese_filtros_uhes_estagios_cenarios(test_settings):
+    df_completo, _ = __sintetiza_com_mock("QTUR_UHE")
+    settings = Settings()
+    filtros = (
+        settings.operation_hydros,
+        settings.operation_stages,
+        settings.operation_scenarios,
+    )
+    settings.operation_hydros = "6,275"
+    settings.operation_stages = "2-3"
+    settings.operation_scenarios = "1-2"
+    try:
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["QTUR_UHE", "VARMF_UHE"], uow)
+            OperationSynthetizer.clear_cache()
+        df_qtur = __obtem_dados_sintese_mock("QTUR_UHE", m)
+        df_varm = __obtem_dados_sintese_mock("VARMF_UHE", m)
+    finally:
+        (
+            settings.operation_hydros,
+            settings.operation_stages,
+            settings.operation_scenarios,
+        ) = filtros
+    for df in [df_qtur, df_varm]:
+        assert df["codigo_usina"].unique().tolist() == [6, 275]
+        assert df["estagio"].unique().tolist() == [2, 3]
+        assert df["cenario"].unique().tolist() == [1, 2]
+    __valida_limites(df_varm)
+    # Os valores filtrados são os mesmos da síntese completa
+    chaves = ["codigo_usina", "estagio", "cenario", "patamar"]
+    df_comparacao = df_qtur.merge(
+        df_completo, on=chaves, suffixes=("", "_completo")
+    )
+    assert df_comparacao.shape[0] == df_qtur.shape[0]
+    assert np.allclose(df_comparacao["valor"], df_comparacao["valor_completo"])
+    assert np.allclose(
+        df_comparacao["limite_superior"],
+        df_comparacao["limite_superior_completo"],
+    )
+
+
+def test_sintese_filtro_uhes_rejeita_agregacoes(test_settings):
+    settings = Settings()
+    uhes = settings.operation_hydros
+    settings.operation_hydros = "6,275"
+    try:
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["QTUR_UHE", "QTUR_REE"], uow)
+            OperationSynthetizer.clear_cache()
+    finally:
+        settings.operation_hydros = uhes
+    assert __obtem_dados_sintese_mock("QTUR_UHE", m) is None
+    assert __obtem_dados_sintese_mock("QTUR_REE", m) is None
+
+
+def test_sintese_filtro_uhes_rejeita_earm_uhe(test_settings):
+    settings = Settings()
+    uhes = settings.operation_hydros
+    settings.operation_hydros = "6,275"
+    try:
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["QTUR_UHE", "EARMF_UHE"], uow)
+            OperationSynthetizer.clear_cache()
+    finally:
+        settings.operation_hydros = uhes
+    assert __obtem_dados_sintese_mock("QTUR_UHE", m) is None
+    assert __obtem_dados_sintese_mock("EARMF_UHE", m) is None
+
+
+def test_sintese_estatisticas_ordenadas(test_settings):
+    m = MagicMock(lambda df, filename: df)
+    with patch(
+        "app.adapters.repository.export.TestExportRepository.synthetize_df",
+        new=m,
+    ):
+        OperationSynthetizer.synthetize(["QVER_UHE", "QTUR_UHE"], uow)
+        OperationSynthetizer.clear_cache()
+    df_stats = __obtem_dados_sintese_mock("ESTATISTICAS_OPERACAO_UHE", m)
+    assert df_stats["variavel"].unique().tolist() == ["QTUR", "QVER"]
+    resolucao = SpatialResolution.USINA_HIDROELETRICA
+    colunas = ["variavel"] + resolucao.sorting_synthesis_df_columns
+    pd.testing.assert_frame_equal(
+        df_stats,
+        df_stats.sort_values(colunas).reset_index(drop=True),
+    )
+
+
+def test_sintese_streaming(test_settings):
+    def _sintetiza() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            OperationSynthetizer.synthetize(["QTUR_UHE"], uow)
+            OperationSynthetizer.clear_cache()
+        return (
+            __obtem_dados_sintese_mock("QTUR_UHE", m),
+            __obtem_dados_sintese_mock("ESTATISTICAS_OPERACAO_UHE", m),
+        )
+
+    df, df_stats = _sintetiza()
+    settings = Settings()
+    streaming = settings.streaming_export
+    settings.streaming_export = True
+    try:
+        with patch.object(
+            OperationSynthetizer,
+            "_post_resolve",
+            side_effect=AssertionError,
+        ):
+            df_streaming, df_stats_streaming = _sintetiza()
+    finally:
+        settings.streaming_export = streaming
+    pd.testing.assert_frame_equal(df, df_streaming)
+    pd.testing.assert_frame_equal(df_stats, df_stats_streaming)
+
+
+def __dados_estatisticas_referencia(semente: int) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    df = pd.MultiIndex.from_product(
+        [range(1, 6), range(1, 7), range(1, 51), range(1, 4)],
+        names=["codigo_usina", "estagio", "cenario", "patamar"],
+    ).to_frame(index=False)
+    df["valor"] = rng.normal(100, 30, df.shape[0])
+    df.loc[rng.random(df.shape[0]) < 0.05, "valor"] = np.nan
+    # Grupos com valores repetidos, somente com valores nulos e com um
+    # único valor não nulo
+    df.loc[df["codigo_usina"] == 2, "valor"] = 7.3
+    df.loc[df["codigo_usina"] == 3, "valor"] = np.nan
+    df.loc[(df["codigo_usina"] == 4) & (df["cenario"] > 1), "valor"] = np.nan
+    return df[["codigo_usina", "estagio", "patamar", "cenario", "valor"]]
+
+
+def test_kernels_versao_pandas():
+    # Os kernels reproduzem os agrupamentos das versões validadas da
+    # pandas. Uma nova versão exige que a paridade seja verificada.
+    versao = ".".join(pd.__version__.split(".")[:2])
+    assert versao in KERNELS_PANDAS_VERSIONS
+    assert USE_GROUPING_KERNELS
+
+
+@pytest.mark.parametrize("semente", [0, 1, 2, 3])
+def test_estatisticas_operacao_referencia(semente):
+    df = __dados_estatisticas_referencia(semente)
+    df_referencia = pd.concat(
+        [
+            _calc_quantiles(df, QUANTILES_FOR_STATISTICS),
+            _calc_mean_std(df),
+        ],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(calc_statistics(df), df_referencia)
+
+
+@pytest.mark.parametrize("semente", [0, 1, 2, 3])
+@pytest.mark.parametrize("engine", ["numba", "cython"])
+def test_soma_agrupada_referencia(semente, engine):
+    df = __dados_estatisticas_referencia(semente)
+    df["valor_2"] = df["valor"] * -0.5
+    rng = np.random.default_rng(semente)
+    grupos = df.groupby(["codigo_usina", "estagio"], sort=True).ngroup()
+    labels = grupos.to_numpy().copy()
+    # Linhas com índice negativo são desconsideradas
+    labels[rng.random(df.shape[0]) < 0.05] = -1
+    valores = df[["valor", "valor_2"]].to_numpy()
+    num_grupos = int(grupos.max()) + 1
+    validos = labels >= 0
+    df_referencia = (
+        df.loc[validos, ["valor", "valor_2"]]
+        .groupby(labels[validos], sort=True)
+        .sum(engine=engine)
+        .reindex(np.arange(num_grupos), fill_value=0.0)
+    )
+    somas = sum_by_labels(valores, labels, num_grupos, engine)
+    assert np.array_equal(
+        somas, df_referencia.to_numpy(dtype=np.float64), equal_nan=True
+    )
+
+
+def test_tensor_nwlistop_linhas_faltantes():
+    datas = [datetime(2023, 1, 1), datetime(2023, 2, 1)]
+    df = pd.DataFrame(
+        {
+            "data": np.repeat(datas, 4),
+            "serie": np.tile(np.repeat([1, 2], 2), 2),
+            "patamar": np.tile([1, 2], 4),
+            "valor": np.arange(8, dtype=np.float64),
+        }
+    )
+    duracoes = pd.DataFrame(
+        {
+            "data_inicio": np.repeat(datas, 2),
+            "patamar": np.tile([1, 2], 2),
+            "valor": [0.4, 0.6] * 2,
+        }
+    )
+    fins = [datetime(2023, 2, 1), datetime(2023, 3, 1)]
+    tensor = SynthesisTensor.from_nwlistop(df, 2, datas, fins, duracoes, 1.0)
+    assert tensor.values.shape == (1, 2, 2, 2)
+    assert tensor.values[0, 1, 0].tolist() == [4.0, 6.0]
+    with pytest.raises(ValueError):
+        SynthesisTensor.from_nwlistop(
+            df.iloc[:-1], 2, datas, fins, duracoes, 1.0
+        )
+    with pytest.raises(ValueError):
+        SynthesisTensor.from_nwlistop(df, 3, datas, fins, duracoes, 1.0)
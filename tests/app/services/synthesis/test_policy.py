@@ -66,6 +66,25 @@ def test_sintese_cortes_variaveis(test_settings):
     __valida_metadata(synthesis_str, df_meta)
 
 
+def test_sintese_falha_exportacao(test_settings):
+    synthesis_str = "CORTES_VARIAVEIS"
+
+    def _synthetize_df(df, filename):
+        if filename == synthesis_str:
+            raise OSError("Falha na escrita")
+        return df
+
+    m = MagicMock(side_effect=_synthetize_df)
+    with patch(
+        "app.adapters.repository.export.TestExportRepository.synthetize_df",
+        new=m,
+    ):
+        PolicySynthetizer.synthetize([synthesis_str], uow)
+    m.assert_called()
+    df_meta = __obtem_dados_sintese_mock(POLICY_SYNTHESIS_METADATA_OUTPUT, m)
+    assert df_meta is None or synthesis_str not in df_meta["chave"].tolist()
+
+
 def _valida_estados_cortes(df_sintese: pd.DataFrame, df_estados: pd.DataFrame):
     cut_indices = df_sintese[CUT_INDEX_COL].unique().tolist()
     for cut_index in cut_indices:
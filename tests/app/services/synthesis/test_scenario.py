@@ -1,12 +1,23 @@
 from typing import Optional, Tuple
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 
-from app.internal.constants import SCENARIO_SYNTHESIS_METADATA_OUTPUT
+from app.internal.constants import (
+    QUANTILE_ERROR_COL,
+    SCENARIO_SYNTHESIS_METADATA_OUTPUT,
+)
 from app.model.scenario.scenariosynthesis import UNITS, ScenarioSynthesis
+from app.model.settings import Settings
 from app.services.synthesis.scenario import ScenarioSynthetizer
 from app.services.unitofwork import factory
+from app.utils.operations import (
+    calc_statistics,
+    calc_statistics_sketch,
+    merge_statistics_sketches,
+)
+from app.utils.pool import WorkerPool
 from tests.conftest import DECK_TEST_DIR, q
 
 uow = factory("FS", DECK_TEST_DIR, q)
@@ -215,3 +226,108 @@ def test_sintese_qinc_sin_sf(test_settings):
     df, df_meta = __sintetiza_com_mock(synthesis_str)
 
     __valida_metadata(synthesis_str, df_meta)
+
+
+def test_sintese_qinc_uhe_bkw_iteracoes(test_settings):
+    settings = Settings()
+    scenario_iterations = settings.scenario_iterations
+    settings.scenario_iterations = "1"
+    try:
+        with patch.object(WorkerPool, "map", wraps=WorkerPool.map) as m:
+            df, _ = __sintetiza_com_mock("QINC_UHE_BKW")
+        # Os arquivos das demais iterações não são lidos
+        assert [list(c.args[1].keys()) for c in m.call_args_list] == [[1]]
+        assert df["iteracao"].unique().tolist() == [1]
+    finally:
+        settings.scenario_iterations = scenario_iterations
+
+
+def test_sintese_qinc_uhe_bkw_estatisticas_aproximadas(test_settings):
+    def _sintetiza() -> pd.DataFrame:
+        m = MagicMock(lambda df, filename: df)
+        with patch(
+            "app.adapters.repository.export.TestExportRepository.synthetize_df",
+            new=m,
+        ):
+            ScenarioSynthetizer.synthetize(["QINC_UHE_BKW"], uow)
+            ScenarioSynthetizer.clear_cache()
+        df = __obtem_dados_sintese_mock("ESTATISTICAS_CENARIOS_UHE_BKW", m)
+        assert df is not None
+        return df
+
+    df_stats = _sintetiza()
+    settings = Settings()
+    mode, size = settings.statistics_mode, settings.statistics_sketch_size
+    settings.statistics_mode = "APROXIMADO"
+    try:
+        df_approx = _sintetiza()
+        settings.statistics_sketch_size = "2"
+        df_compressed = _sintetiza()
+    finally:
+        settings.statistics_mode = mode
+        settings.statistics_sketch_size = size
+    # Com menos cenários do que o tamanho do resumo, os quantis são exatos
+    assert (df_approx[QUANTILE_ERROR_COL] == 0).all()
+    pd.testing.assert_frame_equal(
+        df_approx.drop(columns=[QUANTILE_ERROR_COL]),
+        df_stats,
+        check_exact=False,
+    )
+    # Com a compactação, os quantis são acompanhados do limite do erro
+    quantiles = ~df_compressed["cenario"].isin(["mean", "std"])
+    assert (df_compressed.loc[quantiles, QUANTILE_ERROR_COL] > 0).any()
+    assert (df_compressed[QUANTILE_ERROR_COL] <= 1).all()
+    pd.testing.assert_frame_equal(
+        df_compressed.loc[~quantiles].drop(columns=[QUANTILE_ERROR_COL]),
+        df_stats.loc[~quantiles],
+        check_exact=False,
+    )
+
+
+def test_estatisticas_aproximadas_combinacao_partes():
+    rng = np.random.default_rng(0)
+    df = pd.MultiIndex.from_product(
+        [range(1, 3), range(1, 4), range(1, 401)],
+        names=["codigo_usina", "estagio", "cenario"],
+    ).to_frame(index=False)
+    df["valor"] = rng.normal(100, 30, df.shape[0])
+    df.loc[rng.random(df.shape[0]) < 0.05, "valor"] = np.nan
+    df_exato = calc_statistics(df)
+    # Os cenários de um mesmo grupo são resumidos em partes distintas,
+    # como em processos distintos, e combinados ao final
+    partes = [
+        calc_statistics_sketch(df.loc[df["cenario"] % 3 == r], 50)
+        for r in range(3)
+    ]
+    df_aprox = merge_statistics_sketches(partes)
+    chaves = ["codigo_usina", "estagio", "cenario"]
+    df_comparacao = df_aprox.merge(
+        df_exato, on=chaves, suffixes=("", "_exato")
+    )
+    assert df_comparacao.shape[0] == df_exato.shape[0] == df_aprox.shape[0]
+    momentos = df_comparacao["cenario"].isin(["mean", "std"])
+    assert np.allclose(
+        df_comparacao.loc[momentos, "valor"],
+        df_comparacao.loc[momentos, "valor_exato"],
+    )
+    assert (df_comparacao.loc[momentos, QUANTILE_ERROR_COL] == 0).all()
+    # Cada quantil aproximado está entre os quantis exatos deslocados
+    # pelo limite do erro
+    for _, linha in df_comparacao.loc[~momentos].iterrows():
+        if linha["cenario"] in ["min", "max"]:
+            assert np.isclose(linha["valor"], linha["valor_exato"])
+            continue
+        q = {"median": 0.5}.get(linha["cenario"])
+        q = q if q is not None else int(linha["cenario"][1:]) / 100
+        valores = df.loc[
+            (df["codigo_usina"] == linha["codigo_usina"])
+            & (df["estagio"] == linha["estagio"]),
+            "valor",
+        ].dropna()
+        erro = linha[QUANTILE_ERROR_COL]
+        assert 0 < erro <= 1
+        assert (
+            valores.quantile(max(q - erro, 0.0)) - 1e-9
+            <= linha["valor"]
+            <= valores.quantile(min(q + erro, 1.0)) + 1e-9
+        )
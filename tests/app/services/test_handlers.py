@@ -0,0 +1,126 @@
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import app.domain.commands as commands
+from app.internal.constants import (
+    EXECUTION_SYNTHESIS_METADATA_OUTPUT,
+    OPERATION_SYNTHESIS_METADATA_OUTPUT,
+    POLICY_SYNTHESIS_METADATA_OUTPUT,
+    SYSTEM_SYNTHESIS_METADATA_OUTPUT,
+)
+from app.services import handlers
+from app.services.deck.deck import Deck
+from app.services.unitofwork import factory
+from tests.conftest import DECK_TEST_DIR, q
+
+uow = factory("FS", DECK_TEST_DIR, q)
+
+
+def __sintetiza_com_mock(handler, command, *args):
+    mocks = {
+        name: MagicMock()
+        for name in [
+            "system.SystemSynthetizer",
+            "execution.ExecutionSynthetizer",
+            "scenario.ScenarioSynthetizer",
+            "operation.OperationSynthetizer",
+            "policy.PolicySynthetizer",
+        ]
+    }
+    patches = [
+        patch(f"app.services.synthesis.{name}.synthetize", new=m)
+        for name, m in mocks.items()
+    ]
+    for p in patches:
+        p.start()
+    try:
+        handler(command, *args)
+    finally:
+        for p in patches:
+            p.stop()
+    return mocks
+
+
+def test_sintese_completa_serial(test_settings):
+    command = commands.SynthetizeComplete(
+        ["EST"], ["CONVERGENCIA"], [], ["CMO_SBM"], [], False
+    )
+    mocks = __sintetiza_com_mock(handlers.synthetize_complete, command, uow)
+    mocks["system.SystemSynthetizer"].assert_called_once_with(["EST"], uow)
+    mocks["execution.ExecutionSynthetizer"].assert_called_once_with(
+        ["CONVERGENCIA"], uow
+    )
+    mocks["operation.OperationSynthetizer"].assert_called_once_with(
+        ["CMO_SBM"], uow
+    )
+    mocks["policy.PolicySynthetizer"].assert_called_once_with([], uow)
+    mocks["scenario.ScenarioSynthetizer"].assert_not_called()
+
+
+def test_sintese_completa_paralela(test_settings):
+    command = commands.SynthetizeComplete(
+        ["EST"], ["CONVERGENCIA"], ["ENAA_REE_FOR"], ["CMO_SBM"], [], True
+    )
+    mocks = __sintetiza_com_mock(handlers.synthetize_complete, command, uow)
+    for m in mocks.values():
+        m.assert_called_once()
+    variables, uow_synthesis = mocks["scenario.ScenarioSynthetizer"].call_args[
+        0
+    ]
+    assert variables == ["ENAA_REE_FOR"]
+    assert uow_synthesis is not uow
+
+
+def test_sintese_completa_paralela_falha_exportacao(test_settings):
+    command = commands.SynthetizeComplete(
+        ["EST"], ["CONVERGENCIA"], [], ["CMO_SBM"], ["CORTES_VARIAVEIS"], True
+    )
+    written = {}
+    failed = Event()
+
+    def _synthetize_df(df, filename):
+        # A escrita da síntese do sistema só termina após a falha da
+        # escrita da síntese da política, mantendo os dois escritores
+        # ativos simultaneamente
+        if filename == "EST":
+            failed.wait(timeout=30)
+        if filename == "CORTES_VARIAVEIS":
+            failed.set()
+            raise OSError("Falha na escrita")
+        written[filename] = df
+        return True
+
+    with patch(
+        "app.adapters.repository.export.TestExportRepository.synthetize_df",
+        new=MagicMock(side_effect=_synthetize_df),
+    ):
+        handlers.synthetize_complete(command, uow)
+    for key in ["EST", "CONVERGENCIA", "CMO_SBM"]:
+        assert key in written
+    assert "CORTES_VARIAVEIS" not in written
+    for metadata, key in [
+        (SYSTEM_SYNTHESIS_METADATA_OUTPUT, "EST"),
+        (EXECUTION_SYNTHESIS_METADATA_OUTPUT, "CONVERGENCIA"),
+        (OPERATION_SYNTHESIS_METADATA_OUTPUT, "CMO_SBM"),
+    ]:
+        assert key in written[metadata]["chave"].tolist()
+    assert POLICY_SYNTHESIS_METADATA_OUTPUT not in written or (
+        "CORTES_VARIAVEIS"
+        not in written[POLICY_SYNTHESIS_METADATA_OUTPUT]["chave"].tolist()
+    )
+
+
+def test_sintese_lote(test_settings):
+    uows = [factory("FS", DECK_TEST_DIR, q) for _ in range(2)]
+    command = commands.SynthetizeBatch(
+        [DECK_TEST_DIR, DECK_TEST_DIR],
+        commands.SynthetizeComplete(
+            ["EST"], ["CONVERGENCIA"], [], ["CMO_SBM"], [], False
+        ),
+    )
+    Deck.DECK_DATA_CACHING["teste"] = True
+    mocks = __sintetiza_com_mock(handlers.synthetize_batch, command, uows)
+    assert "teste" not in Deck.DECK_DATA_CACHING
+    calls = mocks["operation.OperationSynthetizer"].call_args_list
+    assert [c.args for c in calls] == [(["CMO_SBM"], u) for u in uows]
+    mocks["scenario.ScenarioSynthetizer"].assert_not_called()
@@ -1,3 +1,4 @@
+from os import getcwd
 from unittest.mock import patch
 
 import pandas as pd
@@ -13,3 +14,23 @@ def test_fs_uow(test_settings):
         assert dger is not None
         with patch("pyarrow.parquet.write_table"):
             uow.export.synthetize_df(pd.DataFrame(), "CMO_SBM_EST")
+
+
+def test_fs_uow_reaproveita_repositorio(test_settings):
+    uow = factory("FS", DECK_TEST_DIR, q)
+    with uow:
+        files = uow.files
+    with factory("FS", DECK_TEST_DIR, q) as other_uow:
+        assert other_uow.files is files
+    uow.invalidate()
+    with uow:
+        assert uow.files is not files
+
+
+def test_fs_uow_mantem_diretorio(test_settings):
+    diretorio = getcwd()
+    uow = factory("FS", DECK_TEST_DIR, q)
+    with uow:
+        assert getcwd() == diretorio
+        assert uow.files.get_dger() is not None
+    assert getcwd() == diretorio